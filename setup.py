@@ -78,5 +78,6 @@ setup(
             'foremast-promote-s3app=foremast.runner:promote_s3app',
             'slack-notify=foremast.slacknotify.__main__:main',
             'foremast=foremast.__main__:main',
+            'foremast-benchmark=foremast.benchmark.__main__:main',
         ]
     }, )
@@ -7,6 +7,7 @@ import os
 from . import runner, validate
 from .args import add_debug, add_env
 from .consts import LOGGING_FORMAT, SHORT_LOGGING_FORMAT
+from .utils.metrics import enable_metrics
 from .version import print_version
 
 LOG = logging.getLogger(__name__)
@@ -67,6 +68,39 @@ def add_scheduled_actions(subparsers):
     scheduled_actions_parser.set_defaults(func=runner.create_scheduled_actions)
 
 
+def add_cache(subparsers):
+    """Local cache subcommands."""
+    cache_parser = subparsers.add_parser(
+        'cache', help=add_cache.__doc__, formatter_class=argparse.ArgumentDefaultsHelpFormatter)
+    cache_parser.set_defaults(func=cache_parser.print_help)
+
+    cache_subparsers = cache_parser.add_subparsers(title='Caches')
+
+    cache_clear_parser = cache_subparsers.add_parser(
+        'clear', help=runner.clear_gate_cache.__doc__, formatter_class=argparse.ArgumentDefaultsHelpFormatter)
+    cache_clear_parser.set_defaults(func=runner.clear_gate_cache)
+    cache_clear_parser.add_argument('uri', nargs='?', help='Only clear cached URLs containing this URI')
+
+    cache_pin_amis_parser = cache_subparsers.add_parser(
+        'pin-amis', help=runner.pin_ami_catalog.__doc__, formatter_class=argparse.ArgumentDefaultsHelpFormatter)
+    cache_pin_amis_parser.set_defaults(func=runner.pin_ami_catalog)
+    cache_pin_amis_parser.add_argument('path', nargs='?', default='amis.json', help='AMI catalog file to write')
+
+
+def add_tasks(subparsers):
+    """Spinnaker Task subcommands."""
+    tasks_parser = subparsers.add_parser(
+        'tasks', help=add_tasks.__doc__, formatter_class=argparse.ArgumentDefaultsHelpFormatter)
+    tasks_parser.set_defaults(func=tasks_parser.print_help)
+
+    tasks_subparsers = tasks_parser.add_subparsers(title='Tasks')
+
+    tasks_wait_parser = tasks_subparsers.add_parser(
+        'wait', help=runner.wait_for_detached_tasks.__doc__, formatter_class=argparse.ArgumentDefaultsHelpFormatter)
+    tasks_wait_parser.set_defaults(func=runner.wait_for_detached_tasks)
+    tasks_wait_parser.add_argument('--journal', help='Task journal to read, overrides $FOREMAST_TASK_JOURNAL')
+
+
 def add_validate(subparsers):
     """Validate Spinnaker setup."""
     validate_parser = subparsers.add_parser(
@@ -105,6 +139,8 @@ def main(manual_args=None):
     add_rebuild(subparsers)
     add_autoscaling(subparsers)
     add_scheduled_actions(subparsers)
+    add_cache(subparsers)
+    add_tasks(subparsers)
     add_validate(subparsers)
 
     CliArgs = collections.namedtuple('CliArgs', ['parsed', 'extra'])
@@ -119,6 +155,8 @@ def main(manual_args=None):
 
     LOG.debug('Arguments: %s', args)
 
+    enable_metrics()
+
     if args.parsed.version:
         args.parsed.func = print_version
 
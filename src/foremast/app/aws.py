@@ -2,7 +2,7 @@
 from pprint import pformat
 
 from foremast.app import base
-from foremast.utils import wait_for_task
+from foremast.utils import APP_DETAILS, wait_for_task
 
 
 class SpinnakerApp(base.BaseApp):
@@ -25,6 +25,7 @@ class SpinnakerApp(base.BaseApp):
         self.log.debug('App info:\n%s', pformat(self.appinfo))
         jsondata = self.render_application_template()
         wait_for_task(jsondata)
+        APP_DETAILS.clear(app=self.appname)
 
         self.log.info("Successfully created %s application", self.appname)
         return jsondata
@@ -24,7 +24,7 @@ from gogoutils import Generator
 
 from ..consts import APP_FORMATS, DEFAULT_RUN_AS_USER, LINKS
 from ..exceptions import ForemastError
-from ..utils import get_template, wait_for_task
+from ..utils import APP_DETAILS, get_template, wait_for_task
 from ..utils.gate import gate_request
 
 
@@ -92,6 +92,7 @@ class SpinnakerApp:
         self.log.debug('App info:\n%s', pformat(self.appinfo))
         jsondata = self.retrieve_template()
         wait_for_task(jsondata)
+        APP_DETAILS.clear(app=self.appname)
 
         self.log.info("Successfully created %s application", self.appname)
         return jsondata
@@ -22,7 +22,7 @@ import logging
 import os
 from math import floor
 
-from ..utils import get_latest_server_group, get_properties, get_template, wait_for_task
+from ..utils import TaskBatch, get_latest_server_group, get_properties, get_template, wait_for_task
 from ..utils.gate import gate_request
 
 
@@ -60,6 +60,23 @@ class AutoScalingPolicy:
             server_group (str): Server group to render and apply policy template to
             scaling_policy (dict): Custom Scaling Policy dictionary, defaults to None.
         """
+        rendered_template = self.render_policy_template(scaling_type, server_group, scaling_policy)
+
+        self.log.info('Creating a %s policy in %s for %s', scaling_type, self.env, self.app)
+        wait_for_task(rendered_template, detachable=True)
+        self.log.info('Successfully created a %s policy in %s for %s', scaling_type, self.env, self.app)
+
+    def render_policy_template(self, scaling_type, server_group, scaling_policy=None):
+        """Renders scaling policy templates based on configs and variables.
+
+        Args:
+            scaling_type (str): Type of policy: ``scale_up``, ``scale_down``, ``custom``
+            server_group (str): Server group to render and apply policy template to
+            scaling_policy (dict): Custom Scaling Policy dictionary, defaults to None.
+
+        Returns:
+            str: Task JSON.
+        """
         if 'period_minutes' in self.settings['asg']['scaling_policy']:
             period_sec = int(self.settings['asg']['scaling_policy']['period_minutes']) * 60
         else:
@@ -112,9 +129,7 @@ class AutoScalingPolicy:
                 self.log.warn('Scaling Type %s not implemented or does not exist.', scaling_policy['scaling_type'])
                 raise NotImplementedError
 
-        self.log.info('Creating a %s policy in %s for %s', scaling_type, self.env, self.app)
-        wait_for_task(rendered_template)
-        self.log.info('Successfully created a %s policy in %s for %s', scaling_type, self.env, self.app)
+        return rendered_template
 
     def create_policy(self):
         """Wrapper function. Gets the server group, sets sane defaults,
@@ -128,19 +143,26 @@ class AutoScalingPolicy:
 
         server_group = get_latest_server_group(self.env, self.app)
 
-        # Find all existing and remove them
+        # Find all existing and remove them, all deletes run as one Task
         scaling_policies = self.get_all_scaling_policies(server_group)
+        deletes = TaskBatch()
         for policy_block in scaling_policies:
             for scaling_policy in policy_block:
-                self.delete_existing_scaling_policy(scaling_policy, server_group)
+                deletes.add(self.render_delete_policy(scaling_policy, server_group))
+        deletes.wait()
 
+        policies = TaskBatch()
         if self.settings['asg']['scaling_policy']:
-                self.prepare_policy_template('scale_up', server_group)
-                if self.settings['asg']['scaling_policy'].get('scale_down', True):
-                    self.prepare_policy_template('scale_down', server_group)
+            policies.add(self.render_policy_template('scale_up', server_group))
+            if self.settings['asg']['scaling_policy'].get('scale_down', True):
+                policies.add(self.render_policy_template('scale_down', server_group))
         elif self.settings['asg']['custom_scaling_policies']:
             for scaling_policy in self.settings['asg']['custom_scaling_policies']:
-                self.prepare_policy_template('custom', server_group, scaling_policy)
+                policies.add(self.render_policy_template('custom', server_group, scaling_policy))
+
+        self.log.info('Creating %d policies in %s for %s', len(policies), self.env, self.app)
+        policies.wait(detachable=True)
+        self.log.info('Successfully created %d policies in %s for %s', len(policies), self.env, self.app)
 
     def delete_existing_scaling_policy(self, scaling_policy, server_group):
         """Given a scaling_policy and server_group, deletes the existing scaling_policy.
@@ -150,6 +172,18 @@ class AutoScalingPolicy:
             scaling_policy (json): the scaling_policy json from Spinnaker that should be deleted
             server_group (str): the affected server_group
         """
+        wait_for_task(self.render_delete_policy(scaling_policy, server_group))
+
+    def render_delete_policy(self, scaling_policy, server_group):
+        """Render the task deleting _scaling_policy_ from _server_group_.
+
+        Args:
+            scaling_policy (json): the scaling_policy json from Spinnaker that should be deleted
+            server_group (str): the affected server_group
+
+        Returns:
+            str: Task JSON.
+        """
         self.log.info("Deleting policy %s on %s", scaling_policy['policyName'], server_group)
         delete_dict = {
             "application":
@@ -166,7 +200,7 @@ class AutoScalingPolicy:
                 "user": "foremast-autoscaling-policy"
             }]
         }
-        wait_for_task(json.dumps(delete_dict))
+        return json.dumps(delete_dict)
 
     def get_all_scaling_policies(self, server_group):
         """Finds all existing scaling policies for an application
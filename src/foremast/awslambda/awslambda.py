@@ -22,7 +22,7 @@ import boto3
 from tryagain import retries
 
 from ..exceptions import RequiredKeyNotFound
-from ..utils import get_details, get_lambda_arn, get_properties, get_role_arn, get_security_group_id, get_subnets
+from ..utils import get_details, get_lambda_arn, get_properties, get_role_arn, get_security_group_ids, get_subnets
 
 LOG = logging.getLogger(__name__)
 
@@ -130,11 +130,7 @@ class LambdaFunction:
             lambda_extras = []
 
         security_groups = [self.app_name] + lambda_extras
-        sg_ids = []
-        for security_group in security_groups:
-            sg_id = get_security_group_id(name=security_group, env=self.env, region=self.region)
-            sg_ids.append(sg_id)
-        return sg_ids
+        return get_security_group_ids(security_groups, env=self.env, region=self.region)
 
     @retries(max_attempts=3, wait=1, exceptions=(boto3.exceptions.botocore.exceptions.ClientError))
     def create_alias(self):
@@ -0,0 +1,63 @@
+#   Foremast - Pipeline Tooling
+#
+#   Copyright 2019 Redbox Automated Retail, LLC
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+"""CLI entry point for benchmarking Foremast against a local fake Gate.
+
+Help: ``python -m foremast.benchmark -h``
+"""
+import argparse
+import logging
+
+from ..args import add_debug
+from ..consts import LOGGING_FORMAT
+from .benchmark import format_results, run_benchmark
+from .worker import WORKLOADS
+
+LOG = logging.getLogger(__name__)
+
+
+def main(manual_args=None):
+    """Run the requested workloads and print a results table."""
+    parser = argparse.ArgumentParser(description='Benchmark Foremast against a local fake Gate.')
+    add_debug(parser)
+    parser.add_argument('-n', '--apps', type=int, default=10, help='Number of synthetic applications')
+    parser.add_argument('-c', '--concurrency', type=int, default=1, help='Parallel Foremast processes')
+    parser.add_argument(
+        '-w', '--workload', action='append', choices=WORKLOADS, help='Workload to run, may repeat, default all')
+    parser.add_argument('--latency', type=float, default=0.0, help='Seconds to delay each Gate response')
+    parser.add_argument('--jitter', type=float, default=0.0, help='Extra random delay of up to this many seconds')
+    parser.add_argument('--error-rate', type=float, default=0.0, help='Share of Gate requests answered with 503')
+    parser.add_argument('--task-delay', type=float, default=0.0, help='Seconds before Gate tasks succeed')
+    parser.add_argument('--output', help='Also write the results to this JSON file')
+    args = parser.parse_args(manual_args)
+
+    logging.basicConfig(format=LOGGING_FORMAT)
+    logging.getLogger(__package__.split('.')[0]).setLevel(args.debug)
+
+    results = run_benchmark(
+        apps=args.apps,
+        workloads=args.workload or WORKLOADS,
+        concurrency=args.concurrency,
+        latency=args.latency,
+        jitter=args.jitter,
+        error_rate=args.error_rate,
+        task_delay=args.task_delay,
+        output=args.output)
+
+    print(format_results(results))
+
+
+if __name__ == '__main__':
+    main()
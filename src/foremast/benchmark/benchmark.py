@@ -0,0 +1,208 @@
+#   Foremast - Pipeline Tooling
+#
+#   Copyright 2019 Redbox Automated Retail, LLC
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+"""Drive Foremast runner entry points against a :class:`FakeGate`."""
+import json
+import logging
+import os
+import subprocess
+import sys
+import tempfile
+import textwrap
+import time
+
+from .fake_gate import PROJECT, FakeGate
+
+LOG = logging.getLogger(__name__)
+
+ENV = 'dev'
+REGION = 'us-east-1'
+
+APPLICATION_CONFIG = {
+    'app': {
+        'eureka_enabled': False,
+    },
+    'regions': [REGION],
+}
+
+PIPELINE_CONFIG = {
+    'type': 'ec2',
+    'env': [ENV],
+}
+
+
+def write_workspace(directory, gate_url):
+    """Write the Foremast configuration and runway files for the workers.
+
+    Args:
+        directory (str): Workspace root.
+        gate_url (str): URL of the fake Gate.
+
+    Returns:
+        str: Path of the runway directory.
+
+    """
+    config_dir = os.path.join(directory, '.foremast')
+    runway_dir = os.path.join(directory, 'runway')
+    os.makedirs(config_dir)
+    os.makedirs(runway_dir)
+
+    with open(os.path.join(config_dir, 'foremast.cfg'), 'wt') as config_file:
+        config_file.write(
+            textwrap.dedent("""\
+            [base]
+            gate_api_url = {gate_url}
+            git_url = http://git.example.com
+            domain = example.com
+            envs = {env}
+            regions = {region}
+
+            [cache]
+            directory = {cache_dir}
+            """).format(
+                gate_url=gate_url, env=ENV, region=REGION, cache_dir=os.path.join(directory, 'cache')))
+
+    with open(os.path.join(runway_dir, 'application-master-{0}.json'.format(ENV)), 'wt') as app_file:
+        json.dump(APPLICATION_CONFIG, app_file)
+    with open(os.path.join(runway_dir, 'pipeline.json'), 'wt') as pipeline_file:
+        json.dump(PIPELINE_CONFIG, pipeline_file)
+
+    return runway_dir
+
+
+def _chunks(items, count):
+    """Split _items_ into at most _count_ interleaved, non-empty chunks."""
+    return [chunk for chunk in (items[index::count] for index in range(count)) if chunk]
+
+
+def run_workload(workload, repos, workspace, runway_dir, concurrency=1):
+    """Run _workload_ in parallel worker processes.
+
+    Each worker gets its own working directory holding a copy of the
+    configuration, as the runner writes ``raw.properties`` to the current
+    directory.
+
+    Args:
+        workload (str): One of :data:`foremast.benchmark.worker.WORKLOADS`.
+        repos (list): Repository names to process.
+        workspace (str): Directory from :func:`write_workspace`.
+        runway_dir (str): Runway directory from :func:`write_workspace`.
+        concurrency (int): Number of worker processes.
+
+    Returns:
+        dict: ``seconds`` of wall time and ``failed`` application count.
+
+    """
+    env = dict(os.environ, ENV=ENV, REGION=REGION, PROJECT=PROJECT, EMAIL='benchmark@example.com')
+    env['RUNWAY_DIR'] = runway_dir
+    env.pop('FOREMAST_CONFIG_FILE', None)
+
+    chunks = [[]] if workload == 'rebuild' else _chunks(repos, concurrency)
+
+    start = time.monotonic()
+    processes = []
+    for index, chunk in enumerate(chunks):
+        cwd = os.path.join(workspace, '{0}-{1}'.format(workload, index))
+        os.makedirs(cwd)
+        os.symlink(os.path.join(workspace, '.foremast'), os.path.join(cwd, '.foremast'))
+
+        command = [sys.executable, '-m', 'foremast.benchmark.worker', workload] + chunk
+        processes.append(
+            subprocess.Popen(command, cwd=cwd, env=env, stdout=subprocess.PIPE, stderr=subprocess.PIPE))
+
+    failed = 0
+    for process in processes:
+        stdout, stderr = process.communicate()
+        if process.returncode:
+            LOG.error('Benchmark worker failed:\n%s', stderr.decode('utf-8', 'replace'))
+            failed += len(repos) // len(processes)
+            continue
+
+        LOG.debug('Benchmark worker output:\n%s', stderr.decode('utf-8', 'replace'))
+        failed += json.loads(stdout.decode('utf-8').splitlines()[-1])['failed']
+
+    return {'seconds': time.monotonic() - start, 'failed': failed}
+
+
+def run_benchmark(apps=10,
+                  workloads=('pipeline', 'infrastructure', 'rebuild'),
+                  concurrency=1,
+                  output=None,
+                  **gate_options):
+    """Benchmark runner entry points for _apps_ synthetic applications.
+
+    Args:
+        apps (int): Number of synthetic applications.
+        workloads (tuple): Workloads to run in order.
+        concurrency (int): Parallel worker processes for per application
+            workloads.
+        output (str): Also write the results to this JSON file.
+        gate_options: Passed to :class:`FakeGate`, e.g. ``latency``.
+
+    Returns:
+        list: One dict of results per workload.
+
+    """
+    results = []
+
+    with FakeGate(apps=apps, **gate_options) as gate, tempfile.TemporaryDirectory() as workspace:
+        runway_dir = write_workspace(workspace, gate.url)
+
+        for workload in workloads:
+            LOG.info('Running %s workload for %d applications.', workload, apps)
+            gate.reset_stats()
+
+            result = run_workload(workload, gate.apps, workspace, runway_dir, concurrency=concurrency)
+
+            stats = gate.stats()
+            seconds = result['seconds']
+            results.append({
+                'workload': workload,
+                'apps': apps,
+                'concurrency': 1 if workload == 'rebuild' else concurrency,
+                'seconds': seconds,
+                'apps_per_second': apps / seconds if seconds else 0.0,
+                'gate_calls': stats['total'],
+                'gate_calls_per_second': stats['total'] / seconds if seconds else 0.0,
+                'injected_errors': stats['injected_errors'],
+                'failed_apps': result['failed'],
+                'gate_requests': stats['requests'],
+            })
+
+    if output:
+        with open(output, 'wt') as output_file:
+            json.dump(results, output_file, indent=2, sort_keys=True)
+
+    return results
+
+
+def format_results(results):
+    """Format benchmark results as a table.
+
+    Args:
+        results (list): Results from :func:`run_benchmark`.
+
+    Returns:
+        str: One row per workload.
+
+    """
+    header = '{0:<15} {1:>5} {2:>5} {3:>9} {4:>7} {5:>8} {6:>9} {7:>8} {8:>7}'.format(
+        'Workload', 'Apps', 'Procs', 'Wall s', 'Apps/s', 'Calls', 'Calls/s', 'Injected', 'Failed')
+    lines = [header, '-' * len(header)]
+    for result in results:
+        lines.append('{workload:<15} {apps:>5} {concurrency:>5} {seconds:>9.2f} {apps_per_second:>7.2f} '
+                     '{gate_calls:>8} {gate_calls_per_second:>9.1f} {injected_errors:>8} {failed_apps:>7}'.format(
+                         **result))
+    return '\n'.join(lines)
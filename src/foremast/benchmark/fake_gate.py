@@ -0,0 +1,392 @@
+#   Foremast - Pipeline Tooling
+#
+#   Copyright 2019 Redbox Automated Retail, LLC
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+"""Local stand-in for the Spinnaker Gate API.
+
+Serves synthetic catalogs for the endpoints Foremast uses and accepts tasks
+and pipelines, keeping them in memory. Every response can be delayed and a
+share of them answered with ``503`` to mimic a loaded Gate.
+
+Example:
+    Serve Gate on a random port until interrupted::
+
+        with FakeGate(apps=50, latency=0.05) as gate:
+            print(gate.url)
+"""
+import collections
+import json
+import logging
+import random
+import re
+import threading
+import time
+import uuid
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from socketserver import ThreadingMixIn
+from urllib.parse import urlsplit
+
+LOG = logging.getLogger(__name__)
+
+PROJECT = 'benchmark'
+"""Git project of the synthetic applications."""
+
+ACCOUNT_ID = '000000000000'
+
+
+class _ThreadingHTTPServer(ThreadingMixIn, HTTPServer):
+    daemon_threads = True
+
+
+def _route_pattern(template):
+    """Convert a route like ``/tasks/{task_id}`` to a regex with named groups."""
+    return re.compile('^{0}$'.format(re.sub(r'{(\w+)}', r'(?P<\1>[^/]+)', template)))
+
+
+class FakeGate:
+    """In memory Gate serving synthetic applications.
+
+    Args:
+        apps (int): Number of applications listed by ``/applications``, named
+            ``app0000`` and up in the ``benchmark`` project.
+        accounts (tuple): Account names with credentials, VPCs and subnets.
+        regions (tuple): Regions of every account.
+        latency (float): Seconds to delay every response.
+        jitter (float): Extra random delay of up to this many seconds.
+        error_rate (float): Share of requests answered with ``503``.
+        task_delay (float): Seconds before a posted task succeeds.
+        host (str): Address to listen on.
+        port (int): Port to listen on, 0 picks a free port.
+    """
+
+    def __init__(self,
+                 apps=10,
+                 accounts=('dev', 'stage', 'prod'),
+                 regions=('us-east-1', 'us-west-2'),
+                 latency=0.0,
+                 jitter=0.0,
+                 error_rate=0.0,
+                 task_delay=0.0,
+                 host='127.0.0.1',
+                 port=0):
+        self.apps = ['app{0:04d}'.format(index) for index in range(apps)]
+        self.accounts = accounts
+        self.regions = regions
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.task_delay = task_delay
+
+        self._lock = threading.Lock()
+        self.tasks = {}
+        self.pipelines = collections.defaultdict(dict)
+        self.security_groups = set()
+        self.requests = collections.Counter()
+        self.injected_errors = 0
+
+        routes = [
+            ('GET', '/applications', self.list_applications),
+            ('GET', '/applications/{app}', self.get_application),
+            ('GET', '/applications/{app}/pipelineConfigs', self.list_pipelines),
+            ('GET', '/applications/{app}/loadBalancers', self.empty_list),
+            ('GET', '/applications/{app}/clusters/{account}/{cluster}/serverGroups', self.empty_list),
+            ('GET', '/credentials', self.list_credentials),
+            ('GET', '/credentials/{account}', self.get_credentials),
+            ('GET', '/networks/aws', self.list_networks),
+            ('GET', '/subnets/aws', self.list_subnets),
+            ('GET', '/securityGroups/{account}', self.list_security_groups),
+            ('GET', '/securityGroups/{account}/{region}/{name}', self.get_security_group),
+            ('GET', '/tasks/{task_id}', self.get_task),
+            ('GET', '/v2/canaryConfig', self.empty_list),
+            ('POST', '/tasks', self.post_task),
+            ('POST', '/applications/{app}/tasks', self.post_task),
+            ('POST', '/pipelines', self.post_pipeline),
+            ('DELETE', '/pipelines/{app}/{name}', self.delete_pipeline),
+        ]
+        self.routes = [(method, template, _route_pattern(template), handler) for method, template, handler in routes]
+
+        self.server = _ThreadingHTTPServer((host, port), self._handler_class())
+        self.thread = None
+
+    @property
+    def url(self):
+        """str: Base URL to use as ``gate_api_url``."""
+        host, port = self.server.server_address[:2]
+        return 'http://{0}:{1}'.format(host, port)
+
+    def start(self):
+        """Serve requests on a background thread.
+
+        Returns:
+            FakeGate: This instance.
+
+        """
+        self.thread = threading.Thread(target=self.server.serve_forever, name='fake-gate', daemon=True)
+        self.thread.start()
+        LOG.info('Fake Gate listening on %s.', self.url)
+        return self
+
+    def stop(self):
+        """Stop serving and close the socket."""
+        self.server.shutdown()
+        self.server.server_close()
+        if self.thread:
+            self.thread.join()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+    def stats(self):
+        """Get request counters.
+
+        Returns:
+            dict: ``requests`` per route, ``total`` requests and
+            ``injected_errors``.
+
+        """
+        with self._lock:
+            return {
+                'requests': dict(self.requests),
+                'total': sum(self.requests.values()),
+                'injected_errors': self.injected_errors,
+            }
+
+    def reset_stats(self):
+        """Zero the request counters."""
+        with self._lock:
+            self.requests.clear()
+            self.injected_errors = 0
+
+    def dispatch(self, method, path, body):
+        """Answer one request.
+
+        Args:
+            method (str): HTTP method.
+            path (str): Request path, query string included.
+            body (bytes): Request body.
+
+        Returns:
+            tuple: HTTP status and JSON serialisable payload.
+
+        """
+        path = urlsplit(path).path.rstrip('/') or '/'
+
+        for route_method, template, pattern, handler in self.routes:
+            match = pattern.match(path)
+            if route_method == method and match:
+                break
+        else:
+            with self._lock:
+                self.requests['{0} unknown'.format(method)] += 1
+            return 404, {'error': 'Not Found', 'path': path}
+
+        with self._lock:
+            self.requests['{0} {1}'.format(method, template)] += 1
+
+        delay = self.latency + random.uniform(0, self.jitter)
+        if delay:
+            time.sleep(delay)
+
+        if self.error_rate and random.random() < self.error_rate:
+            with self._lock:
+                self.injected_errors += 1
+            return 503, {'error': 'Service Unavailable'}
+
+        payload = json.loads(body.decode('utf-8')) if body else None
+        return handler(payload=payload, **match.groupdict())
+
+    def _handler_class(self):
+        gate = self
+
+        class Handler(BaseHTTPRequestHandler):
+            """Route requests to the owning :class:`FakeGate`."""
+            protocol_version = 'HTTP/1.1'
+
+            def _respond(self):
+                length = int(self.headers.get('Content-Length') or 0)
+                body = self.rfile.read(length) if length else b''
+
+                status, payload = gate.dispatch(self.command, self.path, body)
+
+                content = json.dumps(payload).encode('utf-8')
+                self.send_response(status)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(content)))
+                self.end_headers()
+                self.wfile.write(content)
+
+            do_GET = do_POST = do_DELETE = _respond
+
+            def log_message(self, format, *args):  # pylint: disable=redefined-builtin
+                LOG.debug('Fake Gate: ' + format, *args)
+
+        return Handler
+
+    def list_applications(self, **_):
+        """List the synthetic applications."""
+        return 200, [{
+            'name': app + PROJECT,
+            'email': 'benchmark@example.com',
+            'repoProjectKey': PROJECT,
+            'repoSlug': app,
+        } for app in self.apps]
+
+    def get_application(self, app, **_):
+        """Describe any application, benchmark applications or not."""
+        repo = app[:-len(PROJECT)] if app.endswith(PROJECT) else app
+        return 200, {
+            'name': app,
+            'attributes': {
+                'name': app,
+                'email': 'benchmark@example.com',
+                'repoProjectKey': PROJECT,
+                'repoSlug': repo,
+            },
+            'clusters': {},
+        }
+
+    def list_pipelines(self, app, **_):
+        """List pipelines posted for _app_."""
+        with self._lock:
+            return 200, list(self.pipelines[app].values())
+
+    def post_pipeline(self, payload, **_):
+        """Store a pipeline by application and name."""
+        pipeline = dict(payload, id=payload.get('id') or str(uuid.uuid4()))
+        with self._lock:
+            self.pipelines[pipeline['application']][pipeline['name']] = pipeline
+        return 200, {}
+
+    def delete_pipeline(self, app, name, **_):
+        """Forget a stored pipeline."""
+        with self._lock:
+            self.pipelines[app].pop(name, None)
+        return 200, {}
+
+    def list_credentials(self, **_):
+        """List the accounts."""
+        return 200, [{'name': account, 'type': 'aws', 'accountId': ACCOUNT_ID} for account in self.accounts]
+
+    def get_credentials(self, account, **_):
+        """Describe one account and its regions."""
+        if account not in self.accounts:
+            return 404, {'error': 'Not Found'}
+        return 200, {
+            'name': account,
+            'type': 'aws',
+            'accountId': ACCOUNT_ID,
+            'regions': [{
+                'name': region,
+                'availabilityZones': [region + zone for zone in 'abc'],
+            } for region in self.regions],
+        }
+
+    def list_networks(self, **_):
+        """List one VPC per account and region."""
+        return 200, [{
+            'cloudProvider': 'aws',
+            'id': self._vpc_id(account, region),
+            'name': 'vpc',
+            'account': account,
+            'region': region,
+            'deprecated': False,
+        } for account in self.accounts for region in self.regions]
+
+    def list_subnets(self, **_):
+        """List subnets for every account, region, zone, target and purpose."""
+        subnets = []
+        for account in self.accounts:
+            for region in self.regions:
+                for zone in 'abc':
+                    for target in ('ec2', 'elb'):
+                        for purpose in ('internal', 'external'):
+                            subnets.append({
+                                'id': 'subnet-{0}{1}{2}{3}'.format(account, region, zone, target + purpose),
+                                'account': account,
+                                'region': region,
+                                'availabilityZone': region + zone,
+                                'target': target,
+                                'purpose': purpose,
+                                'vpcId': self._vpc_id(account, region),
+                            })
+        return 200, subnets
+
+    def list_security_groups(self, account, **_):
+        """List security groups by region, one per application plus those upserted by tasks."""
+        with self._lock:
+            upserted = set(self.security_groups)
+
+        groups = {}
+        for region in self.regions:
+            names = [app + PROJECT for app in self.apps]
+            names.extend(name for group_account, group_region, name in sorted(upserted)
+                         if (group_account, group_region) == (account, region))
+            groups[region] = [{
+                'id': self._security_group_id(account, region, name),
+                'name': name,
+                'vpcId': self._vpc_id(account, region),
+            } for name in names]
+        return 200, groups
+
+    def get_security_group(self, account, region, name, **_):
+        """Describe a security group, every name exists."""
+        return 200, {'id': self._security_group_id(account, region, name), 'name': name}
+
+    def post_task(self, payload, **_):
+        """Accept a task, it succeeds after ``task_delay`` seconds."""
+        task_id = str(uuid.uuid4())
+        with self._lock:
+            self.tasks[task_id] = (time.monotonic(), payload)
+            for job in payload.get('job', []):
+                if job.get('type') == 'upsertSecurityGroup':
+                    self.security_groups.update((job.get('credentials'), region, job.get('name'))
+                                                for region in job.get('regions', []))
+        return 200, {'ref': '/tasks/{0}'.format(task_id)}
+
+    def get_task(self, task_id, **_):
+        """Report task status."""
+        with self._lock:
+            created, payload = self.tasks.get(task_id, (None, None))
+
+        if created is None:
+            return 404, {'error': 'Not Found'}
+
+        payload = payload or {}
+        status = 'SUCCEEDED' if time.monotonic() - created >= self.task_delay else 'RUNNING'
+        stages = [{'type': job.get('type'), 'status': status, 'context': job} for job in payload.get('job', [])]
+        return 200, {
+            'id': task_id,
+            'status': status,
+            'name': payload.get('description'),
+            'steps': [],
+            'execution': {
+                'stages': stages
+            },
+        }
+
+    @staticmethod
+    def empty_list(**_):
+        """Answer with an empty list."""
+        return 200, []
+
+    @staticmethod
+    def _security_group_id(account, region, name):
+        return 'sg-{0}'.format(uuid.uuid5(uuid.NAMESPACE_DNS, account + region + name).hex[:8])
+
+    @staticmethod
+    def _vpc_id(account, region):
+        return 'vpc-{0}'.format(uuid.uuid5(uuid.NAMESPACE_DNS, account + region).hex[:8])
@@ -0,0 +1,105 @@
+#   Foremast - Pipeline Tooling
+#
+#   Copyright 2019 Redbox Automated Retail, LLC
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+"""Micro-benchmark of merging application configs with region overrides.
+
+Help: ``python -m foremast.benchmark.merge -h``
+"""
+import argparse
+import json
+import timeit
+
+from ..utils.deep_chain_map import DeepChainMap, deep_merge
+
+
+def synthetic_config(regions=10, sections=20, depth=3):
+    """Build an application config with an override for every region.
+
+    Args:
+        regions (int): Number of regions with overrides.
+        sections (int): Number of top level sections, e.g. ``asg``.
+        depth (int): Levels of nested dicts in each section.
+
+    Returns:
+        tuple: Environment config and a default config of the same shape.
+
+    """
+
+    def section(level, value):
+        if not level:
+            return {'size': value, 'enabled': True, 'names': ['a', 'b']}
+        return {'child{0}'.format(index): section(level - 1, value) for index in range(3)}
+
+    env_config = {'section{0}'.format(index): section(depth, index) for index in range(sections)}
+    env_config['regions'] = {
+        'region{0}'.format(index): {'section0': section(depth - 1, -index)}
+        for index in range(regions)
+    }
+    defaults = {'section{0}'.format(index): section(depth, 0) for index in range(0, sections * 2, 2)}
+    return env_config, defaults
+
+
+def run_merge_benchmark(regions=10, sections=20, depth=3, number=5):
+    """Time merging every region override into the environment config.
+
+    Args:
+        regions (int): Number of regions with overrides.
+        sections (int): Number of top level sections.
+        depth (int): Levels of nested dicts in each section.
+        number (int): Times to repeat each merge.
+
+    Returns:
+        dict: Seconds per run for ``DeepChainMap`` and :func:`deep_merge`.
+
+    """
+    env_config, defaults = synthetic_config(regions=regions, sections=sections, depth=depth)
+
+    def chain_map():
+        merged = dict(DeepChainMap(env_config, defaults))
+        return [dict(DeepChainMap(override, merged)) for override in env_config['regions'].values()]
+
+    def one_pass():
+        merged = deep_merge(env_config, defaults)
+        return [deep_merge(override, merged) for override in env_config['regions'].values()]
+
+    assert json.dumps(chain_map()) == json.dumps(one_pass()), 'Merge results differ'
+
+    results = {
+        'regions': regions,
+        'sections': sections,
+        'depth': depth,
+        'deep_chain_map': timeit.timeit(chain_map, number=number) / number,
+        'deep_merge': timeit.timeit(one_pass, number=number) / number,
+    }
+    results['speedup'] = results['deep_chain_map'] / results['deep_merge']
+    return results
+
+
+def main(manual_args=None):
+    """Print the time taken by both merge implementations."""
+    parser = argparse.ArgumentParser(description='Compare DeepChainMap with deep_merge.')
+    parser.add_argument('--regions', type=int, default=10, help='Regions with overrides')
+    parser.add_argument('--sections', type=int, default=20, help='Top level config sections')
+    parser.add_argument('--depth', type=int, default=3, help='Levels of nested dicts per section')
+    parser.add_argument('--number', type=int, default=5, help='Runs to average')
+    args = parser.parse_args(manual_args)
+
+    results = run_merge_benchmark(regions=args.regions, sections=args.sections, depth=args.depth, number=args.number)
+    print('DeepChainMap {deep_chain_map:.4f}s  deep_merge {deep_merge:.4f}s  speedup {speedup:.1f}x'.format(
+        **results))
+
+
+if __name__ == '__main__':
+    main()
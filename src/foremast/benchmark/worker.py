@@ -0,0 +1,117 @@
+#   Foremast - Pipeline Tooling
+#
+#   Copyright 2019 Redbox Automated Retail, LLC
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+"""Run one benchmark workload against the fake Gate.
+
+Started by :mod:`foremast.benchmark` in a fresh interpreter, since
+:mod:`foremast.consts` reads ``FOREMAST_CONFIG_FILE`` on import. Prints one
+JSON line with the number of applications processed and failed.
+
+Help: ``python -m foremast.benchmark.worker -h``
+"""
+import argparse
+import json
+import logging
+import os
+import sys
+import time
+from contextlib import contextmanager
+
+LOG = logging.getLogger(__name__)
+
+WORKLOADS = ('pipeline', 'infrastructure', 'rebuild')
+
+AWS_ONLY_STEPS = (
+    ('foremast.runner', 'ForemastRunner', 'create_iam'),
+    ('foremast.runner', 'ForemastRunner', 'create_archaius'),
+    ('foremast.runner', 'ForemastRunner', 'create_dns'),
+    ('foremast.securitygroup.create_securitygroup', 'SpinnakerSecurityGroup', 'add_cidr_rules'),
+    ('foremast.securitygroup.create_securitygroup', 'SpinnakerSecurityGroup', 'add_tags'),
+    ('foremast.elb.create_elb', 'SpinnakerELB', 'add_listener_policy'),
+    ('foremast.elb.create_elb', 'SpinnakerELB', 'add_backend_policy'),
+    ('foremast.elb.create_elb', 'SpinnakerELB', 'configure_attributes'),
+)
+"""Steps calling AWS directly, skipped since only Gate is faked."""
+
+
+@contextmanager
+def skip_aws_steps():
+    """Replace :data:`AWS_ONLY_STEPS` with no-ops while in the context."""
+    import importlib  # pylint: disable=import-outside-toplevel
+
+    originals = []
+    for module_name, class_name, method_name in AWS_ONLY_STEPS:
+        owner = getattr(importlib.import_module(module_name), class_name)
+        originals.append((owner, method_name, getattr(owner, method_name)))
+        setattr(owner, method_name, lambda *args, **kwargs: None)
+
+    try:
+        yield
+    finally:
+        for owner, method_name, original in originals:
+            setattr(owner, method_name, original)
+
+
+def run_apps(entry_point, repos):
+    """Run a runner entry point for each repository.
+
+    Args:
+        entry_point (callable): :mod:`foremast.runner` function reading the
+            ``GIT_REPO`` environment variable.
+        repos (list): Repository names in the ``benchmark`` project.
+
+    Returns:
+        int: Number of failed applications.
+
+    """
+    failed = 0
+    for repo in repos:
+        os.environ['GIT_REPO'] = repo
+        try:
+            entry_point()
+        except Exception:  # pylint: disable=broad-except
+            LOG.exception('Benchmark %s failed for %s.', entry_point.__name__, repo)
+            failed += 1
+    return failed
+
+
+def main(manual_args=None):
+    """Run a workload for the repositories given on the command line."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('workload', choices=WORKLOADS)
+    parser.add_argument('repos', nargs='*', help='Repository names, all listed apps are rebuilt when omitted')
+    args = parser.parse_args(manual_args)
+
+    logging.basicConfig(level=os.getenv('FOREMAST_BENCHMARK_LOG_LEVEL', 'WARNING'))
+
+    from foremast import runner  # pylint: disable=import-outside-toplevel
+
+    start = time.monotonic()
+    with skip_aws_steps():
+        if args.workload == 'pipeline':
+            failed = run_apps(runner.prepare_app_pipeline, args.repos)
+        elif args.workload == 'infrastructure':
+            failed = run_apps(runner.prepare_infrastructure, args.repos)
+        else:
+            os.environ['REBUILD_PROJECT'] = os.environ['PROJECT']
+            runner.rebuild_pipelines()
+            failed = 0
+
+    result = {'apps': len(args.repos), 'failed': failed, 'seconds': time.monotonic() - start}
+    sys.stdout.write(json.dumps(result) + '\n')
+
+
+if __name__ == '__main__':
+    main()
@@ -21,7 +21,7 @@ from pprint import pformat
 import gogoutils
 
 from ..consts import APP_FORMATS
-from ..utils import DeepChainMap, get_template
+from ..utils import DeepChainMap, deep_merge, get_template
 
 LOG = logging.getLogger(__name__)
 
@@ -92,15 +92,15 @@ def write_variables(app_configs=None, out_file='', git_short=''):
                     app=generated.app_name(),
                     profile=instance_profile,
                     formats=generated))
-            json_configs[env] = dict(DeepChainMap(configs, rendered_configs))
+            json_configs[env] = deep_merge(configs, rendered_configs)
             region_list = configs.get('regions', rendered_configs['regions'])
             json_configs[env]['regions'] = region_list  # removes regions defined in templates but not configs.
             for region in region_list:
                 region_config = json_configs[env][region]
-                json_configs[env][region] = dict(DeepChainMap(region_config, rendered_configs))
+                json_configs[env][region] = deep_merge(region_config, rendered_configs)
         else:
             default_pipeline_json = json.loads(get_template('configs/pipeline.json.j2', formats=generated))
-            json_configs['pipeline'] = dict(DeepChainMap(configs, default_pipeline_json))
+            json_configs['pipeline'] = deep_merge(configs, default_pipeline_json)
 
     LOG.debug('Compiled configs:\n%s', pformat(json_configs))
 
@@ -16,9 +16,10 @@
 """Prepare the Application Configurations."""
 import collections
 import logging
+from concurrent.futures import ThreadPoolExecutor
 
 from ..consts import ENVS, REGIONS, RUNWAY_BASE_PATH
-from ..utils import DeepChainMap, FileLookup
+from ..utils import FileLookup, deep_merge
 
 LOG = logging.getLogger(__name__)
 
@@ -35,12 +36,11 @@ def process_git_configs(git_short=''):
         found.
     """
     LOG.info('Processing application.json files from GitLab "%s".', git_short)
-    file_lookup = FileLookup(git_short=git_short)
+    file_lookup = FileLookup(git_short=git_short, archive_path=RUNWAY_BASE_PATH)
     app_configs = process_configs(file_lookup,
                                   RUNWAY_BASE_PATH + '/application-master-{env}.json',
                                   RUNWAY_BASE_PATH + '/pipeline.json')
-    commit_obj = file_lookup.project.commits.get('master')
-    config_commit = commit_obj.attributes['id']
+    config_commit = file_lookup.commit('master')
     LOG.info('Commit ID used: %s', config_commit)
     app_configs['pipeline']['config_commit'] = config_commit
     return app_configs
@@ -62,30 +62,61 @@ def process_runway_configs(runway_dir=''):
     return app_configs
 
 
-def process_configs(file_lookup, app_config_format, pipeline_config):
+def _read_env_config(file_lookup, filename):
+    """Read and apply region overrides to one environment's config.
+
+    Returns:
+        dict: Config with region overrides, None when _filename_ is missing.
+
+    """
+    try:
+        env_config = file_lookup.json(filename=filename)
+    except FileNotFoundError:
+        return None
+    return apply_region_configs(env_config)
+
+
+def _read_pipeline_config(file_lookup, filename):
+    """Read the pipeline config, None when _filename_ is missing."""
+    try:
+        return file_lookup.json(filename=filename)
+    except FileNotFoundError:
+        return None
+
+
+def process_configs(file_lookup, app_config_format, pipeline_config, max_workers=8):
     """Processes the configs from lookup sources.
 
+    Every config is read at the same time by up to _max_workers_ threads, then
+    merged in sorted environment order.
+
     Args:
         file_lookup (FileLookup): Source to look for file/config
         app_config_format (str): The format for application config files.
         pipeline_config (str): Name/path of the pipeline config
+        max_workers (int): Maximum configs read at once.
 
     Returns:
         dict: Retreived application config
     """
+    envs = sorted(ENVS)
+
+    with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(envs) + 1))) as executor:
+        env_futures = [
+            executor.submit(_read_env_config, file_lookup, app_config_format.format(env=env)) for env in envs
+        ]
+        pipeline_future = executor.submit(_read_pipeline_config, file_lookup, pipeline_config)
+
     app_configs = collections.defaultdict(dict)
-    for env in ENVS:
-        file_json = app_config_format.format(env=env)
-        try:
-            env_config = file_lookup.json(filename=file_json)
-            app_configs[env] = apply_region_configs(env_config)
-        except FileNotFoundError:
+    for env, future in zip(envs, env_futures):
+        env_config = future.result()
+        if env_config is None:
             LOG.critical('Application configuration not available for %s.', env)
             continue
+        app_configs[env] = env_config
 
-    try:
-        app_configs['pipeline'] = file_lookup.json(filename=pipeline_config)
-    except FileNotFoundError:
+    app_configs['pipeline'] = pipeline_future.result()
+    if app_configs['pipeline'] is None:
         LOG.warning('Unable to process pipeline.json. Using defaults.')
         app_configs['pipeline'] = {'env': ['stage', 'prod']}
 
@@ -107,7 +138,7 @@ def apply_region_configs(env_config):
     for region in env_config.get('regions', REGIONS):
         if isinstance(env_config.get('regions'), dict):
             region_specific_config = env_config['regions'][region]
-            new_config[region] = dict(DeepChainMap(region_specific_config, env_config))
+            new_config[region] = deep_merge(region_specific_config, env_config)
         else:
             new_config[region] = env_config.copy()
     LOG.debug('Region Specific Config:\n%s', new_config)
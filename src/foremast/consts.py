@@ -209,6 +209,16 @@ ALLOWED_TYPES = set(
     .split(','))
 RUNWAY_BASE_PATH = validate_key_values(CONFIG, 'base', 'runway_base_path', default='runway')
 TEMPLATES_PATH = validate_key_values(CONFIG, 'base', 'templates_path')
+GIT_ARCHIVE = str(validate_key_values(CONFIG, 'base', 'git_archive', default='true')).lower() in ('1', 'true', 'yes')
+"""Download the runway directory from GitLab as one archive instead of
+requesting each file, see ``runway_base_path``.
+
+Every file is read from the same commit. Files outside the runway directory
+are still requested one at a time.
+
+    | *Default*: ``true``
+    | *Required*: No
+"""
 AMI_JSON_URL = validate_key_values(CONFIG, 'base', 'ami_json_url')
 DEFAULT_RUN_AS_USER = validate_key_values(CONFIG, 'base', 'default_run_as_user', default=None)
 DEFAULT_SECURITYGROUP_RULES = _generate_security_groups('default_securitygroup_rules')
@@ -239,12 +249,128 @@ SLACK_TOKEN = validate_key_values(CONFIG, 'credentials', 'slack_token')
 GATE_AUTHENTICATION = validate_key_values(CONFIG, 'credentials', 'gate_authentication', default={})
 DEFAULT_TASK_TIMEOUT = validate_key_values(CONFIG, 'task_timeouts', 'default', default=120)
 TASK_TIMEOUTS = json.loads(validate_key_values(CONFIG, 'task_timeouts', 'envs', default="{}"))
+TASK_DETACH = bool(getenv('FOREMAST_TASK_DETACH'))
+"""Set the `FOREMAST_TASK_DETACH` environment variable to post Spinnaker Tasks
+without waiting for them, when no later step depends on their result.
+
+Posted Tasks are recorded in ``TASK_JOURNAL_FILE``. Run ``foremast tasks wait``
+later to wait for them and report failures.
+"""
+TASK_JOURNAL_FILE = expandvars(
+    expanduser(
+        getenv('FOREMAST_TASK_JOURNAL',
+               validate_key_values(CONFIG, 'tasks', 'journal', default='foremast-tasks.jsonl'))))
+"""Journal of Spinnaker Tasks posted without waiting, relative paths are in the
+current directory. The `FOREMAST_TASK_JOURNAL` environment variable takes
+precedence.
+
+    | *Default*: ``foremast-tasks.jsonl``
+    | *Required*: No
+"""
 ASG_WHITELIST = set(validate_key_values(CONFIG, 'whitelists', 'asg_whitelist', default='').split(','))
 APP_FORMATS = extract_formats(CONFIG)
 GATE_CLIENT_CERT = expandvars(expanduser(validate_key_values(CONFIG, 'base', 'gate_client_cert', default='')))
 GATE_CA_BUNDLE = expandvars(expanduser(validate_key_values(CONFIG, 'base', 'gate_ca_bundle', default='')))
+GATE_POOL_MAXSIZE = int(validate_key_values(CONFIG, 'base', 'gate_pool_maxsize', default=10))
+"""Maximum number of keep-alive connections to hold open per Gate host.
+
+All Gate requests share one pooled HTTP session per process. Raise this when
+running many Gate requests concurrently.
+
+    | *Default*: ``10``
+    | *Required*: No
+"""
+GATE_MAX_IN_FLIGHT = int(validate_key_values(CONFIG, 'base', 'gate_max_in_flight', default=GATE_POOL_MAXSIZE))
+"""Maximum number of concurrent Gate requests.
+
+Foremast lowers the limit while Gate responds with ``429`` or ``503`` and
+raises it again as requests succeed.
+
+    | *Default*: ``gate_pool_maxsize``
+    | *Required*: No
+"""
+GATE_RETRY_ATTEMPTS = int(validate_key_values(CONFIG, 'base', 'gate_retry_attempts', default=5))
+"""Number of attempts for a Gate request answered with ``429`` or ``503``.
+
+Retries wait for the ``Retry-After`` header or a jittered exponential backoff.
+``POST`` requests answered ``503`` without ``Retry-After`` are not retried, as
+Gate may have acted on them.
+
+    | *Default*: ``5``
+    | *Required*: No
+"""
 LINKS = _convert_string_to_native(validate_key_values(CONFIG, 'links', 'default', default='{}'))
 
+CACHE_DIR = expandvars(expanduser(validate_key_values(CONFIG, 'cache', 'directory', default='~/.foremast/cache')))
+"""Directory for caches shared between Foremast runs, e.g. Gate catalogs and
+Spinnaker Task durations.
+
+    | *Default*: ``~/.foremast/cache``
+    | *Required*: No
+"""
+
+CACHE_BYPASS = bool(getenv('FOREMAST_CACHE_BYPASS'))
+"""Set the `FOREMAST_CACHE_BYPASS` environment variable to skip cached reads.
+
+Fresh responses are still written to the cache for later runs.
+"""
+
+GATE_CACHE_TTLS = _convert_string_to_native(validate_key_values(CONFIG, 'cache', 'gate_ttls', default='{}'))
+"""Seconds to cache Gate GET responses, keyed by URI template.
+
+Overrides :data:`foremast.utils.gate_cache.DEFAULT_GATE_CACHE_TTLS`. Use ``0``
+to disable caching for a URI.
+
+    | *Default*: ``{}``
+    | *Required*: No
+    | *Example*: ``{"/subnets/aws": 3600, "/credentials/{env}": 0}``
+"""
+
+AMI_CACHE_TTL = int(validate_key_values(CONFIG, 'cache', 'ami_ttl', default=300))
+"""Seconds to use the ``ami_json_url`` document before asking for it again.
+
+The document is stored under ``CACHE_DIR`` with its ``ETag`` and
+``Last-Modified`` validators, so an unchanged document is revalidated without
+downloading it again.
+
+    | *Default*: ``300``
+    | *Required*: No
+"""
+
+AMI_SNAPSHOT = expandvars(
+    expanduser(getenv('FOREMAST_AMI_SNAPSHOT', validate_key_values(CONFIG, 'cache', 'ami_snapshot', default=''))))
+"""AMI catalog file to use instead of ``ami_json_url`` or GitLab, for
+reproducible pipelines. Write one with ``foremast cache pin-amis``. The
+`FOREMAST_AMI_SNAPSHOT` environment variable takes precedence.
+
+    | *Default*: ``''``
+    | *Required*: No
+    | *Example*: ``amis.json``
+"""
+
+GIT_CACHE_SIZE = int(validate_key_values(CONFIG, 'cache', 'git_size', default=64))
+"""Megabytes of GitLab files and archives to keep under ``CACHE_DIR``.
+
+Files are stored by Project, commit and path, so they never go stale. The
+least recently used files are removed past this size.
+
+    | *Default*: ``64``
+    | *Required*: No
+"""
+
+METRICS_FILE = expandvars(
+    expanduser(getenv('FOREMAST_METRICS_FILE', validate_key_values(CONFIG, 'metrics', 'file', default=''))))
+"""File to export Gate and AWS call metrics to when Foremast exits.
+
+Files ending in ``.prom`` are written in the Prometheus text format, e.g. for
+a node exporter textfile collector, anything else as JSON. The
+`FOREMAST_METRICS_FILE` environment variable takes precedence.
+
+    | *Default*: ``''``
+    | *Required*: No
+    | *Example*: ``/var/lib/node_exporter/foremast.prom``
+"""
+
 HEADERS = {
     'accept': '*/*',
     'content-type': 'application/json',
@@ -36,6 +36,6 @@ def destroy_elb(app='', env='dev', region='us-east-1', **_):
         region=region,
         vpc=get_vpc_id(account=env, region=region))
 
-    wait_for_task(task_json)
+    wait_for_task(task_json, detachable=True)
 
     return True
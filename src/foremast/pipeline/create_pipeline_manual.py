@@ -18,7 +18,7 @@ import json
 import jinja2
 
 
-from ..consts import TEMPLATES_PATH
+from ..consts import RUNWAY_BASE_PATH, TEMPLATES_PATH
 from ..utils import get_pipeline_id, normalize_pipeline_name
 from ..utils.lookups import FileLookup
 from .create_pipeline import SpinnakerPipeline
@@ -99,7 +99,8 @@ class SpinnakerPipelineManual(SpinnakerPipeline):
             lookup = FileLookup(git_short=None, runway_dir=pipeline_templates_path)
         else:
             # Consider it a local repo file, check local or git:
-            lookup = FileLookup(git_short=self.generated.gitlab()['main'], runway_dir=self.runway_dir)
+            lookup = FileLookup(
+                git_short=self.generated.gitlab()['main'], runway_dir=self.runway_dir, archive_path=RUNWAY_BASE_PATH)
 
         return lookup.get(filename=file_name)
 
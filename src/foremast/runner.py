@@ -29,6 +29,7 @@ Then run specific prepare jobs.
 import argparse
 import logging
 import os
+from functools import partial
 
 import gogoutils
 
@@ -37,6 +38,7 @@ from foremast import (autoscaling_policy, awslambda, configs, consts, datapipeli
 from foremast.plugin_manager import PluginManager
 
 from .args import add_debug
+from .utils.gate_async import gate_gather
 
 LOG = logging.getLogger(__name__)
 
@@ -47,6 +49,7 @@ class ForemastRunner:
     def __init__(self):
         """Setup the Runner for all Foremast modules."""
         debug_flag()
+        utils.enable_metrics()
 
         self.email = os.getenv("EMAIL")
         self.env = os.getenv("ENV")
@@ -102,6 +105,49 @@ class ForemastRunner:
             pipeline_config=self.configs['pipeline'])
         spinnakerapp.create()
 
+    def prefetch(self, vpcs=False, credentials=False, security_groups=False, amis=False):
+        """Load the Spinnaker catalogs later steps look up, all at once.
+
+        Each lookup fills a shared cache, so the steps after this find the
+        Application details, Subnets and the requested catalogs without
+        waiting on Gate. A failed lookup is only logged, the step needing it
+        looks again and reports the error.
+
+        Args:
+            vpcs (bool): Also list the VPCs.
+            credentials (bool): Also get the credentials of the environment.
+            security_groups (bool): Also list the Security Groups in the
+                environment and region.
+            amis (bool): Also load the AMI catalog.
+
+        """
+        utils.banner("Prefetching Spinnaker Catalogs")
+
+        calls = {
+            'Application details': partial(utils.APP_DETAILS.repo, self.app),
+            'Subnets': utils.SUBNET_CATALOG.load,
+        }
+
+        if vpcs:
+            calls['VPCs'] = utils.VPC_CATALOG.load
+
+        if credentials and self.env:
+            calls['credentials'] = partial(utils.get_env_credential, env=self.env)
+
+        if security_groups and self.env and self.region:
+            calls['Security Groups'] = partial(utils.SECURITY_GROUP_CATALOG.load, env=self.env, region=self.region)
+
+        if amis and self.region:
+            calls['AMI catalog'] = partial(utils.load_ami_catalog, region=self.region)
+        elif amis:
+            calls['AMI catalog'] = utils.load_ami_catalog
+
+        results = gate_gather(calls.values(), return_exceptions=True)
+
+        for name, result in zip(calls, results):
+            if isinstance(result, Exception):
+                LOG.info('Could not prefetch %s: %s', name, result)
+
     def create_pipeline(self, onetime=None):
         """Create the spinnaker pipeline(s)."""
         utils.banner("Creating Pipeline")
@@ -282,6 +328,8 @@ def prepare_infrastructure():
     eureka = runner.configs[runner.env]['app']['eureka_enabled']
     deploy_type = runner.configs['pipeline']['type']
 
+    runner.prefetch(vpcs=True, credentials=True, security_groups=deploy_type not in ['s3', 'datapipeline'])
+
     if deploy_type not in ['s3', 'datapipeline']:
         runner.create_iam()
         # TODO: Refactor Archaius to be fully featured
@@ -312,6 +360,10 @@ def prepare_app_pipeline():
     runner = ForemastRunner()
     runner.write_configs()
     runner.create_app()
+
+    # Only the default pipeline looks up AMIs, see ForemastRunner.create_pipeline
+    pipeline_type = runner.configs['pipeline']['type']
+    runner.prefetch(amis=pipeline_type not in {'lambda', 's3', 'datapipeline'} | consts.MANUAL_TYPES)
     runner.create_pipeline()
     runner.cleanup()
 
@@ -401,6 +453,50 @@ def promote_s3app():
     runner.promote_s3app()
 
 
+def clear_gate_cache(*args):
+    """Remove cached Gate responses.
+
+    Use to pick up Spinnaker catalog changes before the cache expires.
+    """
+    uri = None
+
+    if args:
+        command_args, *_ = args
+        uri = command_args.parsed.uri
+
+    utils.gate.GATE_CACHE.invalidate(uri=uri)
+
+
+def pin_ami_catalog(*args):
+    """Write the AMI catalog from ``ami_json_url`` to a file.
+
+    Set ``FOREMAST_AMI_SNAPSHOT`` to the file to render Pipelines with these
+    AMIs.
+    """
+    path = 'amis.json'
+
+    if args:
+        command_args, *_ = args
+        path = command_args.parsed.path
+
+    utils.lookups.AMI_CATALOG.pin(path, url=consts.AMI_JSON_URL)
+
+
+def wait_for_detached_tasks(*args):
+    """Wait for Spinnaker Tasks posted with ``FOREMAST_TASK_DETACH`` set.
+
+    Every failed or timed out Task is reported before exiting with an error.
+    """
+    journal = None
+
+    if args:
+        command_args, *_ = args
+        if command_args.parsed.journal:
+            journal = utils.tasks.TaskJournal(path=command_args.parsed.journal)
+
+    utils.tasks.wait_for_detached_tasks(journal=journal)
+
+
 def debug_flag():
     """Set logging level for entry points."""
     logging.basicConfig(format=consts.LOGGING_FORMAT)
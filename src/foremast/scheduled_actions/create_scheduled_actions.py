@@ -63,7 +63,7 @@ class ScheduledActions:
 
         rendered_template = get_template(template_file='infrastructure/scheduled_actions.json.j2', **template_kwargs)
         self.log.info('Creating scheduled actions in %s for %s', self.env, self.app)
-        wait_for_task(rendered_template)
+        wait_for_task(rendered_template, detachable=True)
         self.log.info('Successfully created scheduled actions in %s for %s', self.env, self.app)
 
     def create_scheduled_actions(self):
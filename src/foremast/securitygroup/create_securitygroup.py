@@ -50,7 +50,8 @@ from deepmerge import conservative_merger
 from ..consts import DEFAULT_SECURITYGROUP_RULES
 from ..exceptions import (ForemastConfigurationFileError, SpinnakerSecurityGroupCreationFailed,
                           SpinnakerSecurityGroupError)
-from ..utils import get_details, get_properties, get_security_group_id, get_template, get_vpc_id, wait_for_task
+from ..utils import (SECURITY_GROUP_CATALOG, get_details, get_properties, get_security_group_id, get_template,
+                     get_vpc_id, wait_for_task)
 
 
 class SpinnakerSecurityGroup:
@@ -227,6 +228,9 @@ class SpinnakerSecurityGroup:
             template_file='infrastructure/securitygroup_data.json.j2', formats=self.generated, **template_kwargs)
 
         wait_for_task(secgroup_json)
+
+        # Look up the new group in a fresh listing
+        SECURITY_GROUP_CATALOG.clear(env=self.env, region=self.region)
         return True
 
     def create_security_group(self):  # noqa
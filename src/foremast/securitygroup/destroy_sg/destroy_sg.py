@@ -45,6 +45,6 @@ def destroy_sg(app='', env='', region='', **_):
         LOG.info('Found Security Group in %(region)s: %(name)s', security_group)
 
         destroy_request = get_template('destroy/destroy_sg.json.j2', app=app, env=env, region=region, vpc=vpc)
-        wait_for_task(destroy_request)
+        wait_for_task(destroy_request, detachable=True)
 
     return True
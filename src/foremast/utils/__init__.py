@@ -18,7 +18,7 @@ from .apps import *
 from .asg import *
 from .banners import *
 from .pipelines import *
-from .deep_chain_map import DeepChainMap
+from .deep_chain_map import DeepChainMap, deep_merge
 from .elb import *
 from .encoding import *
 from .generate_filename import *
@@ -39,3 +39,4 @@ from .get_sns_subscriptions import get_sns_subscriptions
 from .get_sns_topic_arn import get_sns_topic_arn
 from .dynamodb_stream import get_dynamodb_stream_arn
 from .roles import *
+from .metrics import METRICS, enable_metrics, instrument_botocore
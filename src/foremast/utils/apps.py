@@ -15,6 +15,7 @@
 #   limitations under the License.
 """Application related utilities."""
 import logging
+import threading
 
 import gogoutils
 
@@ -44,30 +45,107 @@ def get_all_apps():
     return pipelines
 
 
+class AppDetailsCatalog:
+    """Spinnaker Application details, downloaded once per Application per process.
+
+    Only the Git group and project of an Application are kept, the
+    :class:`gogoutils.Generator` for an environment and region is derived from
+    them once and shared by later lookups. Failed lookups are not remembered.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._repos = {}
+        self._generators = {}
+
+    def clear(self, app=None):
+        """Forget the details of _app_, or of every Application."""
+        with self._lock:
+            if app is None:
+                self._repos.clear()
+                self._generators.clear()
+                return
+
+            self._repos.pop(app, None)
+            for key in [key for key in self._generators if key[0] == app]:
+                del self._generators[key]
+
+    def repo(self, app):
+        """Get the Git group and project of _app_.
+
+        Args:
+            app (str): Application name.
+
+        Returns:
+            tuple: Git group and project.
+
+        Raises:
+            :obj:`foremast.exceptions.SpinnakerAppNotFound`: Spinnaker does not
+                know _app_.
+
+        """
+        try:
+            return self._repos[app]
+        except KeyError:
+            pass
+
+        uri = '/applications/{app}'.format(app=app)
+        request = gate_request(uri=uri)
+
+        if not request.ok:
+            raise SpinnakerAppNotFound('"{0}" not found.'.format(app))
+
+        app_details = request.json()
+
+        LOG.debug('App details: %s', app_details)
+        repo = (app_details['attributes'].get('repoProjectKey'), app_details['attributes'].get('repoSlug'))
+
+        with self._lock:
+            return self._repos.setdefault(app, repo)
+
+    def generator(self, app, env, region):
+        """Get the names derived for _app_ in _env_ and _region_.
+
+        Args:
+            app (str): Application name.
+            env (str): Environment/account name.
+            region (str): Region name, e.g. us-east-1.
+
+        Returns:
+            gogoutils.Generator: Generated names, shared with other callers.
+
+        """
+        key = (app, env, region)
+        try:
+            return self._generators[key]
+        except KeyError:
+            pass
+
+        group, project = self.repo(app)
+        generated = gogoutils.Generator(group, project, env=env, region=region, formats=APP_FORMATS)
+
+        with self._lock:
+            return self._generators.setdefault(key, generated)
+
+
+APP_DETAILS = AppDetailsCatalog()
+"""Application details shared by every lookup in this process."""
+
+
 def get_details(app='groupproject', env='dev', region='us-east-1'):
     """Extract details for Application.
 
     Args:
         app (str): Application Name
         env (str): Environment/account to get details from
+        region (str): Region to get details for
 
     Returns:
         collections.namedtuple with _group_, _policy_, _profile_, _role_,
             _user_.
 
     """
-    uri = '/applications/{app}'.format(app=app)
-    request = gate_request(uri=uri)
-
-    if not request.ok:
-        raise SpinnakerAppNotFound('"{0}" not found.'.format(app))
-
-    app_details = request.json()
-
-    LOG.debug('App details: %s', app_details)
-    group = app_details['attributes'].get('repoProjectKey')
-    project = app_details['attributes'].get('repoSlug')
-    generated = gogoutils.Generator(group, project, env=env, region=region, formats=APP_FORMATS)
+    generated = APP_DETAILS.generator(app, env, region)
 
     LOG.debug('Application details: %s', generated)
     return generated
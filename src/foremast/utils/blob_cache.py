@@ -0,0 +1,123 @@
+#   Foremast - Pipeline Tooling
+#
+#   Copyright 2019 Redbox Automated Retail, LLC
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+"""Keep files read from GitLab at a commit under ``CACHE_DIR``.
+
+Contents of a path at a commit never change, so cached files are used
+without asking GitLab again. The least recently used files are removed once
+the cache grows past ``GIT_CACHE_SIZE`` megabytes.
+"""
+import hashlib
+import logging
+import os
+import tempfile
+import threading
+from contextlib import suppress
+
+from ..consts import CACHE_BYPASS, CACHE_DIR, GIT_CACHE_SIZE
+
+LOG = logging.getLogger(__name__)
+
+
+class BlobCache:
+    """File contents keyed by Project, commit and path.
+
+    Args:
+        directory (str): Directory holding the files.
+        max_bytes (int): Size to trim the cache to, least recently used
+            first.
+    """
+
+    def __init__(self, directory=os.path.join(CACHE_DIR, 'git'), max_bytes=GIT_CACHE_SIZE * 1024 * 1024):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+
+    def _path(self, project, commit, path):
+        key = '\0'.join((project, commit, path))
+        return os.path.join(self.directory, hashlib.sha256(key.encode()).hexdigest())
+
+    def get(self, project, commit, path):
+        """Get the cached contents of _path_ at _commit_.
+
+        Args:
+            project (str): Short Git representation of repository, e.g.
+                forrest/core.
+            commit (str): Commit ID.
+            path (str): Path relative to the repository root.
+
+        Returns:
+            bytes: File contents, None when not cached.
+
+        """
+        if CACHE_BYPASS:
+            return None
+
+        blob_path = self._path(project, commit, path)
+        try:
+            with open(blob_path, 'rb') as blob_file:
+                contents = blob_file.read()
+            # The modification time orders files for eviction
+            os.utime(blob_path)
+        except OSError:
+            return None
+
+        LOG.debug('Using cached "%s" from "%s" at %s.', path, project, commit)
+        return contents
+
+    def put(self, project, commit, path, contents):
+        """Cache the _contents_ of _path_ at _commit_.
+
+        Args:
+            project (str): Short Git representation of repository.
+            commit (str): Commit ID.
+            path (str): Path relative to the repository root.
+            contents (bytes): File contents.
+
+        """
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            handle, temp_path = tempfile.mkstemp(dir=self.directory, prefix='.tmp-')
+            with os.fdopen(handle, 'wb') as blob_file:
+                blob_file.write(contents)
+            os.replace(temp_path, self._path(project, commit, path))
+        except OSError as error:
+            LOG.warning('Could not cache "%s" from "%s": %s', path, project, error)
+            return
+
+        self.evict()
+
+    def evict(self):
+        """Remove the least recently used files past _max_bytes_."""
+        with self._lock:
+            try:
+                blobs = [(entry.stat().st_mtime, entry.stat().st_size, entry.path)
+                         for entry in os.scandir(self.directory)
+                         if entry.is_file() and not entry.name.startswith('.tmp-')]
+            except OSError:
+                return
+
+            size = sum(blob_size for _, blob_size, _ in blobs)
+            for _, blob_size, blob_path in sorted(blobs):
+                if size <= self.max_bytes:
+                    break
+                with suppress(FileNotFoundError):
+                    os.remove(blob_path)
+                size -= blob_size
+                LOG.debug('Evicted %s from the GitLab file cache.', blob_path)
+
+
+GIT_BLOBS = BlobCache()
+"""GitLab files and archives shared by every lookup, see :class:`BlobCache`."""
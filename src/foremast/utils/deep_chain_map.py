@@ -55,3 +55,48 @@ class DeepChainMap(collections.ChainMap):
             except KeyError:
                 pass
         return self.__missing__(key)
+
+
+def _copy_dicts(mapping):
+    """Copy _mapping_ and every dict nested in it, sharing other values."""
+    return {key: _copy_dicts(value) if isinstance(value, dict) else value for key, value in mapping.items()}
+
+
+def deep_merge(*maps):
+    """Merge _maps_ into a dict equal to ``dict(DeepChainMap(*maps))``.
+
+    Each value is visited once instead of on every lookup. Earlier _maps_ take
+    precedence, nested dicts found in several _maps_ are merged and keys keep
+    the order :class:`DeepChainMap` gives them. Like :class:`DeepChainMap`,
+    every nested dict of the result is a new dict, other values such as lists
+    are shared with _maps_.
+
+        >>> first = {'key1': {'key1_1': 'first_one'}}
+        >>> second = {'key1': {'key1_1': 'second_one', 'key1_2': 'second_two'}}
+        >>> deep_merge(first, second)
+        {'key1': {'key1_1': 'first_one', 'key1_2': 'second_two'}}
+
+    Args:
+        maps (dict): Mappings in order of precedence.
+
+    Returns:
+        dict: Merged mapping.
+    """
+    keys = {}
+    for mapping in reversed(maps):
+        keys.update(dict.fromkeys(mapping))
+
+    merged = {}
+    for key in keys:
+        values = [mapping[key] for mapping in maps if key in mapping]
+        value = values[0]
+        if isinstance(value, dict) and len(values) == 1:
+            value = _copy_dicts(value)
+        elif isinstance(value, dict):
+            if all(isinstance(other, dict) for other in values):
+                value = deep_merge(*values)
+            else:
+                # Overlaying a non dict value is rare, let DeepChainMap decide
+                value = dict(DeepChainMap(*(mapping.get(key, {}) for mapping in maps)))
+        merged[key] = value
+    return merged
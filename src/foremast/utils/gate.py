@@ -14,57 +14,240 @@
 #   See the License for the specific language governing permissions and
 #   limitations under the License.
 """Centralized Methods interacting with the Spinnaker Gate API."""
+import atexit
+import json
 import logging
+import threading
+import time
+from urllib.parse import urlsplit
 
 import requests
+from requests.adapters import HTTPAdapter
 
-from ..consts import API_URL, GATE_AUTHENTICATION, GATE_CA_BUNDLE, GATE_CLIENT_CERT
-from ..exceptions import GoogleIAPTokenError
-from .google_iap import get_google_iap_bearer_token
+from ..consts import (API_URL, GATE_CA_BUNDLE, GATE_CLIENT_CERT, GATE_MAX_IN_FLIGHT, GATE_POOL_MAXSIZE,
+                      GATE_RETRY_ATTEMPTS)
+from .gate_auth import get_gate_credentials
+from .gate_cache import GateCache
+from .gate_limiter import AIMDLimiter, backoff_delay
+from .metrics import METRICS, gate_uri_template
+from .singleflight import SingleFlight
 
 LOG = logging.getLogger(__name__)
 OAUTH_ENABLED = False
 
+GATE_SESSION = None
+GATE_SESSION_LOCK = threading.Lock()
+GATE_CACHE = GateCache()
+atexit.register(GATE_CACHE.log_stats)
+GATE_SINGLEFLIGHT = SingleFlight()
+"""Coalesces identical concurrent GET requests, see :meth:`SingleFlight.stats`."""
+GATE_LIMITER = AIMDLimiter(initial=GATE_MAX_IN_FLIGHT)
+"""Adaptive concurrency limit shared by all Gate requests, see :meth:`AIMDLimiter.stats`."""
+OVERLOADED_STATUSES = frozenset((429, 503))
+IDEMPOTENT_METHODS = frozenset(('GET', 'DELETE'))
+"""Methods safe to repeat after any overloaded response."""
 
-def gate_request(method='GET', uri=None, headers={}, data={}, params={}):
-    """Make a request to Gate's API via various auth methods
 
-    Args:
-        method (str): Method to request Gate API; GET or POST
-        uri (str): URI path to gate API
+def get_gate_session():
+    """Get the process wide HTTP session used for all Gate requests.
+
+    The session keeps connections to Gate alive between requests, so the TCP
+    and TLS handshakes, including any ``GATE_CLIENT_CERT`` exchange, happen
+    once per pooled connection instead of once per request.
+
+    Returns:
+        requests.Session: Shared session with a connection pool of
+        ``GATE_POOL_MAXSIZE`` per host.
+
     """
-    response = None
+    global GATE_SESSION  # pylint: disable=global-statement
 
-    url = '{host}{uri}'.format(host=API_URL, uri=uri)
+    with GATE_SESSION_LOCK:
+        if GATE_SESSION is None:
+            LOG.debug('Creating Gate session with %d pooled connections per host.', GATE_POOL_MAXSIZE)
+            adapter = HTTPAdapter(pool_connections=GATE_POOL_MAXSIZE, pool_maxsize=GATE_POOL_MAXSIZE)
 
-    if GATE_AUTHENTICATION:
-        if 'google_iap' in GATE_AUTHENTICATION:
-            iap_response = get_google_iap_bearer_token(GATE_AUTHENTICATION['google_iap']['oauth_client_id'],
-                                                       GATE_AUTHENTICATION['google_iap']['sa_credentials_path'])
+            session = requests.Session()
+            session.mount('http://', adapter)
+            session.mount('https://', adapter)
 
-            if 'id_token' not in iap_response:
-                raise GoogleIAPTokenError
+            GATE_SESSION = session
 
-            headers['Authorization'] = 'Bearer {}'.format(iap_response['id_token'])
-            LOG.info('Successfully set Google IAP Bearer Token in Request.')
+    return GATE_SESSION
 
-        elif 'github' in GATE_AUTHENTICATION:
-            github_token = GATE_AUTHENTICATION['github']['token']
-            headers['Authorization'] = 'Bearer {}'.format(github_token)
-            LOG.info('Successfully set Github Bearer Token in Request.')
 
-    method = method.upper()
+def _response_size(response):
+    """Get the body size without reading a streamed body."""
+    if response._content_consumed:  # pylint: disable=protected-access
+        return len(response.content or b'')
+    return int(response.headers.get('Content-Length', 0))
+
+
+def _session_request(session, method, url, headers, data, params, stream):
+    """Dispatch _method_ to the matching :class:`requests.Session` call."""
     if method == 'GET':
-        response = requests.get(url, params=params, headers=headers, verify=GATE_CA_BUNDLE, cert=GATE_CLIENT_CERT)
+        response = session.get(
+            url,
+            params=params,
+            headers=headers,
+            verify=GATE_CA_BUNDLE,
+            cert=GATE_CLIENT_CERT,
+            stream=stream)
     elif method == 'POST':
-        response = requests.post(url, data=data, headers=headers, verify=GATE_CA_BUNDLE, cert=GATE_CLIENT_CERT)
+        response = session.post(url, data=data, headers=headers, verify=GATE_CA_BUNDLE, cert=GATE_CLIENT_CERT)
     elif method == 'DELETE':
-        response = requests.delete(url, headers=headers, verify=GATE_CA_BUNDLE, cert=GATE_CLIENT_CERT)
+        response = session.delete(url, headers=headers, verify=GATE_CA_BUNDLE, cert=GATE_CLIENT_CERT)
     else:
         raise NotImplementedError
 
-    if response.status_code in ['401', '403', '503']:
+    return response
+
+
+def _send_once(method, url, headers, data, params, credentials, stream=False):
+    """Send one request to Gate over the shared session."""
+    request_headers = dict(headers or {})
+    request_headers.update(credentials.headers())
+
+    session = get_gate_session()
+    uri = url[len(API_URL):] if API_URL and url.startswith(API_URL) else urlsplit(url).path
+    operation = '{0} {1}'.format(method, gate_uri_template(uri))
+    start = time.monotonic()
+
+    try:
+        response = _session_request(session, method, url, request_headers, data, params, stream)
+    except requests.exceptions.RequestException:
+        METRICS.record('gate', operation, time.monotonic() - start, error=True)
+        raise
+
+    METRICS.record(
+        'gate', operation, time.monotonic() - start, size=_response_size(response), error=not response.ok)
+    return response
+
+
+def _retryable(method, response):
+    """Check if _response_ shows Gate did not process the request, so it can be sent again.
+
+    A ``503`` may come after Gate acted on the request, so only idempotent
+    methods are retried then, unless a ``Retry-After`` header asks for it.
+    A ``429`` always means the request was rejected.
+    """
+    return method in IDEMPOTENT_METHODS or response.status_code == 429 or 'Retry-After' in response.headers
+
+
+def _send(method, url, headers, data, params, credentials, stream=False):
+    """Send a request to Gate within :data:`GATE_LIMITER`, backing off while overloaded.
+
+    Requests that may have been processed, like a ``POST`` answered ``503``,
+    are not retried, see :func:`_retryable`.
+
+    Raises:
+        requests.exceptions.HTTPError: Gate denied access or stayed
+            overloaded for ``GATE_RETRY_ATTEMPTS`` attempts.
+
+    """
+    attempts = max(1, GATE_RETRY_ATTEMPTS)
+    for attempt in range(attempts):
+        with GATE_LIMITER.slot():
+            response = _send_once(method, url, headers, data, params, credentials, stream=stream)
+
+        if response.status_code not in OVERLOADED_STATUSES:
+            GATE_LIMITER.success()
+            break
+
+        GATE_LIMITER.overload()
+        if attempt + 1 == attempts or not _retryable(method, response):
+            break
+
+        delay = backoff_delay(attempt, response)
+        LOG.info('Gate responded %d to %s, retrying in %.1f seconds.', response.status_code, url, delay)
+        response.close()
+        time.sleep(delay)
+
+    if response.status_code == 401:
+        credentials.expire()
+
+    if response.status_code in (401, 403, 429, 503):
         response.raise_for_status()
 
-    LOG.info(response.content)
+    return response
+
+
+def gate_request(method='GET', uri=None, headers=None, data=None, params=None):
+    """Make a request to Gate's API via various auth methods
+
+    Args:
+        method (str): Method to request Gate API; GET or POST
+        uri (str): URI path to gate API
+        headers (dict): Extra request headers, authentication headers are
+            added from :func:`foremast.utils.gate_auth.get_gate_credentials`.
+        data (str): Body for POST requests.
+        params (dict): Query parameters for GET requests.
+
+    GET requests for slowly changing catalogs, like ``/subnets/aws``, are
+    served from :class:`foremast.utils.gate_cache.GateCache` while fresh, and
+    large listings, like ``/applications``, are revalidated with Gate. Their
+    bodies are streamed to disk and read back from the cache file, so they
+    can be decoded incrementally with
+    :func:`foremast.utils.json_stream.iter_json_array`.
+    Identical GET requests made at the same time from several threads share
+    a single call to Gate, see :data:`GATE_SINGLEFLIGHT`.
+    """
+    response = None
+
+    url = '{host}{uri}'.format(host=API_URL, uri=uri)
+
+    credentials = get_gate_credentials()
+
+    method = method.upper()
+    if method != 'GET':
+        response = _send(method, url, headers, data, params, credentials)
+        LOG.debug('Gate responded %d with %d bytes to %s %s.', response.status_code, len(response.content), method, uri)
+        return response
+
+    cache_ttl = GATE_CACHE.ttl(uri)
+    cached = bool(cache_ttl or GATE_CACHE.conditional(uri))
+    cache_key = GATE_CACHE.key(url, params=params, identity=credentials.identity)
+    cache_entry = None
+    if cached:
+        cache_entry = GATE_CACHE.load(cache_key)
+        if GATE_CACHE.fresh(cache_entry, cache_ttl):
+            response = GATE_CACHE.response(cache_key)
+            if response is not None:
+                return response
+
+    def fetch():
+        """Fetch from Gate, revalidating and storing cached responses.
+
+        Returns:
+            requests.models.Response: Response with the body read, None when
+            the body is in the cache.
+
+        """
+        request_headers = dict(headers or {})
+        request_headers.update(GATE_CACHE.validators(cache_entry))
+
+        fetched = _send(method, url, request_headers, data, params, credentials, stream=cached)
+
+        if fetched.status_code == 304 and cache_entry:
+            GATE_CACHE.not_modified(cache_key, cache_entry)
+            return None
+
+        if cached and GATE_CACHE.put(cache_key, fetched):
+            return None
+
+        # Read before the response is shared with other threads
+        LOG.debug('Gate responded %d with %d bytes to %s %s.', fetched.status_code, len(fetched.content), method,
+                  uri)
+        return fetched
+
+    flight_key = (method, url, json.dumps(sorted((params or {}).items()), default=str), credentials.identity)
+    response = GATE_SINGLEFLIGHT.do(flight_key, fetch)
+
+    if response is None:
+        # Every caller reads the body from its own handle on the cache file
+        response = GATE_CACHE.response(cache_key)
+    if response is None:
+        LOG.info('Gate cache entry for %s was removed, requesting it again.', uri)
+        response = _send(method, url, headers, data, params, credentials)
+
     return response
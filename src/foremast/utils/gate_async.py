@@ -0,0 +1,126 @@
+#   Foremast - Pipeline Tooling
+#
+#   Copyright 2019 Redbox Automated Retail, LLC
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+"""Concurrent access to the Spinnaker Gate API with asyncio.
+
+Requests are executed by :func:`foremast.utils.gate.gate_request` on a bounded
+thread pool, so authentication, CA bundle and client certificate handling as
+well as the pooled connections are shared with synchronous callers.
+
+Example:
+    Look up VPCs for every region at once::
+
+        vpc_ids = gate_gather(functools.partial(get_vpc_id, 'dev', region) for region in REGIONS)
+"""
+import asyncio
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+
+from ..consts import GATE_MAX_IN_FLIGHT
+from .gate import gate_request
+
+LOG = logging.getLogger(__name__)
+
+
+class AsyncGateClient:
+    """asyncio client for Gate limiting the number of requests in flight.
+
+    Args:
+        max_in_flight (int): Maximum concurrent Gate calls.
+    """
+
+    def __init__(self, max_in_flight=GATE_MAX_IN_FLIGHT):
+        self.max_in_flight = max_in_flight
+        self.executor = ThreadPoolExecutor(max_workers=max_in_flight)
+
+    def close(self):
+        """Shut down the worker threads."""
+        self.executor.shutdown(wait=True)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    async def call(self, func, *args, **kwargs):
+        """Run blocking _func_, e.g. a Gate lookup helper, without blocking the loop.
+
+        Args:
+            func (callable): Function to run in the worker threads.
+
+        Returns:
+            object: Return value of _func_.
+
+        """
+        loop = asyncio.get_event_loop()
+        return await loop.run_in_executor(self.executor, partial(func, *args, **kwargs))
+
+    async def request(self, method='GET', uri=None, **kwargs):
+        """Make a request to Gate, see :func:`foremast.utils.gate.gate_request`.
+
+        Returns:
+            requests.models.Response: Response from Gate.
+
+        """
+        return await self.call(gate_request, method=method, uri=uri, **kwargs)
+
+    async def gather(self, calls, return_exceptions=False):
+        """Run many calls concurrently with at most ``max_in_flight`` running.
+
+        Args:
+            calls (iterable): Callables taking no arguments, such as
+                :func:`functools.partial` objects, or coroutines.
+            return_exceptions (bool): Return exceptions in place of results
+                instead of raising the first one.
+
+        Returns:
+            list: Results in the same order as _calls_.
+
+        """
+        semaphore = asyncio.Semaphore(self.max_in_flight)
+
+        async def limited(call):
+            async with semaphore:
+                if asyncio.iscoroutine(call):
+                    return await call
+                return await self.call(call)
+
+        tasks = [limited(call) for call in calls]
+        LOG.debug('Gathering %d Gate calls, %d at a time.', len(tasks), self.max_in_flight)
+        return await asyncio.gather(*tasks, return_exceptions=return_exceptions)
+
+
+def gate_gather(calls, max_in_flight=GATE_MAX_IN_FLIGHT, return_exceptions=False):
+    """Run many Gate lookups concurrently from synchronous code.
+
+    Args:
+        calls (iterable): Callables taking no arguments, e.g.
+            ``functools.partial(get_vpc_id, 'dev', 'us-east-1')``.
+        max_in_flight (int): Maximum concurrent calls.
+        return_exceptions (bool): Return exceptions in place of results
+            instead of raising the first one.
+
+    Returns:
+        list: Results in the same order as _calls_.
+
+    """
+    loop = asyncio.new_event_loop()
+    try:
+        with AsyncGateClient(max_in_flight=max_in_flight) as client:
+            return loop.run_until_complete(client.gather(calls, return_exceptions=return_exceptions))
+    finally:
+        loop.close()
@@ -0,0 +1,155 @@
+#   Foremast - Pipeline Tooling
+#
+#   Copyright 2019 Redbox Automated Retail, LLC
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+"""Credential providers for authenticating to the Spinnaker Gate API."""
+import logging
+import threading
+import time
+
+import google.auth.jwt
+
+from ..consts import GATE_AUTHENTICATION
+from ..exceptions import GoogleIAPTokenError
+from .google_iap import get_google_iap_bearer_token
+
+LOG = logging.getLogger(__name__)
+
+GOOGLE_IAP_REFRESH_MARGIN = 60  # Seconds before expiry to fetch a new Google IAP token
+
+GATE_CREDENTIALS = None
+GATE_CREDENTIALS_LOCK = threading.Lock()
+
+
+class GateCredentials:
+    """Anonymous access to Gate, no extra headers are sent."""
+
+    identity = 'anonymous'
+
+    def headers(self):
+        """Get the authentication headers for a Gate request.
+
+        Returns:
+            dict: Headers to add to the request.
+
+        """
+        return {}
+
+    def expire(self):
+        """Forget any cached credentials, e.g. after Gate responds 401."""
+
+
+class GithubCredentials(GateCredentials):
+    """Static GitHub token sent as a Bearer token.
+
+    Args:
+        token (str): GitHub token.
+    """
+
+    identity = 'github'
+
+    def __init__(self, token):
+        self._headers = {'Authorization': 'Bearer {}'.format(token)}
+        LOG.info('Successfully set Github Bearer Token in Request.')
+
+    def headers(self):
+        """Get the Bearer token header."""
+        return self._headers
+
+
+class GoogleIAPCredentials(GateCredentials):
+    """Google Identity-Aware Proxy token cached until shortly before expiry.
+
+    The OpenID Connect token is only requested from Google when there is no
+    token yet or it expires within ``refresh_margin`` seconds. Concurrent
+    callers wait for a single refresh instead of each requesting a new token.
+
+    Args:
+        client_id (str): The OpenID Connect client ID used by Identity-Aware
+            Proxy.
+        key_path (str): Path to Google Cloud Service Account Credentials in
+            JSON Format.
+        refresh_margin (int): Seconds before expiry to refresh the token.
+    """
+
+    def __init__(self, client_id, key_path, refresh_margin=GOOGLE_IAP_REFRESH_MARGIN):
+        self.client_id = client_id
+        self.key_path = key_path
+        self.refresh_margin = refresh_margin
+        self.identity = 'google_iap:{0}'.format(client_id)
+
+        self._lock = threading.Lock()
+        self._headers = {}
+        self._expiry = 0
+
+    def _valid(self):
+        """Check the cached token is usable for at least ``refresh_margin``."""
+        return bool(self._headers) and time.time() < self._expiry - self.refresh_margin
+
+    def _refresh(self):
+        """Request a new token from Google and cache it.
+
+        Raises:
+            foremast.exceptions.GoogleIAPTokenError: Google did not return an
+                ``id_token``.
+
+        """
+        iap_response = get_google_iap_bearer_token(self.client_id, self.key_path)
+
+        if 'id_token' not in iap_response:
+            raise GoogleIAPTokenError
+
+        id_token = iap_response['id_token']
+        claims = google.auth.jwt.decode(id_token, verify=False)
+
+        self._headers = {'Authorization': 'Bearer {}'.format(id_token)}
+        self._expiry = claims.get('exp', 0)
+        LOG.info('Successfully set Google IAP Bearer Token in Request.')
+        LOG.debug('Google IAP token expires at %s.', self._expiry)
+
+    def headers(self):
+        """Get the Bearer token header, refreshing the token when needed."""
+        if not self._valid():
+            with self._lock:
+                if not self._valid():
+                    self._refresh()
+        return self._headers
+
+    def expire(self):
+        """Force the next request to fetch a new token."""
+        with self._lock:
+            self._headers = {}
+            self._expiry = 0
+
+
+def get_gate_credentials():
+    """Get the process wide credential provider for ``GATE_AUTHENTICATION``.
+
+    Returns:
+        GateCredentials: Provider for the configured authentication method.
+
+    """
+    global GATE_CREDENTIALS  # pylint: disable=global-statement
+
+    with GATE_CREDENTIALS_LOCK:
+        if GATE_CREDENTIALS is None:
+            if 'google_iap' in GATE_AUTHENTICATION:
+                GATE_CREDENTIALS = GoogleIAPCredentials(GATE_AUTHENTICATION['google_iap']['oauth_client_id'],
+                                                        GATE_AUTHENTICATION['google_iap']['sa_credentials_path'])
+            elif 'github' in GATE_AUTHENTICATION:
+                GATE_CREDENTIALS = GithubCredentials(GATE_AUTHENTICATION['github']['token'])
+            else:
+                GATE_CREDENTIALS = GateCredentials()
+
+    return GATE_CREDENTIALS
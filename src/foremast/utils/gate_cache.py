@@ -0,0 +1,461 @@
+#   Foremast - Pipeline Tooling
+#
+#   Copyright 2019 Redbox Automated Retail, LLC
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+"""On disk cache for slowly changing Gate catalogs.
+
+Cached responses are kept under ``CACHE_DIR`` so separate Foremast runs, such
+as parallel Jenkins jobs on one executor, share them. Entries are written to a
+temporary file and renamed into place so readers never see partial writes.
+
+Each entry is a line of JSON metadata followed by the body exactly as Gate sent
+it. Bodies are copied to disk as they arrive and read back from the file, so a
+catalog is never held in memory unless a caller decodes all of it.
+
+Large listings that change unpredictably, like ``/applications``, are not
+served blindly. Their ``ETag`` and ``Last-Modified`` validators are stored with
+the body and Gate is asked for the listing conditionally; a ``304 Not
+Modified`` answer is served from the cache.
+"""
+import hashlib
+import json
+import logging
+import os
+import pickle
+import re
+import tempfile
+import threading
+import time
+from functools import partial
+
+from requests.models import Response
+from requests.structures import CaseInsensitiveDict
+
+from ..consts import CACHE_BYPASS, CACHE_DIR, GATE_CACHE_TTLS
+
+LOG = logging.getLogger(__name__)
+
+DEFAULT_GATE_CACHE_TTLS = {
+    '/credentials': 300,
+    '/credentials/{env}': 300,
+    '/networks/aws': 600,
+    '/subnets/aws': 600,
+    '/v2/canaryConfig': 300,
+}
+"""Seconds to cache GET responses for each Gate URI template."""
+
+GATE_CONDITIONAL_URIS = (
+    '/applications',
+    '/applications/{app}/pipelineConfigs',
+)
+"""URI templates cached with validators and revalidated on every request."""
+
+CHUNK_SIZE = 64 * 1024
+"""Bytes of a response body to copy to disk at a time."""
+
+
+def _compile_template(template):
+    """Convert a URI template like ``/credentials/{env}`` to a regex."""
+    pattern = re.sub(r'\\{[^/]+?\\}', '[^/]+', re.escape(template))
+    return re.compile('^{0}$'.format(pattern))
+
+
+class _BodyReader:
+    """Raw body of a :class:`CachedResponse`, read from the cache file.
+
+    The file is opened on the first read, so responses decoded from a
+    snapshot never open it, and closed once read to the end.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.closed = False
+        self._file = None
+
+    def read(self, size=-1):
+        """Read up to _size_ bytes of the body."""
+        if self.closed:
+            return b''
+
+        if self._file is None:
+            self._file = open(self.path, 'rb')  # pylint: disable=consider-using-with
+            self._file.readline()
+
+        chunk = self._file.read(size)
+        if not chunk or size is None or size < 0:
+            self.close()
+        return chunk
+
+    def close(self):
+        """Close the cache file."""
+        self.closed = True
+        if self._file is not None:
+            self._file.close()
+
+
+class CachedResponse(Response):
+    """Response rebuilt from the cache.
+
+    When the cache already decoded the body for the same validators in this
+    process, :meth:`json` unpickles a snapshot of that decode instead of
+    decoding again. Every call returns a new object, so callers may modify
+    it.
+    """
+
+    def __init__(self, snapshot=None, on_decode=None):
+        super().__init__()
+        self.snapshot = snapshot
+        self.on_decode = on_decode
+
+    def json(self, **kwargs):
+        """Decode the body, copying an earlier decode of the same body."""
+        if kwargs:
+            return super().json(**kwargs)
+
+        if self.snapshot is None:
+            decoded = super().json()
+            if self.on_decode:
+                self.snapshot = self.on_decode(decoded)
+            return decoded
+        return pickle.loads(self.snapshot)
+
+
+class GateCache:
+    """Read through cache for Gate GET responses.
+
+    Args:
+        directory (str): Root cache directory.
+        ttls (dict): Seconds to cache responses keyed by URI template.
+        bypass (bool): Skip cached reads, fresh responses are still stored.
+        conditional (tuple): URI templates to store with validators and
+            revalidate with Gate.
+    """
+
+    def __init__(self, directory=CACHE_DIR, ttls=None, bypass=CACHE_BYPASS, conditional=GATE_CONDITIONAL_URIS):
+        self.directory = os.path.join(directory, 'gate')
+        self.bypass = bypass
+
+        merged_ttls = dict(DEFAULT_GATE_CACHE_TTLS)
+        merged_ttls.update(GATE_CACHE_TTLS if ttls is None else ttls)
+        self.ttls = [(_compile_template(template), int(ttl)) for template, ttl in merged_ttls.items()]
+        self.conditional_uris = [_compile_template(template) for template in conditional]
+
+        self._lock = threading.Lock()
+        self._snapshots = {}
+        self.hits = 0
+        self.misses = 0
+        self.revalidated = 0
+
+    def ttl(self, uri):
+        """Get the number of seconds to cache _uri_.
+
+        Args:
+            uri (str): URI path to Gate API, query string is ignored.
+
+        Returns:
+            int: Seconds to cache, 0 when _uri_ is not cacheable.
+
+        """
+        path = uri.split('?')[0]
+        for pattern, ttl in self.ttls:
+            if pattern.match(path):
+                return ttl
+        return 0
+
+    def conditional(self, uri):
+        """Check _uri_ should be stored with validators and revalidated.
+
+        Args:
+            uri (str): URI path to Gate API, query string is ignored.
+
+        Returns:
+            bool: True when Gate should be asked with a conditional request.
+
+        """
+        path = uri.split('?')[0]
+        return any(pattern.match(path) for pattern in self.conditional_uris)
+
+    @staticmethod
+    def key(url, params=None, identity=''):
+        """Build the cache key for a request.
+
+        Args:
+            url (str): Full Gate URL.
+            params (dict): Query parameters.
+            identity (str): Credential identity the response was fetched with.
+
+        Returns:
+            str: Hex digest identifying the request.
+
+        """
+        raw_key = json.dumps([url, sorted((params or {}).items()), identity], default=str)
+        return hashlib.sha256(raw_key.encode()).hexdigest()
+
+    def _path(self, key):
+        return os.path.join(self.directory, '{0}.json'.format(key))
+
+    @staticmethod
+    def _read_entry(cache_file, key):
+        """Read the metadata line of an open cache file, leaving it at the body."""
+        try:
+            entry = json.loads(cache_file.readline().decode('utf-8'))
+        except ValueError:
+            entry = None
+
+        # Entries from older releases held the body in the metadata
+        if not isinstance(entry, dict) or 'body' in entry:
+            LOG.warning('Ignoring corrupt Gate cache entry %s.', key)
+            return None
+
+        stat = os.fstat(cache_file.fileno())
+        entry['stored'] = stat.st_mtime
+        entry['size'] = stat.st_size - cache_file.tell()
+        return entry
+
+    def _load(self, key):
+        """Load the metadata of the cache entry for _key_."""
+        try:
+            with open(self._path(key), 'rb') as cache_file:
+                return self._read_entry(cache_file, key)
+        except FileNotFoundError:
+            return None
+
+    @staticmethod
+    def _validator(entry):
+        return entry.get('etag') or entry.get('last_modified')
+
+    def _remember(self, key, validator, decoded):
+        """Snapshot _decoded_ for later responses, unpickling beats decoding JSON."""
+        snapshot = pickle.dumps(decoded, protocol=pickle.HIGHEST_PROTOCOL)
+        with self._lock:
+            self._snapshots[key] = (validator, snapshot)
+        return snapshot
+
+    def response(self, key):
+        """Rebuild a response from the cache entry for _key_.
+
+        The body is left in the cache file and read as the caller consumes
+        it, see :meth:`requests.models.Response.iter_content`.
+
+        Args:
+            key (str): Cache key from :meth:`key`.
+
+        Returns:
+            CachedResponse: Response with the cached body, None when the entry
+            was removed.
+
+        """
+        entry = self._load(key)
+        if entry is None:
+            return None
+
+        validator = self._validator(entry)
+        snapshot = None
+        on_decode = None
+
+        if validator:
+            with self._lock:
+                known_validator, known_snapshot = self._snapshots.get(key, (None, None))
+            if known_validator == validator:
+                snapshot = known_snapshot
+            else:
+                on_decode = partial(self._remember, key, validator)
+
+        response = CachedResponse(snapshot=snapshot, on_decode=on_decode)
+        response.status_code = entry['status_code']
+        response.reason = 'OK'
+        response.url = entry['url']
+        response.headers = CaseInsensitiveDict(entry['headers'])
+        response.headers['Content-Length'] = str(entry['size'])
+        response.encoding = 'utf-8'
+        response.raw = _BodyReader(self._path(key))
+        return response
+
+    def load(self, key):
+        """Load a cache entry, fresh or not.
+
+        Args:
+            key (str): Cache key from :meth:`key`.
+
+        Returns:
+            dict: Cache entry, None when missing or bypassed.
+
+        """
+        if self.bypass:
+            return None
+        return self._load(key)
+
+    def fresh(self, entry, ttl):
+        """Check _entry_ is younger than _ttl_ seconds, counting hits and misses.
+
+        Args:
+            entry (dict): Entry from :meth:`load`, may be None.
+            ttl (int): Maximum age in seconds.
+
+        Returns:
+            bool: True when _entry_ can be used without asking Gate.
+
+        """
+        is_fresh = bool(entry) and ttl > 0 and time.time() - entry['stored'] <= ttl
+
+        with self._lock:
+            if is_fresh:
+                self.hits += 1
+            else:
+                self.misses += 1
+
+        if is_fresh:
+            LOG.debug('Gate cache hit for %s.', entry['url'])
+        return is_fresh
+
+    def validators(self, entry):
+        """Get conditional request headers for _entry_.
+
+        Args:
+            entry (dict): Entry from :meth:`load`, may be None.
+
+        Returns:
+            dict: ``If-None-Match`` and ``If-Modified-Since`` headers.
+
+        """
+        headers = {}
+        if not entry:
+            return headers
+
+        if entry.get('etag'):
+            headers['If-None-Match'] = entry['etag']
+        if entry.get('last_modified'):
+            headers['If-Modified-Since'] = entry['last_modified']
+        return headers
+
+    def put(self, key, response):
+        """Store a successful _response_ with its validators.
+
+        The body is copied to disk chunk by chunk, so _response_ is best
+        requested with ``stream=True`` to never hold all of it in memory.
+
+        Args:
+            key (str): Cache key from :meth:`key`.
+            response (requests.models.Response): Response from Gate.
+
+        Returns:
+            bool: True when stored, read the body back with :meth:`response`.
+
+        Raises:
+            OSError: The body could not be written after part of it was read.
+
+        """
+        if response.status_code != 200:
+            return False
+
+        entry = {
+            'url': response.url,
+            'status_code': response.status_code,
+            'headers': {'content-type': response.headers.get('content-type', 'application/json')},
+            'etag': response.headers.get('ETag'),
+            'last_modified': response.headers.get('Last-Modified'),
+        }
+
+        os.makedirs(self.directory, exist_ok=True)
+        handle, temp_path = tempfile.mkstemp(dir=self.directory, prefix='.tmp-')
+        try:
+            with os.fdopen(handle, 'wb') as cache_file:
+                cache_file.write(json.dumps(entry).encode('utf-8') + b'\n')
+                for chunk in response.iter_content(chunk_size=CHUNK_SIZE):
+                    cache_file.write(chunk)
+            os.replace(temp_path, self._path(key))
+        except OSError as error:
+            LOG.warning('Could not write Gate cache entry %s: %s', key, error)
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise
+        return True
+
+    def not_modified(self, key, entry):
+        """Renew _entry_ after Gate answered ``304 Not Modified``.
+
+        Args:
+            key (str): Cache key from :meth:`key`.
+            entry (dict): Entry from :meth:`load`.
+
+        """
+        with self._lock:
+            self.revalidated += 1
+
+        LOG.debug('Gate cache revalidated %s.', entry['url'])
+        try:
+            os.utime(self._path(key))
+        except FileNotFoundError:
+            pass
+
+    def stats(self):
+        """Get cache counters.
+
+        Returns:
+            dict: ``hits``, ``misses``, ``revalidated`` and ``hit_ratio``,
+            counting revalidated responses as hits.
+
+        """
+        with self._lock:
+            lookups = self.hits + self.misses
+            ratio = (self.hits + self.revalidated) / lookups if lookups else 0.0
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'revalidated': self.revalidated,
+                'hit_ratio': ratio,
+            }
+
+    def log_stats(self):
+        """Log the cache hit and miss counts at debug level."""
+        stats = self.stats()
+        LOG.debug('Gate cache: %(hits)d hits, %(revalidated)d revalidated, %(misses)d misses, '
+                  '%(hit_ratio).0f%% hit ratio.', dict(stats, hit_ratio=stats['hit_ratio'] * 100))
+
+    def invalidate(self, uri=None):
+        """Remove cached responses.
+
+        Args:
+            uri (str): Only remove entries for URLs containing _uri_, all
+                entries are removed when not given.
+
+        Returns:
+            int: Number of entries removed.
+
+        """
+        removed = 0
+
+        try:
+            filenames = os.listdir(self.directory)
+        except FileNotFoundError:
+            return removed
+
+        for filename in filenames:
+            key, extension = os.path.splitext(filename)
+            if extension != '.json':
+                continue
+
+            if uri:
+                entry = self._load(key)
+                if not entry or uri not in entry['url']:
+                    continue
+
+            try:
+                os.remove(self._path(key))
+                removed += 1
+            except FileNotFoundError:
+                pass
+
+        LOG.info('Removed %d Gate cache entries.', removed)
+        return removed
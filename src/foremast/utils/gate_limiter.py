@@ -0,0 +1,156 @@
+#   Foremast - Pipeline Tooling
+#
+#   Copyright 2019 Redbox Automated Retail, LLC
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+"""Client side concurrency limits and backoff for the Gate API."""
+import email.utils
+import logging
+import random
+import threading
+import time
+from contextlib import contextmanager
+
+LOG = logging.getLogger(__name__)
+
+BACKOFF_BASE = 0.5  # Seconds for the first retry
+BACKOFF_CAP = 30  # Longest single wait in seconds
+
+
+class AIMDLimiter:
+    """Additive increase, multiplicative decrease concurrency limiter.
+
+    Every successful call raises the limit by ``1 / limit``, roughly one slot
+    per round of requests. An overloaded response cuts the limit by
+    ``decrease_ratio``, at most once per ``cooldown`` seconds so a burst of
+    failures from the same round only counts once.
+
+    Args:
+        initial (int): Starting and maximum number of concurrent calls.
+        minimum (int): Lowest limit allowed.
+        decrease_ratio (float): Factor applied to the limit on overload.
+        cooldown (float): Seconds between consecutive decreases.
+    """
+
+    def __init__(self, initial=10, minimum=1, decrease_ratio=0.5, cooldown=1.0):
+        self.maximum = initial
+        self.minimum = minimum
+        self.decrease_ratio = decrease_ratio
+        self.cooldown = cooldown
+
+        self._condition = threading.Condition()
+        self._last_decrease = 0.0
+        self.limit = float(initial)
+        self.in_flight = 0
+        self.queue_delay = 0.0
+        self.max_queue_delay = 0.0
+
+    @contextmanager
+    def slot(self):
+        """Wait for a free slot and hold it while the call runs."""
+        start = time.monotonic()
+        with self._condition:
+            while self.in_flight >= int(self.limit):
+                self._condition.wait()
+            self.in_flight += 1
+
+            self.queue_delay = time.monotonic() - start
+            self.max_queue_delay = max(self.max_queue_delay, self.queue_delay)
+
+        try:
+            yield
+        finally:
+            with self._condition:
+                self.in_flight -= 1
+                self._condition.notify()
+
+    def success(self):
+        """Grow the limit after a call Gate handled."""
+        with self._condition:
+            if self.limit < self.maximum:
+                self.limit = min(self.maximum, self.limit + 1 / self.limit)
+                self._condition.notify()
+
+    def overload(self):
+        """Shrink the limit after Gate reported it is overloaded."""
+        with self._condition:
+            now = time.monotonic()
+            if now - self._last_decrease < self.cooldown:
+                return
+
+            self._last_decrease = now
+            self.limit = max(self.minimum, self.limit * self.decrease_ratio)
+            LOG.warning('Gate overloaded, lowering concurrency limit to %d.', int(self.limit))
+
+    def stats(self):
+        """Get the current limit and queueing delay.
+
+        Returns:
+            dict: ``limit``, ``in_flight``, last ``queue_delay`` and
+            ``max_queue_delay`` in seconds.
+
+        """
+        with self._condition:
+            return {
+                'limit': int(self.limit),
+                'in_flight': self.in_flight,
+                'queue_delay': self.queue_delay,
+                'max_queue_delay': self.max_queue_delay,
+            }
+
+
+def retry_after(response):
+    """Get the number of seconds Gate asked us to wait.
+
+    Args:
+        response (requests.models.Response): Response from Gate.
+
+    Returns:
+        float: Seconds from the ``Retry-After`` header, None when missing or
+        unparseable.
+
+    """
+    value = response.headers.get('Retry-After')
+    if not value:
+        return None
+
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+
+    retry_date = email.utils.parsedate_tz(value)
+    if retry_date is None:
+        return None
+    return max(0.0, email.utils.mktime_tz(retry_date) - time.time())
+
+
+def backoff_delay(attempt, response=None):
+    """Get the seconds to wait before retrying.
+
+    Honours ``Retry-After`` when present, otherwise uses full jitter
+    exponential backoff.
+
+    Args:
+        attempt (int): Number of the failed attempt, starting at 0.
+        response (requests.models.Response): Overloaded response from Gate.
+
+    Returns:
+        float: Seconds to sleep.
+
+    """
+    requested = retry_after(response) if response is not None else None
+    if requested is not None:
+        return min(BACKOFF_CAP, requested)
+
+    return random.uniform(0, min(BACKOFF_CAP, BACKOFF_BASE * 2**attempt))
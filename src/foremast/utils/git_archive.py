@@ -0,0 +1,181 @@
+#   Foremast - Pipeline Tooling
+#
+#   Copyright 2019 Redbox Automated Retail, LLC
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+"""Directories of GitLab repositories downloaded as one archive.
+
+A repository archive holds every file of a directory at a single commit, so
+one GitLab request replaces a request per file. Archives are kept in
+:data:`foremast.utils.blob_cache.GIT_BLOBS` for later runs at the same commit.
+"""
+import collections
+import io
+import logging
+import re
+import tarfile
+import threading
+
+import gitlab
+
+from .blob_cache import GIT_BLOBS
+
+LOG = logging.getLogger(__name__)
+
+COMMIT_ID = re.compile(r'^[0-9a-f]{40}$')
+
+
+class GitArchive:
+    """Files of a repository directory at one commit.
+
+    Args:
+        commit (str): Commit ID the files were read at.
+        path (str): Directory of the repository the archive holds.
+        files (dict): File contents by path relative to the repository root.
+    """
+
+    def __init__(self, commit, path, files):
+        self.commit = commit
+        self.path = path.strip('/')
+        self.files = files
+
+    def covers(self, filename):
+        """Check _filename_ is inside the archived directory."""
+        return filename.lstrip('/').startswith(self.path + '/')
+
+    def read(self, filename):
+        """Get the contents of _filename_.
+
+        Args:
+            filename (str): Path relative to the repository root.
+
+        Returns:
+            str: Decoded file contents.
+
+        Raises:
+            FileNotFoundError: _filename_ is not in the archive.
+
+        """
+        try:
+            return self.files[filename.lstrip('/')].decode()
+        except KeyError:
+            raise FileNotFoundError('Commit "{0}" is missing file "{1}".'.format(self.commit, filename))
+
+
+def _extract(data):
+    """Read the files from a ``tar.gz`` repository archive into memory."""
+    files = {}
+    with tarfile.open(fileobj=io.BytesIO(data), mode='r:gz') as archive:
+        for member in archive:
+            if not member.isfile():
+                continue
+            # GitLab puts everything below a "<project>-<ref>-<sha>" directory
+            _top, _, name = member.name.partition('/')
+            files[name] = archive.extractfile(member).read()
+    return files
+
+
+class GitArchiveCatalog:
+    """Branch heads and repository directories resolved once per process.
+
+    Branches are resolved to a commit once and archives are kept per
+    repository, branch and directory, so every lookup in this process reads
+    the same commit. Failed downloads are remembered as well, those lookups
+    fall back to requesting each file.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._key_locks = collections.defaultdict(threading.Lock)
+        self._commits = {}
+        self._archives = {}
+
+    def clear(self):
+        """Forget the resolved branches and downloaded archives."""
+        with self._lock:
+            self._commits.clear()
+            self._archives.clear()
+            self._key_locks.clear()
+
+    def commit(self, project, git_short, branch='master'):
+        """Get the commit at the head of _branch_, asking GitLab once per process.
+
+        Args:
+            project (gitlab.v4.objects.Project): GitLab Project.
+            git_short (str): Short Git representation of repository, e.g.
+                forrest/core.
+            branch (str): Git Branch, or a commit ID.
+
+        Returns:
+            str: Commit ID.
+
+        Raises:
+            gitlab.exceptions.GitlabGetError: _branch_ does not exist.
+
+        """
+        if COMMIT_ID.match(branch):
+            return branch
+
+        key = (git_short, branch)
+        with self._lock:
+            key_lock = self._key_locks[key]
+
+        with key_lock:
+            if key not in self._commits:
+                self._commits[key] = project.commits.get(branch).attributes['id']
+                LOG.debug('Branch "%s" of "%s" is at %s.', branch, git_short, self._commits[key])
+            return self._commits[key]
+
+    def archive(self, project, git_short, branch='master', path=''):
+        """Get the files in _path_ of _project_ at the head of _branch_.
+
+        Args:
+            project (gitlab.v4.objects.Project): GitLab Project to download.
+            git_short (str): Short Git representation of repository, e.g.
+                forrest/core.
+            branch (str): Git Branch to read.
+            path (str): Directory of the repository to download.
+
+        Returns:
+            GitArchive: Files in _path_, None when GitLab could not provide the
+            archive.
+
+        """
+        key = (git_short, branch, path)
+        with self._lock:
+            key_lock = self._key_locks[key]
+
+        with key_lock:
+            if key not in self._archives:
+                self._archives[key] = self._download(project, git_short, branch, path)
+            return self._archives[key]
+
+    def _download(self, project, git_short, branch, path):
+        blob_path = 'archive:{0}'.format(path)
+        try:
+            commit = self.commit(project, git_short, branch=branch)
+            data = GIT_BLOBS.get(git_short, commit, blob_path)
+            if data is None:
+                data = project.repository_archive(sha=commit, format='tar.gz', path=path)
+                GIT_BLOBS.put(git_short, commit, blob_path, data)
+            files = _extract(data)
+        except (gitlab.exceptions.GitlabError, tarfile.TarError) as error:
+            LOG.warning('Could not download "%s" from "%s", requesting each file instead: %s', path, git_short, error)
+            return None
+
+        LOG.info('Read %d files in "%s" from "%s" at %s.', len(files), path, git_short, commit)
+        return GitArchive(commit, path, files)
+
+
+GIT_ARCHIVES = GitArchiveCatalog()
+"""Repository archives shared by every :class:`foremast.utils.lookups.FileLookup`."""
@@ -0,0 +1,123 @@
+#   Foremast - Pipeline Tooling
+#
+#   Copyright 2019 Redbox Automated Retail, LLC
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+"""Incrementally decode large JSON array responses."""
+import codecs
+import json
+import logging
+import re
+
+LOG = logging.getLogger(__name__)
+
+CHUNK_SIZE = 64 * 1024
+WHITESPACE = re.compile(r'[ \t\n\r]*')
+DECODER = json.JSONDecoder()
+
+
+def iter_json_array(response, predicate=None, chunk_size=CHUNK_SIZE):
+    """Yield records of a JSON array response as they arrive.
+
+    For a body not read yet, like one requested with ``stream=True`` or served
+    from :class:`foremast.utils.gate_cache.GateCache`, only the records kept
+    by _predicate_ and the undecoded tail of the last chunk are held in
+    memory, instead of the whole document. The response is closed once
+    decoded, or when the generator is closed.
+
+    Args:
+        response (requests.models.Response): Response with a JSON array body.
+        predicate (callable): Keep records for which this returns True, keep
+            all records when not given.
+        chunk_size (int): Bytes to read at a time.
+
+    Yields:
+        object: Decoded records in document order.
+
+    Raises:
+        ValueError: Body is not a JSON array.
+
+    """
+    try:
+        yield from _iter_records(response, predicate, chunk_size)
+    finally:
+        response.close()
+
+
+def _iter_records(response, predicate, chunk_size):
+    """Yield the records of _response_ kept by _predicate_."""
+    if getattr(response, 'snapshot', None) is not None:
+        LOG.debug('Reusing decoded response for %s.', response.url)
+        decoded = response.json()
+        if isinstance(decoded, list):
+            yield from (record for record in decoded if predicate is None or predicate(record))
+            return
+
+    text_decoder = codecs.getincrementaldecoder('utf-8')()
+    buffer = ''
+    position = 0
+    started = False
+    finished = False
+
+    chunks = iter(response.iter_content(chunk_size=chunk_size))
+    while not finished:
+        chunk = next(chunks, None)
+        at_end = chunk is None
+        buffer = buffer[position:] + text_decoder.decode(chunk or b'', final=at_end)
+        position = 0
+
+        if not started:
+            position = WHITESPACE.match(buffer, position).end()
+            if position == len(buffer):
+                if at_end:
+                    raise ValueError('Expected a JSON array, found an empty body.')
+                continue
+            if buffer[position] != '[':
+                raise ValueError('Expected a JSON array, found "{0}".'.format(buffer[position]))
+            position += 1
+            started = True
+
+        while True:
+            position = WHITESPACE.match(buffer, position).end()
+            if position < len(buffer) and buffer[position] == ',':
+                position = WHITESPACE.match(buffer, position + 1).end()
+
+            if position == len(buffer):
+                break
+
+            if buffer[position] == ']':
+                finished = True
+                break
+
+            try:
+                record, end = DECODER.raw_decode(buffer, position)
+            except ValueError:
+                if at_end:
+                    raise
+                break
+
+            # Records end before a separator, anything else may be a number
+            # cut short by the chunk boundary, e.g. "12" of "12.5".
+            following = WHITESPACE.match(buffer, end).end()
+            if following == len(buffer) or buffer[following] not in ',]':
+                if not at_end:
+                    break
+                if following < len(buffer):
+                    raise ValueError('Invalid JSON array near "{0}".'.format(buffer[following:following + 20]))
+
+            position = end
+            if predicate is None or predicate(record):
+                yield record
+
+        if at_end and not finished:
+            raise ValueError('Unterminated JSON array.')
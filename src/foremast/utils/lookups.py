@@ -14,26 +14,223 @@
 #   See the License for the specific language governing permissions and
 #   limitations under the License.
 """Lookup AMI ID from a simple name."""
+import collections
+import hashlib
 import json
 import logging
 import os
+import tempfile
+import threading
+import time
 from base64 import b64decode
 
 import gitlab
 import requests
 
-from ..consts import AMI_JSON_URL, GIT_URL, GITLAB_TOKEN
+from ..consts import (AMI_CACHE_TTL, AMI_JSON_URL, AMI_SNAPSHOT, CACHE_BYPASS, CACHE_DIR, GIT_ARCHIVE, GIT_URL,
+                      GITLAB_TOKEN)
 from ..exceptions import GitLabApiError
+from .blob_cache import GIT_BLOBS
+from .git_archive import GIT_ARCHIVES
 from .warn_user import warn_user
 
 LOG = logging.getLogger(__name__)
 
 
+def validate_ami_catalog(ami_dict):
+    """Check _ami_dict_ maps regions to AMI IDs by name.
+
+    Args:
+        ami_dict (dict): Decoded AMI catalog, e.g. ``{"us-east-1": {"tomcat8": "ami-xxxx"}}``.
+
+    Returns:
+        dict: The valid _ami_dict_.
+
+    Raises:
+        ValueError: _ami_dict_ is not a mapping of mappings.
+
+    """
+    if not isinstance(ami_dict, dict) or not all(isinstance(amis, dict) for amis in ami_dict.values()):
+        raise ValueError('AMI catalog should map regions to AMI IDs by name, got: {0:.200}'.format(repr(ami_dict)))
+    return ami_dict
+
+
+class AmiCatalog:
+    """AMI IDs by region and name, shared by every lookup in this process.
+
+    Documents from ``ami_json_url`` are kept in memory and under
+    _directory_ for _ttl_ seconds, then revalidated with their ``ETag`` or
+    ``Last-Modified`` validators. GitLab region files are read once per
+    process. A _snapshot_ file pins the catalog and nothing is fetched.
+
+    Args:
+        directory (str): Root cache directory.
+        ttl (int): Seconds to use a document before revalidating it.
+        snapshot (str): Pinned AMI catalog file.
+    """
+
+    def __init__(self, directory=CACHE_DIR, ttl=AMI_CACHE_TTL, snapshot=AMI_SNAPSHOT):
+        self.directory = os.path.join(directory, 'ami')
+        self.ttl = ttl
+        self.snapshot = snapshot
+
+        self._lock = threading.Lock()
+        self._key_locks = collections.defaultdict(threading.Lock)
+        self._entries = {}
+        self._region_files = {}
+        self._pinned = None
+
+    def clear(self):
+        """Forget documents held in memory."""
+        with self._lock:
+            self._entries.clear()
+            self._region_files.clear()
+            self._key_locks.clear()
+            self._pinned = None
+
+    def pinned(self):
+        """Get the pinned AMI catalog from _snapshot_.
+
+        Returns:
+            dict: AMI IDs by name, by region.
+
+        """
+        with self._lock:
+            if self._pinned is None:
+                LOG.info('Using pinned AMI catalog %s.', self.snapshot)
+                with open(self.snapshot, 'rt') as snapshot_file:
+                    self._pinned = validate_ami_catalog(json.load(snapshot_file))
+            return self._pinned
+
+    def _path(self, url):
+        return os.path.join(self.directory, '{0}.json'.format(hashlib.sha256(url.encode()).hexdigest()))
+
+    def _fresh(self, entry):
+        return bool(entry) and time.time() - entry['stored'] <= self.ttl
+
+    def _load(self, url):
+        if CACHE_BYPASS:
+            return None
+
+        try:
+            with open(self._path(url), 'rt') as cache_file:
+                return json.load(cache_file)
+        except FileNotFoundError:
+            return None
+        except ValueError:
+            LOG.warning('Ignoring corrupt AMI catalog cache for %s.', url)
+            return None
+
+    def _store(self, url, entry):
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            handle, temp_path = tempfile.mkstemp(dir=self.directory, prefix='.tmp-')
+            with os.fdopen(handle, 'wt') as cache_file:
+                json.dump(entry, cache_file)
+            os.replace(temp_path, self._path(url))
+        except OSError as error:
+            LOG.warning('Could not cache AMI catalog %s: %s', url, error)
+
+    def _fetch(self, url, entry):
+        """Download the document at _url_, revalidating _entry_ when given."""
+        headers = {}
+        if entry and entry.get('etag'):
+            headers['If-None-Match'] = entry['etag']
+        if entry and entry.get('last_modified'):
+            headers['If-Modified-Since'] = entry['last_modified']
+
+        LOG.info("Getting AMI from %s", url)
+        response = requests.get(url, headers=headers)
+
+        if entry and response.status_code == 304:
+            LOG.debug('AMI catalog %s not modified.', url)
+            entry['stored'] = time.time()
+        else:
+            assert response.ok, "Error getting ami info from {}".format(url)
+            entry = {
+                'url': url,
+                'stored': time.time(),
+                'etag': response.headers.get('ETag'),
+                'last_modified': response.headers.get('Last-Modified'),
+                'ami_dict': validate_ami_catalog(response.json()),
+            }
+            LOG.debug('AMI json contents: %s', entry['ami_dict'])
+
+        self._store(url, entry)
+        return entry
+
+    def document(self, url):
+        """Get the AMI catalog at _url_.
+
+        Args:
+            url (str): URL of the AMI catalog JSON.
+
+        Returns:
+            dict: AMI IDs by name, by region.
+
+        """
+        with self._lock:
+            key_lock = self._key_locks[('document', url)]
+
+        with key_lock:
+            entry = self._entries.get(url)
+            if not self._fresh(entry):
+                entry = self._load(url) or entry
+                if not self._fresh(entry):
+                    entry = self._fetch(url, entry)
+                self._entries[url] = entry
+            return entry['ami_dict']
+
+    def region_file(self, region):
+        """Get the legacy GitLab AMI file for _region_.
+
+        Args:
+            region (str): AWS Region to find AMI IDs for.
+
+        Returns:
+            str: Contents in json format.
+
+        """
+        with self._lock:
+            key_lock = self._key_locks[('region_file', region)]
+
+        with key_lock:
+            if region not in self._region_files:
+                LOG.info("Getting AMI from Gitlab")
+                lookup = FileLookup(git_short='devops/ansible')
+                filename = 'scripts/{0}.json'.format(region)
+                self._region_files[region] = lookup.remote_file(filename=filename, branch='master')
+                LOG.debug('AMI file contents in %s: %s', filename, self._region_files[region])
+            return self._region_files[region]
+
+    def pin(self, path, url=AMI_JSON_URL):
+        """Write the current catalog at _url_ to _path_ for ``ami_snapshot``.
+
+        Args:
+            path (str): Snapshot file to write.
+            url (str): URL of the AMI catalog JSON.
+
+        Returns:
+            dict: AMI IDs by name, by region.
+
+        """
+        ami_dict = self.document(url)
+        with open(path, 'wt') as snapshot_file:
+            json.dump(ami_dict, snapshot_file, indent=2, sort_keys=True)
+        LOG.info('Pinned AMI catalog from %s to %s.', url, path)
+        return ami_dict
+
+
+AMI_CATALOG = AmiCatalog()
+"""AMI IDs shared by every lookup in this process."""
+
+
 def ami_lookup(region='us-east-1', name='tomcat8'):
     """Look up AMI ID.
 
     Use _name_ to find AMI ID. If no ami_base_url or gitlab_token is provided,
-    _name_ is returned as the ami id.
+    _name_ is returned as the ami id. A pinned ``ami_snapshot`` takes
+    precedence over both.
 
     Args:
         region (str): AWS Region to find AMI ID.
@@ -43,7 +240,9 @@ def ami_lookup(region='us-east-1', name='tomcat8'):
         str: AMI ID for _name_ in _region_.
 
     """
-    if AMI_JSON_URL:
+    if AMI_CATALOG.snapshot:
+        ami_id = AMI_CATALOG.pinned()[region][name]
+    elif AMI_JSON_URL:
         ami_dict = _get_ami_dict(AMI_JSON_URL)
         ami_id = ami_dict[region][name]
     elif GITLAB_TOKEN:
@@ -59,6 +258,21 @@ def ami_lookup(region='us-east-1', name='tomcat8'):
     return ami_id
 
 
+def load_ami_catalog(region='us-east-1'):
+    """Load the AMI catalog :func:`ami_lookup` would use for _region_.
+
+    Args:
+        region (str): AWS Region to find AMI IDs for.
+
+    """
+    if AMI_CATALOG.snapshot:
+        AMI_CATALOG.pinned()
+    elif AMI_JSON_URL:
+        _get_ami_dict(AMI_JSON_URL)
+    elif GITLAB_TOKEN:
+        _get_ami_file(region=region)
+
+
 def _get_ami_file(region='us-east-1'):
     """Get file from Gitlab.
 
@@ -69,30 +283,89 @@ def _get_ami_file(region='us-east-1'):
         str: Contents in json format.
 
     """
-    LOG.info("Getting AMI from Gitlab")
-    lookup = FileLookup(git_short='devops/ansible')
-    filename = 'scripts/{0}.json'.format(region)
-    ami_contents = lookup.remote_file(filename=filename, branch='master')
-    LOG.debug('AMI file contents in %s: %s', filename, ami_contents)
-    return ami_contents
+    return AMI_CATALOG.region_file(region)
 
 
 def _get_ami_dict(json_url):
     """Get ami from a web url.
 
     Args:
-        region (str): AWS Region to find AMI ID.
+        json_url (str): URL of the AMI catalog JSON.
 
     Returns:
         dict: Contents in dictionary format.
 
     """
-    LOG.info("Getting AMI from %s", json_url)
-    response = requests.get(json_url)
-    assert response.ok, "Error getting ami info from {}".format(json_url)
-    ami_dict = response.json()
-    LOG.debug('AMI json contents: %s', ami_dict)
-    return ami_dict
+    return AMI_CATALOG.document(json_url)
+
+
+class GitLabProjects:
+    """GitLab client and Project handles shared by every lookup in this process.
+
+    One :class:`gitlab.Gitlab` client, and so one pooled HTTP session, is
+    created per process and each Project is resolved once. Failed lookups
+    are not remembered.
+
+    Args:
+        url (str): GitLab server URL.
+        token (str): GitLab private token.
+    """
+
+    def __init__(self, url=GIT_URL, token=GITLAB_TOKEN):
+        self.url = url
+        self.token = token
+
+        self._lock = threading.Lock()
+        self._key_locks = collections.defaultdict(threading.Lock)
+        self._server = None
+        self._projects = {}
+
+    def clear(self):
+        """Forget the client and Project handles."""
+        with self._lock:
+            self._server = None
+            self._projects.clear()
+            self._key_locks.clear()
+
+    def server(self):
+        """Get the shared GitLab client.
+
+        Returns:
+            gitlab.Gitlab: GitLab API client.
+
+        """
+        with self._lock:
+            if self._server is None:
+                self._server = gitlab.Gitlab(self.url, private_token=self.token, api_version=4)
+            return self._server
+
+    def project(self, git_short):
+        """Get the handle of the Project at _git_short_.
+
+        Args:
+            git_short (str): Short Git representation of repository, e.g.
+                forrest/core.
+
+        Returns:
+            gitlab.v4.objects.Project: Project handle, falsy when GitLab did
+            not find it.
+
+        """
+        server = self.server()
+        with self._lock:
+            key_lock = self._key_locks[git_short]
+
+        with key_lock:
+            project = self._projects.get(git_short)
+            if not project:
+                project = server.projects.get(git_short)
+                if project:
+                    self._projects[git_short] = project
+            return project
+
+
+GITLAB_PROJECTS = GitLabProjects()
+"""GitLab Projects shared by every :class:`FileLookup` in this process."""
 
 
 class FileLookup():
@@ -101,16 +374,22 @@ class FileLookup():
     When _runway_dir_ is specified, the local directory is given priority and
     remote Git Server will not be used.
 
+    With ``git_archive`` enabled, files in _archive_path_ are read from one
+    download of that directory, see :data:`foremast.utils.git_archive.GIT_ARCHIVES`.
+
     Args:
         git_short (str): Short Git representation of repository, e.g.
             forrest/core.
         runway_dir (str): Root of local runway directory to use instead of
             accessing Git.
+        archive_path (str): Directory of the repository to download at once,
+            e.g. ``runway``.
     """
 
-    def __init__(self, git_short='', runway_dir=''):
+    def __init__(self, git_short='', runway_dir='', archive_path=''):
         self.git_short = git_short
         self.runway_dir = os.path.expandvars(os.path.expanduser(runway_dir))
+        self.archive_path = archive_path if GIT_ARCHIVE else ''
 
         self.server = None
         self.project = None
@@ -129,8 +408,8 @@ class FileLookup():
                 code.
 
         """
-        self.server = gitlab.Gitlab(GIT_URL, private_token=GITLAB_TOKEN, api_version=4)
-        project = self.server.projects.get(self.git_short)
+        self.server = GITLAB_PROJECTS.server()
+        project = GITLAB_PROJECTS.project(self.git_short)
 
         if not project:
             raise GitLabApiError('Could not get Project "{0}" from GitLab API.'.format(self.git_short))
@@ -168,9 +447,43 @@ class FileLookup():
         LOG.debug('Local file contents:\n%s', file_contents)
         return file_contents
 
+    def archive(self, branch='master'):
+        """Get the downloaded _archive_path_ directory for _branch_.
+
+        Args:
+            branch (str): Git Branch to download.
+
+        Returns:
+            foremast.utils.git_archive.GitArchive: Files at the head of
+            _branch_, None without _archive_path_ or when the download failed.
+
+        """
+        if not self.archive_path or self.runway_dir:
+            return None
+        return GIT_ARCHIVES.archive(self.project, self.git_short, branch=branch, path=self.archive_path)
+
+    def commit(self, branch='master'):
+        """Get the ID of the commit files on _branch_ are read from.
+
+        Args:
+            branch (str): Git Branch.
+
+        Returns:
+            str: Commit ID.
+
+        """
+        archive = self.archive(branch=branch)
+        if archive:
+            return archive.commit
+        return GIT_ARCHIVES.commit(self.project, self.git_short, branch=branch)
+
     def remote_file(self, branch='master', filename=''):
         """Read the remote file on Git Server.
 
+        Files are read at the commit _branch_ points to when first asked for,
+        and kept in :data:`foremast.utils.blob_cache.GIT_BLOBS` for later
+        runs at the same commit.
+
         Args:
             branch (str): Git Branch to find file.
             filename (str): Name of file to retrieve relative to root of
@@ -187,8 +500,23 @@ class FileLookup():
 
         file_contents = ''
 
+        archive = self.archive(branch=branch)
+        if archive and archive.covers(filename):
+            file_contents = archive.read(filename)
+            LOG.debug('Archived file contents:\n%s', file_contents)
+            return file_contents
+
+        try:
+            commit = self.commit(branch=branch)
+        except gitlab.exceptions.GitlabGetError:
+            commit = None
+
+        cached = GIT_BLOBS.get(self.git_short, commit, filename) if commit else None
+        if cached is not None:
+            return cached.decode()
+
         try:
-            file_blob = self.project.files.get(file_path=filename, ref=branch)
+            file_blob = self.project.files.get(file_path=filename, ref=commit or branch)
         except gitlab.exceptions.GitlabGetError:
             file_blob = None
 
@@ -200,6 +528,8 @@ class FileLookup():
             raise FileNotFoundError(msg)
 
         file_contents = b64decode(file_blob.content).decode()
+        if commit:
+            GIT_BLOBS.put(self.git_short, commit, filename, file_contents.encode())
 
         LOG.debug('Remote file contents:\n%s', file_contents)
         return file_contents
@@ -0,0 +1,328 @@
+#   Foremast - Pipeline Tooling
+#
+#   Copyright 2019 Redbox Automated Retail, LLC
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+"""Call count, latency and size metrics for Gate and AWS calls.
+
+Gate requests are recorded per method and URI template, e.g.
+``GET /applications/{app}``, and AWS calls per service and operation, e.g.
+``ec2.DescribeSubnets``. Once :func:`enable_metrics` is called, as the
+Foremast commands do, AWS calls are recorded too, a summary table is logged
+when Foremast exits and the metrics are written to ``METRICS_FILE`` when
+configured: Prometheus text format for ``.prom`` files, JSON otherwise.
+"""
+import atexit
+import bisect
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+from functools import wraps
+
+from ..consts import METRICS_FILE
+from .gate_cache import _compile_template
+
+LOG = logging.getLogger(__name__)
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60)
+"""Upper bounds in seconds of the latency histogram buckets."""
+
+GATE_URI_TEMPLATES = (
+    '/applications',
+    '/applications/{app}',
+    '/applications/{app}/clusters/{env}/{cluster}/serverGroups',
+    '/applications/{app}/loadBalancers',
+    '/applications/{app}/pipelineConfigs',
+    '/applications/{app}/tasks',
+    '/credentials',
+    '/credentials/{env}',
+    '/networks/aws',
+    '/pipelines',
+    '/pipelines/{app}/{pipeline}',
+    '/securityGroups/{env}',
+    '/securityGroups/{env}/{region}/{name}',
+    '/subnets/aws',
+    '/tasks',
+    '/tasks/{id}',
+    '/v2/canaryConfig',
+)
+"""Gate URIs used by Foremast, so metrics group calls to the same endpoint."""
+
+_GATE_URI_PATTERNS = [(_compile_template(template), template) for template in GATE_URI_TEMPLATES]
+
+
+def gate_uri_template(uri):
+    """Get the URI template for a Gate _uri_.
+
+    Args:
+        uri (str): URI path to Gate API, query string is ignored.
+
+    Returns:
+        str: Matching entry of :data:`GATE_URI_TEMPLATES`, otherwise the first
+        path segment followed by ``/*`` to keep the number of series bounded.
+
+    """
+    path = '/' + uri.split('?')[0].strip('/')
+    for pattern, template in _GATE_URI_PATTERNS:
+        if pattern.match(path):
+            return template
+
+    first, _, rest = path[1:].partition('/')
+    return '/{0}/*'.format(first) if rest else path
+
+
+class CallStats:
+    """Counters and latency histogram for one operation."""
+
+    def __init__(self):
+        self.calls = 0
+        self.errors = 0
+        self.bytes = 0
+        self.seconds = 0.0
+        self.max_seconds = 0.0
+        self.buckets = [0] * (len(LATENCY_BUCKETS) + 1)
+
+    def add(self, seconds, size=0, error=False):
+        """Count one call."""
+        self.calls += 1
+        self.errors += int(error)
+        self.bytes += size
+        self.seconds += seconds
+        self.max_seconds = max(self.max_seconds, seconds)
+        self.buckets[bisect.bisect_left(LATENCY_BUCKETS, seconds)] += 1
+
+    def percentile(self, fraction):
+        """Estimate a latency percentile as the upper bound of its bucket.
+
+        Args:
+            fraction (float): Percentile between 0 and 1.
+
+        Returns:
+            float: Seconds, capped at the slowest call seen.
+
+        """
+        wanted = fraction * self.calls
+        seen = 0
+        for bound, count in zip(LATENCY_BUCKETS, self.buckets):
+            seen += count
+            if seen >= wanted:
+                return min(bound, self.max_seconds)
+        return self.max_seconds
+
+    def as_dict(self):
+        """Get the counters as plain types."""
+        return {
+            'calls': self.calls,
+            'errors': self.errors,
+            'bytes': self.bytes,
+            'seconds': self.seconds,
+            'max_seconds': self.max_seconds,
+            'buckets': dict(zip([str(bound) for bound in LATENCY_BUCKETS] + ['+Inf'], self.buckets)),
+        }
+
+
+class Metrics:
+    """Thread safe registry of :class:`CallStats` keyed by backend and operation."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.stats = {}
+
+    def record(self, backend, operation, seconds, size=0, error=False):
+        """Record one call.
+
+        Args:
+            backend (str): Service called, ``gate`` or ``aws``.
+            operation (str): Endpoint or API operation within _backend_.
+            seconds (float): Time taken.
+            size (int): Response size in bytes, when known.
+            error (bool): The call failed.
+
+        """
+        with self._lock:
+            stats = self.stats.setdefault((backend, operation), CallStats())
+            stats.add(seconds, size=size, error=error)
+
+    def reset(self):
+        """Forget everything recorded."""
+        with self._lock:
+            self.stats = {}
+
+    def as_dict(self):
+        """Get all metrics, e.g. for JSON export.
+
+        Returns:
+            dict: ``{backend: {operation: counters}}``.
+
+        """
+        exported = {}
+        with self._lock:
+            for (backend, operation), stats in sorted(self.stats.items()):
+                exported.setdefault(backend, {})[operation] = stats.as_dict()
+        return exported
+
+    def to_prometheus(self):
+        """Render all metrics in the Prometheus text exposition format.
+
+        Returns:
+            str: Metrics for a node exporter textfile collector.
+
+        """
+        lines = [
+            '# HELP foremast_call_duration_seconds Latency of Gate and AWS calls.',
+            '# TYPE foremast_call_duration_seconds histogram',
+        ]
+        totals = []
+
+        with self._lock:
+            for (backend, operation), stats in sorted(self.stats.items()):
+                labels = 'backend="{0}",operation="{1}"'.format(backend, operation.replace('"', '\\"'))
+
+                cumulative = 0
+                for bound, count in zip(LATENCY_BUCKETS + ('+Inf', ), stats.buckets):
+                    cumulative += count
+                    lines.append('foremast_call_duration_seconds_bucket{{{0},le="{1}"}} {2}'.format(
+                        labels, bound, cumulative))
+                lines.append('foremast_call_duration_seconds_sum{{{0}}} {1}'.format(labels, stats.seconds))
+                lines.append('foremast_call_duration_seconds_count{{{0}}} {1}'.format(labels, stats.calls))
+                totals.append((labels, stats))
+
+        lines.extend([
+            '# HELP foremast_call_errors_total Failed Gate and AWS calls.',
+            '# TYPE foremast_call_errors_total counter',
+        ])
+        lines.extend('foremast_call_errors_total{{{0}}} {1}'.format(labels, stats.errors) for labels, stats in totals)
+        lines.extend([
+            '# HELP foremast_call_response_bytes_total Response bytes from Gate and AWS calls.',
+            '# TYPE foremast_call_response_bytes_total counter',
+        ])
+        lines.extend('foremast_call_response_bytes_total{{{0}}} {1}'.format(labels, stats.bytes)
+                     for labels, stats in totals)
+
+        return '\n'.join(lines) + '\n'
+
+    def summary(self):
+        """Format a table of calls, slowest operations first.
+
+        Returns:
+            str: Table with one row per operation, empty when nothing was
+            recorded.
+
+        """
+        with self._lock:
+            rows = sorted(self.stats.items(), key=lambda item: item[1].seconds, reverse=True)
+            if not rows:
+                return ''
+
+            width = max(len('{0} {1}'.format(*key)) for key, _ in rows)
+            header = '{0:<{width}} {1:>6} {2:>6} {3:>9} {4:>9} {5:>9} {6:>12}'.format(
+                'Operation', 'Calls', 'Errors', 'Total s', 'p95 ms', 'Max ms', 'Bytes', width=width)
+            lines = [header, '-' * len(header)]
+            for key, stats in rows:
+                lines.append('{0:<{width}} {1:>6} {2:>6} {3:>9.2f} {4:>9.0f} {5:>9.0f} {6:>12}'.format(
+                    '{0} {1}'.format(*key),
+                    stats.calls,
+                    stats.errors,
+                    stats.seconds,
+                    stats.percentile(0.95) * 1000,
+                    stats.max_seconds * 1000,
+                    stats.bytes,
+                    width=width))
+        return '\n'.join(lines)
+
+    def export(self, path):
+        """Atomically write metrics to _path_.
+
+        Args:
+            path (str): Destination, ``.prom`` files get the Prometheus text
+                format and anything else JSON.
+
+        """
+        if path.endswith('.prom'):
+            content = self.to_prometheus()
+        else:
+            content = json.dumps(self.as_dict(), indent=2, sort_keys=True)
+
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+
+        handle, temp_path = tempfile.mkstemp(dir=directory, prefix='.tmp-')
+        with os.fdopen(handle, 'wt') as metrics_file:
+            metrics_file.write(content)
+        os.replace(temp_path, path)
+        LOG.debug('Wrote metrics to %s.', path)
+
+    def report(self):
+        """Log the summary table and export to ``METRICS_FILE`` when set."""
+        table = self.summary()
+        if table:
+            LOG.info('Gate and AWS calls:\n%s', table)
+
+        if METRICS_FILE:
+            try:
+                self.export(METRICS_FILE)
+            except OSError as error:
+                LOG.warning('Could not write metrics to %s: %s', METRICS_FILE, error)
+
+
+METRICS = Metrics()
+"""Process wide metrics, reported at exit after :func:`enable_metrics`."""
+
+_REPORT_REGISTERED = False
+
+
+def instrument_botocore():
+    """Record every AWS API call made through botocore clients.
+
+    Safe to call more than once, the client is only wrapped the first time.
+    """
+    from botocore.client import BaseClient  # pylint: disable=import-outside-toplevel
+
+    make_api_call = BaseClient._make_api_call  # pylint: disable=protected-access
+    if getattr(make_api_call, 'instrumented', False):
+        return
+
+    @wraps(make_api_call)
+    def instrumented_api_call(client, operation_name, api_params):
+        operation = '{0}.{1}'.format(client.meta.service_model.endpoint_prefix, operation_name)
+        start = time.monotonic()
+        try:
+            response = make_api_call(client, operation_name, api_params)
+        except Exception:
+            METRICS.record('aws', operation, time.monotonic() - start, error=True)
+            raise
+
+        headers = response.get('ResponseMetadata', {}).get('HTTPHeaders', {})
+        METRICS.record('aws', operation, time.monotonic() - start, size=int(headers.get('content-length', 0)))
+        return response
+
+    instrumented_api_call.instrumented = True
+    BaseClient._make_api_call = instrumented_api_call  # pylint: disable=protected-access
+
+
+def enable_metrics():
+    """Record AWS calls and report all metrics when the interpreter exits.
+
+    Called by the Foremast commands, so importing Foremast as a library does
+    not patch botocore. Safe to call more than once.
+    """
+    global _REPORT_REGISTERED  # pylint: disable=global-statement
+
+    instrument_botocore()
+
+    if not _REPORT_REGISTERED:
+        atexit.register(METRICS.report)
+        _REPORT_REGISTERED = True
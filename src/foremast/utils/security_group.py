@@ -14,9 +14,10 @@
 #   See the License for the specific language governing permissions and
 #   limitations under the License.
 """Get security group id."""
+import collections
 import logging
-
-from tryagain import retries
+import threading
+import time
 
 from ..consts import SECURITYGROUP_REPLACEMENTS
 from ..exceptions import SpinnakerSecurityGroupError
@@ -25,8 +26,122 @@ from .vpc import get_vpc_id
 
 LOG = logging.getLogger(__name__)
 
+NEGATIVE_TTL = 0.25  # Seconds a listing missing a group is trusted before downloading it again
+LOOKUP_DELAYS = tuple(NEGATIVE_TTL * 2**attempt for attempt in range(5))  # Pauses before looking again
+
+
+class SecurityGroupCatalog:
+    """Security Group IDs by name, one Gate listing per account, region and VPC.
+
+    Listings are kept for the life of the process. A name missing from a
+    listing is trusted for ``NEGATIVE_TTL`` seconds, later lookups download
+    the listing again so new groups are found. The catalog is safe to share
+    between threads.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._key_locks = collections.defaultdict(threading.Lock)
+        self._listings = {}
+
+    def clear(self, env=None, region=None):
+        """Forget listings, only those for _env_ and _region_ when given.
+
+        Args:
+            env (str): Deployment environment.
+            region (str): AWS Region.
+
+        """
+        with self._lock:
+            for key in list(self._listings):
+                if env in (None, key[0]) and region in (None, key[1]):
+                    del self._listings[key]
+
+    def _listing(self, env, region, vpc_id, max_age=None):
+        """Get the Security Group IDs by name, downloading them when older than _max_age_."""
+        key = (env, region, vpc_id)
+        with self._lock:
+            key_lock = self._key_locks[key]
+
+        with key_lock:
+            loaded, groups = self._listings.get(key, (None, None))
+            if groups is not None and (max_age is None or time.monotonic() - loaded < max_age):
+                return groups
+
+            response = gate_request(uri='/securityGroups/{0}'.format(env), params={'provider': 'aws', 'region': region})
+            assert response.ok, 'Spinnaker communication error: {0}'.format(response.text)
+
+            listing = response.json()
+            if isinstance(listing, dict):
+                listing = listing.get(region, [])
+
+            groups = {group['name']: group['id'] for group in listing if group.get('vpcId', vpc_id) == vpc_id}
+            LOG.debug('Found %d Security Groups in %s [%s] in %s.', len(groups), env, region, vpc_id)
+
+            self._listings[key] = (time.monotonic(), groups)
+            return groups
+
+    def load(self, env='', region=''):
+        """Download the Security Groups of _env_ and _region_ unless already listed.
+
+        Args:
+            env (str): Deployment environment.
+            region (str): AWS Region.
+
+        Returns:
+            dict: Security Group ID by name.
+
+        """
+        return dict(self._listing(env, region, get_vpc_id(env, region)))
+
+    def resolve(self, names, env='', region=''):
+        """Get the IDs of several Security Groups.
+
+        Groups missing from the listing are looked for again after growing
+        pauses, as a group created moments ago may not be listed yet.
+
+        Args:
+            names (list): Security Group names to find.
+            env (str): Deployment environment to search.
+            region (str): AWS Region to search.
+
+        Returns:
+            dict: Security Group ID by name.
+
+        Raises:
+            AssertionError: Call to Gate API was not successful.
+            SpinnakerSecurityGroupError: A Security Group was not found for
+                _env_ in _region_.
+
+        """
+        vpc_id = get_vpc_id(env, region)
+
+        LOG.info('Find %s sg in %s [%s] in %s', ', '.join(names), env, region, vpc_id)
+
+        groups = self._listing(env, region, vpc_id)
+        for delay in (0, ) + LOOKUP_DELAYS:
+            missing = [name for name in names if name not in groups]
+            if not missing:
+                break
+
+            LOG.debug('Security groups %s not found, looking again in %s seconds.', missing, delay)
+            if delay:
+                time.sleep(delay)
+            groups = self._listing(env, region, vpc_id, max_age=NEGATIVE_TTL)
+        else:
+            missing = [name for name in names if name not in groups]
+            if missing:
+                raise SpinnakerSecurityGroupError('Security group ({0}) not found'.format(', '.join(missing)))
+
+        security_group_ids = {name: groups[name] for name in names}
+        LOG.info('Found: %s', security_group_ids)
+        return security_group_ids
+
+
+SECURITY_GROUP_CATALOG = SecurityGroupCatalog()
+"""Security Groups shared by every lookup in this process."""
+
 
-@retries(max_attempts=5, wait=2, exceptions=(SpinnakerSecurityGroupError))
 def get_security_group_id(name='', env='', region=''):
     """Get a security group ID.
 
@@ -44,23 +159,28 @@ def get_security_group_id(name='', env='', region=''):
             _env_ in _region_.
 
     """
-    vpc_id = get_vpc_id(env, region)
+    return SECURITY_GROUP_CATALOG.resolve([name], env=env, region=region)[name]
+
+
+def get_security_group_ids(names, env='', region=''):
+    """Get the IDs of several security groups with one Gate listing.
 
-    LOG.info('Find %s sg in %s [%s] in %s', name, env, region, vpc_id)
+    Args:
+        names (list): Security Group names to find.
+        env (str): Deployment environment to search.
+        region (str): AWS Region to search.
 
-    uri = '/securityGroups/{0}/{1}/{2}?vpcId={3}'.format(env, region, name, vpc_id)
-    response = gate_request(uri=uri)
-    assert response.ok
+    Returns:
+        list: IDs of the Security Groups, in the order of _names_.
 
-    result = response.json()
-    try:
-        security_group_id = result['id']
-    except KeyError:
-        msg = 'Security group ({0}) not found'.format(name)
-        raise SpinnakerSecurityGroupError(msg)
+    Raises:
+        AssertionError: Call to Gate API was not successful.
+        SpinnakerSecurityGroupError: A Security Group was not found for _env_
+            in _region_.
 
-    LOG.info('Found: %s', security_group_id)
-    return security_group_id
+    """
+    security_group_ids = SECURITY_GROUP_CATALOG.resolve(names, env=env, region=region)
+    return [security_group_ids[name] for name in names]
 
 
 def remove_duplicate_sg(security_groups):
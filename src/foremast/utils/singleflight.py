@@ -0,0 +1,83 @@
+#   Foremast - Pipeline Tooling
+#
+#   Copyright 2019 Redbox Automated Retail, LLC
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+"""Coalesce concurrent identical calls into one."""
+import logging
+import threading
+from concurrent.futures import Future
+
+LOG = logging.getLogger(__name__)
+
+
+class SingleFlight:
+    """Run only one call per key at a time and share its result.
+
+    Threads asking for a key that is already in flight wait for the running
+    call and receive the same return value or exception.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._in_flight = {}
+        self.calls = 0
+        self.deduplicated = 0
+
+    def do(self, key, func):
+        """Call _func_ unless a call for _key_ is already running.
+
+        Args:
+            key (collections.abc.Hashable): Identity of the call.
+            func (callable): Function taking no arguments.
+
+        Returns:
+            object: Return value of the single call of _func_.
+
+        """
+        with self._lock:
+            future = self._in_flight.get(key)
+            leader = future is None
+
+            if leader:
+                future = Future()
+                self._in_flight[key] = future
+                self.calls += 1
+            else:
+                self.deduplicated += 1
+
+        if not leader:
+            LOG.debug('Waiting for in flight call: %s', key)
+            return future.result()
+
+        try:
+            result = func()
+        except BaseException as error:
+            future.set_exception(error)
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            with self._lock:
+                del self._in_flight[key]
+
+    def stats(self):
+        """Get call counters.
+
+        Returns:
+            dict: Number of ``calls`` made and ``deduplicated`` waiters.
+
+        """
+        with self._lock:
+            return {'calls': self.calls, 'deduplicated': self.deduplicated}
@@ -15,17 +15,130 @@
 #   limitations under the License.
 """Get available Subnets for specific Targets."""
 import logging
-from collections import defaultdict
+import threading
+from collections import OrderedDict
 from pprint import pformat
 
 from tryagain import retries
 
 from ..exceptions import SpinnakerSubnetError, SpinnakerTimeout
 from ..utils.gate import gate_request
+from ..utils.json_stream import iter_json_array
 
 LOG = logging.getLogger(__name__)
 
 
+class SubnetCatalog:
+    """Index of the Subnets known to Spinnaker, loaded once per process.
+
+    Availability Zones are indexed by account, region and target, Subnet IDs
+    also by purpose, so lookups do not scan ``/subnets/aws``. The catalog is
+    safe to share between threads.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._zones = None
+        self._subnet_ids = None
+
+    def clear(self):
+        """Forget the index, the next lookup downloads ``/subnets/aws`` again."""
+        with self._lock:
+            self._zones = None
+            self._subnet_ids = None
+
+    def load(self):
+        """Download and index ``/subnets/aws`` unless already indexed.
+
+        Raises:
+            SpinnakerTimeout: Gate did not list the Subnets.
+
+        """
+        if self._zones is not None:
+            return
+
+        with self._lock:
+            if self._zones is not None:
+                return
+
+            subnet_response = gate_request(uri='/subnets/aws')
+            if not subnet_response.ok:
+                raise SpinnakerTimeout(subnet_response.text)
+
+            zones = {}
+            subnet_ids = {}
+            for subnet in iter_json_array(subnet_response):
+                LOG.debug('Subnet Response: %s', subnet)
+
+                account_zones = zones.setdefault(subnet.get('target', ''), OrderedDict()).setdefault(
+                    subnet['account'], OrderedDict())
+                region_zones = account_zones.setdefault(subnet['region'], [])
+                if subnet['availabilityZone'] not in region_zones:
+                    region_zones.append(subnet['availabilityZone'])
+
+                # Subnets without target and purpose tags are indexed, just never matched
+                key = (subnet['account'], subnet['region'], subnet.get('target', ''), subnet.get('purpose'))
+                subnet_ids.setdefault(key, []).append(subnet['id'])
+
+            self._subnet_ids = subnet_ids
+            self._zones = zones
+
+    def zones(self, account, region, target='ec2'):
+        """Get the Availability Zones with _target_ Subnets.
+
+        Args:
+            account (str): Account name.
+            region (str): AWS Region.
+            target (str): Type of Subnets, ``ec2`` or ``elb``.
+
+        Returns:
+            list: Availability Zones, None when the account has no such
+            Subnets in _region_.
+
+        """
+        self.load()
+        zones = self._zones.get(target, {}).get(account, {}).get(region)
+        return None if zones is None else list(zones)
+
+    def subnet_ids(self, account, region, target='ec2', purpose='internal'):
+        """Get the IDs of _target_ Subnets used for _purpose_.
+
+        Args:
+            account (str): Account name.
+            region (str): AWS Region.
+            target (str): Type of Subnets, ``ec2`` or ``elb``.
+            purpose (str): Subnet purpose, e.g. ``internal`` or ``external``.
+
+        Returns:
+            list: Subnet IDs, None when there are no such Subnets.
+
+        """
+        self.load()
+        subnet_ids = self._subnet_ids.get((account, region, target, purpose))
+        return None if subnet_ids is None else list(subnet_ids)
+
+    def account_zones(self, target='ec2'):
+        """Get the Availability Zones with _target_ Subnets in every account.
+
+        Args:
+            target (str): Type of Subnets, ``ec2`` or ``elb``.
+
+        Returns:
+            dict: ``{$account: {$region: [$availabilityzones]}}``
+
+        """
+        self.load()
+        return {
+            account: {region: list(zones)
+                      for region, zones in regions.items()}
+            for account, regions in self._zones.get(target, {}).items()
+        }
+
+
+SUBNET_CATALOG = SubnetCatalog()
+"""Subnets shared by every lookup in this process."""
+
+
 # TODO: split up into get_az, and get_subnet_id
 @retries(max_attempts=6, wait=2.0, exceptions=SpinnakerTimeout)  # noqa
 def get_subnets(
@@ -46,47 +159,17 @@ def get_subnets(
         or
         { $account: $region: [ $availabilityzone] }
     """
-    account_az_dict = defaultdict(defaultdict)
-    subnet_id_dict = defaultdict(defaultdict)
-
-    uri = '/subnets/aws'
-    subnet_response = gate_request(uri=uri)
-
-    if not subnet_response.ok:
-        raise SpinnakerTimeout(subnet_response.text)
-
-    subnet_list = subnet_response.json()
-    for subnet in subnet_list:
-        LOG.debug('Subnet Response: %s', subnet)
-
-        if subnet.get('target', '') == target:
-            availability_zone = subnet['availabilityZone']
-            account = subnet['account']
-            subnet_region = subnet['region']
-            subnet_id = subnet['id']
-            try:
-                if availability_zone not in account_az_dict[account][subnet_region]:
-                    account_az_dict[account][subnet_region].append(availability_zone)
-            except KeyError:
-                account_az_dict[account][subnet_region] = [availability_zone]
-            # get list of all subnet IDs with correct purpose
-            if subnet['purpose'] == purpose:
-                try:
-                    subnet_id_dict[account][subnet_region].append(subnet_id)
-                except KeyError:
-                    subnet_id_dict[account][subnet_region] = [subnet_id]
-
-            LOG.debug('%s regions: %s', account, list(account_az_dict[account].keys()))
-
     if all([env, region]):
-        try:
-            region_dict = {region: account_az_dict[env][region]}
-            region_dict['subnet_ids'] = {region: subnet_id_dict[env][region]}
-            LOG.debug('Region dict: %s', region_dict)
-            return region_dict
-        except KeyError:
+        zones = SUBNET_CATALOG.zones(env, region, target=target)
+        subnet_ids = SUBNET_CATALOG.subnet_ids(env, region, target=target, purpose=purpose)
+        if zones is None or subnet_ids is None:
             raise SpinnakerSubnetError(env=env, region=region)
 
-    LOG.debug('AZ dict:\n%s', pformat(dict(account_az_dict)))
+        region_dict = {region: zones, 'subnet_ids': {region: subnet_ids}}
+        LOG.debug('Region dict: %s', region_dict)
+        return region_dict
+
+    account_az_dict = SUBNET_CATALOG.account_zones(target=target)
+    LOG.debug('AZ dict:\n%s', pformat(account_az_dict))
 
     return account_az_dict
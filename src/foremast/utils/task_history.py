@@ -0,0 +1,113 @@
+#   Foremast - Pipeline Tooling
+#
+#   Copyright 2019 Redbox Automated Retail, LLC
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+"""Remember how long Spinnaker Tasks take to finish.
+
+Durations are kept per credentials and job type under ``CACHE_DIR`` so later
+Foremast runs can poll for a Task around the time it usually finishes.
+"""
+import json
+import logging
+import os
+import statistics
+import tempfile
+import threading
+
+from ..consts import CACHE_DIR
+
+LOG = logging.getLogger(__name__)
+
+
+class TaskHistory:
+    """Recent durations of successful Spinnaker Tasks.
+
+    Args:
+        path (str): JSON file holding the durations.
+        size (int): Number of durations kept per credentials and job type.
+    """
+
+    def __init__(self, path=os.path.join(CACHE_DIR, 'task_durations.json'), size=20):
+        self.path = path
+        self.size = size
+        self._lock = threading.Lock()
+        self._durations = None
+
+    @staticmethod
+    def key(env, task_type):
+        """Build the history key for _task_type_ jobs in _env_."""
+        return '{0}:{1}'.format(env, task_type)
+
+    def _load(self):
+        try:
+            with open(self.path, 'rt') as history_file:
+                return json.load(history_file)
+        except FileNotFoundError:
+            return {}
+        except ValueError:
+            LOG.warning('Ignoring corrupt Task history %s.', self.path)
+            return {}
+
+    def _store(self, durations):
+        directory = os.path.dirname(self.path)
+        try:
+            os.makedirs(directory, exist_ok=True)
+            handle, temp_path = tempfile.mkstemp(dir=directory, prefix='.tmp-')
+            with os.fdopen(handle, 'wt') as history_file:
+                json.dump(durations, history_file)
+            os.replace(temp_path, self.path)
+        except OSError as error:
+            LOG.warning('Could not write Task history %s: %s', self.path, error)
+
+    def expected(self, env, task_type):
+        """Get the usual duration of _task_type_ jobs in _env_.
+
+        Args:
+            env (str): Credentials the Task runs with.
+            task_type (str): Type of the Task's first job.
+
+        Returns:
+            float: Median of recent durations in seconds, None without
+            history.
+
+        """
+        with self._lock:
+            if self._durations is None:
+                self._durations = self._load()
+            samples = self._durations.get(self.key(env, task_type))
+
+        if not samples:
+            return None
+        return statistics.median(samples)
+
+    def record(self, env, task_type, seconds):
+        """Remember a Task took _seconds_ to succeed.
+
+        Args:
+            env (str): Credentials the Task ran with.
+            task_type (str): Type of the Task's first job.
+            seconds (float): Time Spinnaker spent running the Task, as
+                reported by Gate. Times Foremast observed include polling
+                delays and would only ever raise the median.
+
+        """
+        key = self.key(env, task_type)
+        with self._lock:
+            # Reload to keep durations recorded by concurrent runs
+            durations = self._load()
+            durations[key] = (durations.get(key, []) + [round(seconds, 3)])[-self.size:]
+            self._store(durations)
+            self._durations = durations
+
+        LOG.debug('Task %s took %.1f seconds.', key, seconds)
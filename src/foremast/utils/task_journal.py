@@ -0,0 +1,140 @@
+#   Foremast - Pipeline Tooling
+#
+#   Copyright 2019 Redbox Automated Retail, LLC
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+"""Journal of Spinnaker Tasks posted without waiting for them.
+
+Each posted Task is appended as one JSON line, so several Foremast processes
+can share a journal. ``foremast tasks wait`` reads it back later. Changes are
+made under an exclusive lock on a ``.lock`` file next to the journal.
+"""
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+from contextlib import contextmanager, suppress
+
+from ..consts import TASK_JOURNAL_FILE
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover, Windows has no flock
+    fcntl = None
+
+LOG = logging.getLogger(__name__)
+
+
+class TaskJournal:
+    """Spinnaker Tasks left running by Foremast.
+
+    Args:
+        path (str): JSON lines file holding the Tasks.
+    """
+
+    def __init__(self, path=TASK_JOURNAL_FILE):
+        self.path = path
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def _locked(self):
+        """Hold the journal against other threads and Foremast processes.
+
+        The lock is taken on a separate file, as :meth:`remove` replaces the
+        journal itself.
+        """
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        with self._lock, open(self.path + '.lock', 'a') as lock_file:
+            if fcntl:
+                fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                if fcntl:
+                    fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def record(self, taskref, task_data, timeout):
+        """Remember a posted Task.
+
+        Args:
+            taskref (str): Spinnaker Task reference.
+            task_data (dict): Task definition as posted.
+            timeout (int): Seconds the Task may run, counted from now.
+
+        Returns:
+            dict: Journal entry.
+
+        """
+        entry = {
+            'ref': taskref,
+            'application': task_data.get('application'),
+            'description': task_data.get('description'),
+            'jobs': [job.get('type') for job in task_data.get('job', [])],
+            'posted': time.time(),
+            'timeout': timeout,
+        }
+
+        with self._locked(), open(self.path, 'at') as journal_file:
+            journal_file.write(json.dumps(entry, sort_keys=True) + '\n')
+
+        LOG.info('Recorded Task %s in %s.', taskref, self.path)
+        return entry
+
+    def entries(self):
+        """Read the recorded Tasks.
+
+        Returns:
+            list: Journal entries in the order posted.
+
+        """
+        try:
+            with open(self.path, 'rt') as journal_file:
+                lines = journal_file.read().splitlines()
+        except FileNotFoundError:
+            return []
+
+        entries = []
+        for line in lines:
+            if not line.strip():
+                continue
+            try:
+                entries.append(json.loads(line))
+            except ValueError:
+                LOG.warning('Ignoring corrupt line in Task journal %s: %s', self.path, line)
+        return entries
+
+    def remove(self, taskrefs):
+        """Forget the Tasks with the given references.
+
+        Args:
+            taskrefs (iterable): Spinnaker Task references.
+
+        """
+        taskrefs = set(taskrefs)
+        with self._locked():
+            remaining = [entry for entry in self.entries() if entry.get('ref') not in taskrefs]
+            if not remaining:
+                with suppress(FileNotFoundError):
+                    os.remove(self.path)
+                return
+
+            directory = os.path.dirname(self.path) or '.'
+            handle, temp_path = tempfile.mkstemp(dir=directory, prefix='.tmp-')
+            with os.fdopen(handle, 'wt') as journal_file:
+                journal_file.writelines(json.dumps(entry, sort_keys=True) + '\n' for entry in remaining)
+            os.replace(temp_path, self.path)
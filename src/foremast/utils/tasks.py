@@ -13,19 +13,91 @@
 #   See the License for the specific language governing permissions and
 #   limitations under the License.
 """POST a new task or check status of running task."""
+import collections
 import copy
+import itertools
 import json
 import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
 from functools import partial
 
+import requests
 from tryagain import call as retry_call
 
-from ..consts import DEFAULT_TASK_TIMEOUT, HEADERS, TASK_TIMEOUTS
+from ..consts import DEFAULT_TASK_TIMEOUT, GATE_MAX_IN_FLIGHT, HEADERS, TASK_DETACH, TASK_TIMEOUTS
 from ..exceptions import SpinnakerTaskError, SpinnakerTaskInconclusiveError
 from ..utils import gate_request
+from .task_history import TaskHistory
+from .task_journal import TaskJournal
 
 LOG = logging.getLogger(__name__)
 
+FIRST_POLL_WAIT = 0.5  # Seconds before the first poll without history
+MAX_POLL_WAIT = 10  # Longest pause between polls in seconds
+POLL_BACKOFF = 1.5  # Growth of the pause after each poll
+
+COMPLETE_STATUSES = frozenset(('SUCCEEDED', 'TERMINAL', 'CANCELED', 'STOPPED', 'FAILED_CONTINUE', 'SKIPPED'))
+"""Statuses of Spinnaker Tasks and stages that are done running."""
+
+TASK_HISTORY = TaskHistory()
+"""Durations of past Tasks, used to schedule the first poll."""
+
+TASK_JOURNAL = TaskJournal()
+"""Tasks posted without waiting while ``TASK_DETACH`` is set."""
+
+
+class TaskOutcome(collections.namedtuple('TaskOutcome', 'index task ref status error')):
+    """Result of one task run by :func:`iter_tasks`.
+
+    Attributes:
+        index (int): Position of the task in the submitted list.
+        task (object): Task definition as submitted.
+        ref (str): Spinnaker Task reference, None when posting failed.
+        status (str): ``SUCCEEDED``, ``TERMINAL`` or None when posting failed
+            or the task timed out.
+        error (Exception): Why the task did not succeed, None on success.
+    """
+
+    __slots__ = ()
+
+    @property
+    def ok(self):
+        """bool: True when the task succeeded."""
+        return self.error is None
+
+
+class TaskStatus(str):
+    """Status of a Spinnaker Task, compares equal to the plain status.
+
+    Attributes:
+        duration (float): Seconds Spinnaker spent running the Task, None when
+            Gate did not report its start and end.
+    """
+
+    duration = None
+
+
+def _run_time(*states):
+    """Get the seconds from the earliest start to the latest end of Task or stage _states_.
+
+    Returns:
+        float: Seconds, None when a start or end time is missing.
+
+    """
+    starts = [state.get('startTime') for state in states]
+    ends = [state.get('endTime') for state in states]
+    if not states or None in starts or None in ends:
+        return None
+    return (max(ends) - min(starts)) / 1000
+
+
+def _record_duration(task_data, status):
+    """Remember how long Spinnaker ran _task_data_, as reported in _status_."""
+    duration = getattr(status, 'duration', None)
+    if duration is not None:
+        TASK_HISTORY.record(*_task_kind(task_data), duration)
+
 
 def post_task(task_data, task_uri='/tasks'):
     """Create Spinnaker Task.
@@ -57,14 +129,17 @@ def post_task(task_data, task_uri='/tasks'):
     return resp_json['ref']
 
 
-def _check_task(taskid):
-    """Check Spinnaker Task status.
+def _get_task_state(taskid):
+    """Get the state of a Spinnaker Task.
 
     Args:
         taskid (str): Existing Spinnaker Task ID.
 
     Returns:
-        str: Task status.
+        dict: Task state, including its ``execution`` stages.
+
+    Raises:
+        AssertionError: API did not respond with a 200 status code.
 
     """
     try:
@@ -86,25 +161,77 @@ def _check_task(taskid):
 
     assert task_response.ok, 'Spinnaker communication error: {0}'.format(task_response.text)
 
-    task_state = task_response.json()
+    return task_response.json()
+
+
+def _check_task(taskid):
+    """Check Spinnaker Task status.
+
+    Args:
+        taskid (str): Existing Spinnaker Task ID.
+
+    Returns:
+        TaskStatus: Task status, with the time Spinnaker spent running it.
+
+    """
+    task_state = _get_task_state(taskid)
     status = task_state['status']
     LOG.info('Current task status: %s', status)
 
     if status == 'SUCCEEDED':  # pylint: disable=no-else-return
-        return status
+        succeeded = TaskStatus(status)
+        succeeded.duration = _run_time(task_state)
+        return succeeded
     elif status == 'TERMINAL':
         raise SpinnakerTaskError(task_state)
     else:
         raise ValueError
 
 
-def check_task(taskid, timeout=DEFAULT_TASK_TIMEOUT, wait=2):
+def poll_delays(timeout, expected=None):
+    """Get the pauses before each poll of a Spinnaker Task.
+
+    The first poll comes quickly, or when the Task usually finishes if
+    _expected_ is known. Pauses then grow by ``POLL_BACKOFF`` up to
+    ``MAX_POLL_WAIT`` and the last pause ends exactly at _timeout_.
+
+    Args:
+        timeout (int): Total seconds to poll for.
+        expected (float): Usual duration of the Task in seconds.
+
+    Yields:
+        float: Seconds to wait before the next poll.
+
+    """
+    if timeout <= 0:
+        yield 0
+        return
+
+    elapsed = 0
+    backoff = FIRST_POLL_WAIT
+    delay = expected if expected and expected > FIRST_POLL_WAIT else None
+
+    while elapsed < timeout:
+        if delay is None:
+            delay = backoff
+            backoff = min(MAX_POLL_WAIT, backoff * POLL_BACKOFF)
+
+        delay = min(delay, timeout - elapsed)
+        yield delay
+
+        elapsed += delay
+        delay = None
+
+
+def check_task(taskid, timeout=DEFAULT_TASK_TIMEOUT, wait=None, expected=None):
     """Wrap check_task.
 
     Args:
         taskid (str): Existing Spinnaker Task ID.
         timeout (int, optional): Consider Task failed after given seconds.
-        wait (int, optional): Seconds to pause between polling attempts.
+        wait (int, optional): Seconds to pause between polling attempts,
+            polls follow :func:`poll_delays` when not given.
+        expected (float, optional): Usual duration of the Task in seconds.
 
     Returns:
         str: Task status.
@@ -115,41 +242,616 @@ def check_task(taskid, timeout=DEFAULT_TASK_TIMEOUT, wait=2):
             reach a terminal state before the given time out.
 
     """
-    max_attempts = int(timeout / wait)
-    try:
-        return retry_call(
-            partial(_check_task, taskid),
-            max_attempts=max_attempts,
-            wait=wait,
-            exceptions=(AssertionError, ValueError), )
-    except ValueError:
-        raise SpinnakerTaskInconclusiveError('Task failed to complete in {0} seconds: {1}'.format(timeout, taskid))
+    if wait is not None:
+        max_attempts = int(timeout / wait)
+        try:
+            return retry_call(
+                partial(_check_task, taskid),
+                max_attempts=max_attempts,
+                wait=wait,
+                exceptions=(AssertionError, ValueError), )
+        except ValueError:
+            raise SpinnakerTaskInconclusiveError('Task failed to complete in {0} seconds: {1}'.format(timeout, taskid))
+
+    deadline = time.monotonic() + timeout
+    last_error = None
+    for delay in poll_delays(timeout, expected=expected):
+        time.sleep(max(0, min(delay, deadline - time.monotonic())))
+        try:
+            return _check_task(taskid)
+        except (AssertionError, ValueError) as error:
+            last_error = error
+
+        if time.monotonic() >= deadline:
+            break
+
+    if isinstance(last_error, AssertionError):
+        raise last_error
+    raise SpinnakerTaskInconclusiveError('Task failed to complete in {0} seconds: {1}'.format(timeout, taskid))
+
+
+def _task_kind(task_data):
+    """Get the credentials and type of the first job in _task_data_."""
+    if isinstance(task_data, str):
+        json_data = json.loads(task_data)
+    else:
+        json_data = task_data
 
+    job = json_data['job'][0]
+    return job.get('credentials'), job.get('type')
+
+
+def get_task_timeout(task_data):
+    """Get the timeout configured in ``TASK_TIMEOUTS`` for a task.
+
+    The first job's credentials and type select the timeout, falling back to
+    ``DEFAULT_TASK_TIMEOUT``.
+
+    Args:
+        task_data (str): Task JSON definition.
 
-def wait_for_task(task_data, task_uri='/tasks'):
+    Returns:
+        int: Seconds to wait for the task.
+
+    """
+    # inspect the task to see if a timeout is configured
+    env, task_type = _task_kind(task_data)
+
+    timeout = TASK_TIMEOUTS.get(env, dict()).get(task_type, DEFAULT_TASK_TIMEOUT)
+
+    LOG.debug("Task %s will timeout after %s", task_type, timeout)
+
+    return int(timeout)
+
+
+def wait_for_task(task_data, task_uri='/tasks', detachable=False):
     """Run task and check the result.
 
     Args:
         task_data (str): the task json to execute
+        detachable (bool): Nothing later depends on the task, so it may be
+            posted without waiting when ``TASK_DETACH`` is set.
 
     Returns:
-        str: Task status.
+        str: Task status, ``DETACHED`` when posted without waiting.
 
     """
+    if TASK_DETACH and detachable:
+        detach_tasks([task_data], task_uri=task_uri)
+        return 'DETACHED'
+
     taskid = post_task(task_data, task_uri)
 
+    timeout = get_task_timeout(task_data)
+    env, task_type = _task_kind(task_data)
+
+    status = check_task(taskid, timeout, expected=TASK_HISTORY.expected(env, task_type))
+    _record_duration(task_data, status)
+    return status
+
+
+def _submit_task(task_data, task_uri):
+    """Post a task, returning its reference and any error."""
+    try:
+        return post_task(task_data, task_uri), None
+    except (AssertionError, KeyError, ValueError, requests.exceptions.RequestException) as error:
+        LOG.error('Failed to submit task: %s', error)
+        return None, error
+
+
+def _poll_task(taskref):
+    """Check a task once, returning its terminal status and error or None while running.
+
+    Gate errors count as running, the task is polled again until it times out.
+    """
+    try:
+        return _check_task(taskref), None
+    except SpinnakerTaskError as error:
+        return 'TERMINAL', error
+    except (AssertionError, ValueError, requests.exceptions.RequestException):
+        return None, None
+
+
+def _poll_tasks(executor, pending, history=True):
+    """Poll tasks until each succeeds, fails or times out.
+
+    Args:
+        executor (ThreadPoolExecutor): Pool to poll with.
+        pending (dict): Lists of task, reference, timeout, deadline, poll
+            delays and next poll time, by index.
+        history (bool): Record the run time of successful tasks in
+            ``TASK_HISTORY``, needs Task definitions in _pending_.
+
+    Yields:
+        TaskOutcome: One per task, in order of completion.
+
+    """
+    while pending:
+        next_round = min(next_poll for *_, next_poll in pending.values())
+        delay = next_round - time.monotonic()
+        if delay > 0:
+            time.sleep(delay)
+
+        indexes = sorted(index for index, (*_, next_poll) in pending.items() if next_poll <= next_round)
+        polled = executor.map(_poll_task, [pending[index][1] for index in indexes])
+
+        now = time.monotonic()
+        for index, (status, error) in zip(indexes, polled):
+            task_data, taskref, timeout, deadline, delays, _ = pending[index]
+            if status is None and now < deadline:
+                pending[index][5] = min(deadline, now + next(delays, 0))
+                continue
+
+            if status is None:
+                error = SpinnakerTaskInconclusiveError('Task failed to complete in {0} seconds: {1}'.format(
+                    timeout, taskref))
+            elif status == 'SUCCEEDED' and history:
+                _record_duration(task_data, status)
+
+            del pending[index]
+            yield TaskOutcome(index, task_data, taskref, status, error)
+
+
+def iter_tasks(task_list, task_uri='/tasks', wait=None, max_in_flight=GATE_MAX_IN_FLIGHT):
+    """Run several tasks at once, yielding each outcome as it completes.
+
+    All tasks are posted up front and tracked in one polling loop, so their
+    execution overlaps in Spinnaker. Each task times out on its own as
+    configured in ``TASK_TIMEOUTS`` and is polled on its own
+    :func:`poll_delays` schedule.
+
+    Args:
+        task_list (list): Task JSON definitions.
+        task_uri (str): URI to post the tasks to.
+        wait (int): Seconds to pause between polls, polling right after
+            posting, instead of the adaptive schedule.
+        max_in_flight (int): Maximum concurrent Gate requests.
+
+    Yields:
+        TaskOutcome: One per task, in order of completion.
+
+    """
+    task_list = list(task_list)
+    if not task_list:
+        return
+
+    with ThreadPoolExecutor(max_workers=min(max_in_flight, len(task_list))) as executor:
+        submitted = executor.map(partial(_submit_task, task_uri=task_uri), task_list)
+
+        pending = {}
+        start = time.monotonic()
+        for index, (task_data, (taskref, error)) in enumerate(zip(task_list, submitted)):
+            if error is not None:
+                yield TaskOutcome(index, task_data, None, None, error)
+                continue
+
+            timeout = get_task_timeout(task_data)
+            if wait is None:
+                delays = poll_delays(timeout, expected=TASK_HISTORY.expected(*_task_kind(task_data)))
+            else:
+                delays = itertools.chain([0], itertools.repeat(wait))
+            pending[index] = [task_data, taskref, timeout, start + timeout, delays, start + next(delays)]
+
+        yield from _poll_tasks(executor, pending)
+
+
+def wait_for_tasks(task_list, task_uri='/tasks', wait=None, detachable=False):
+    """Run several tasks at once and wait for all of them.
+
+    Args:
+        task_list (list): Task JSON definitions.
+        task_uri (str): URI to post the tasks to.
+        wait (int): Seconds to pause between polls, polls follow
+            :func:`poll_delays` when not given.
+        detachable (bool): Nothing later depends on the tasks, so they may be
+            posted without waiting when ``TASK_DETACH`` is set.
+
+    Returns:
+        list: :class:`TaskOutcome` for each task, in the order of _task_list_.
+
+    Raises:
+        AssertionError: A task could not be posted.
+        requests.exceptions.RequestException: Gate could not be reached to
+            post a task.
+        :obj:`foremast.exceptions.SpinnakerTaskError`: A task failed or did
+            not finish in time, raised once all tasks are done.
+
+    """
+    if TASK_DETACH and detachable:
+        return detach_tasks(task_list, task_uri=task_uri)
+
+    outcomes = sorted(iter_tasks(task_list, task_uri=task_uri, wait=wait), key=lambda outcome: outcome.index)
+    return _raise_failures(outcomes)
+
+
+def _raise_failures(outcomes):
+    """Log every failed outcome, then raise the error of the first one."""
+    for outcome in outcomes:
+        if not outcome.ok:
+            LOG.error('Task %s did not succeed: %s', outcome.ref, outcome.error)
+
+    for outcome in outcomes:
+        if not outcome.ok:
+            raise outcome.error
+
+    return outcomes
+
+
+def _detach_task(task_data, timeout=None, task_uri='/tasks'):
+    """Post a task and record it in ``TASK_JOURNAL``, returning its reference and any error."""
     if isinstance(task_data, str):
-        json_data = json.loads(task_data)
-    else:
-        json_data = task_data
+        task_data = json.loads(task_data)
 
-    # inspect the task to see if a timeout is configured
-    job = json_data['job'][0]
-    env = job.get('credentials')
-    task_type = job.get('type')
+    taskref, error = _submit_task(task_data, task_uri)
+    if error is None:
+        TASK_JOURNAL.record(taskref, task_data, timeout or get_task_timeout(task_data))
+    return taskref, error
 
-    timeout = TASK_TIMEOUTS.get(env, dict()).get(task_type, DEFAULT_TASK_TIMEOUT)
 
-    LOG.debug("Task %s will timeout after %s", task_type, timeout)
+def detach_tasks(task_list, task_uri='/tasks', timeouts=None, max_in_flight=GATE_MAX_IN_FLIGHT):
+    """Post tasks without waiting for them.
+
+    The tasks are recorded in ``TASK_JOURNAL`` for :func:`wait_for_detached_tasks`.
+
+    Args:
+        task_list (list): Task JSON definitions.
+        task_uri (str): URI to post the tasks to.
+        timeouts (list): Seconds each task may run, ``TASK_TIMEOUTS`` when
+            not given.
+        max_in_flight (int): Maximum concurrent Gate requests.
+
+    Returns:
+        list: :class:`TaskOutcome` with ``DETACHED`` status for each task, in
+        the order of _task_list_.
+
+    Raises:
+        AssertionError: A task could not be posted, raised once all tasks
+            are posted.
+
+    """
+    task_list = list(task_list)
+    if not task_list:
+        return []
+
+    timeouts = timeouts or [None] * len(task_list)
+    with ThreadPoolExecutor(max_workers=min(max_in_flight, len(task_list))) as executor:
+        submitted = list(executor.map(partial(_detach_task, task_uri=task_uri), task_list, timeouts))
+
+    outcomes = [
+        TaskOutcome(index, task_data, taskref, 'DETACHED' if error is None else None, error)
+        for index, (task_data, (taskref, error)) in enumerate(zip(task_list, submitted))
+    ]
+    return _raise_failures(outcomes)
+
+
+def iter_detached_tasks(journal=None, max_in_flight=GATE_MAX_IN_FLIGHT):
+    """Wait for tasks posted by :func:`detach_tasks`, yielding each outcome as it completes.
+
+    Each task keeps the timeout it was posted with, so tasks past their
+    timeout are checked once.
+
+    Args:
+        journal (TaskJournal): Journal to read, ``TASK_JOURNAL`` by default.
+        max_in_flight (int): Maximum concurrent Gate requests.
+
+    Yields:
+        TaskOutcome: One per journal entry, in order of completion.
+
+    """
+    journal = journal or TASK_JOURNAL
+    entries = journal.entries()
+    if not entries:
+        return
+
+    with ThreadPoolExecutor(max_workers=min(max_in_flight, len(entries))) as executor:
+        pending = {}
+        now, wall_clock = time.monotonic(), time.time()
+        for index, entry in enumerate(entries):
+            remaining = max(0, entry['posted'] + entry['timeout'] - wall_clock)
+            delays = itertools.chain([0], poll_delays(remaining))
+            pending[index] = [entry, entry['ref'], entry['timeout'], now + remaining, delays, now + next(delays)]
+
+        # Journal entries do not hold the Task definition to record history for
+        yield from _poll_tasks(executor, pending, history=False)
+
+
+def wait_for_detached_tasks(journal=None):
+    """Wait for all tasks posted by :func:`detach_tasks` and report each failure.
+
+    Finished tasks are removed from the journal, failed ones included.
+
+    Args:
+        journal (TaskJournal): Journal to read, ``TASK_JOURNAL`` by default.
+
+    Returns:
+        list: :class:`TaskOutcome` for each journal entry, in the order posted.
+
+    Raises:
+        :obj:`foremast.exceptions.SpinnakerTaskError`: A task failed or did
+            not finish in time, raised once all tasks are done.
+
+    """
+    journal = journal or TASK_JOURNAL
+    outcomes = sorted(iter_detached_tasks(journal), key=lambda outcome: outcome.index)
+
+    for outcome in outcomes:
+        if outcome.ok:
+            LOG.info('Task %s succeeded: %s', outcome.ref, outcome.task.get('description'))
+
+    LOG.info('%d of %d detached tasks succeeded.', sum(outcome.ok for outcome in outcomes), len(outcomes))
+    journal.remove(outcome.ref for outcome in outcomes)
+    return _raise_failures(outcomes)
+
+
+def _poll_task_state(taskref):
+    """Get a task's state, None when Gate could not be reached."""
+    try:
+        return _get_task_state(taskref)
+    except (AssertionError, ValueError, requests.exceptions.RequestException):
+        return None
+
+
+def _job_stages(task_state, count):
+    """Match the top level execution stages of a Task to its _count_ jobs.
+
+    Spinnaker runs every job of an orchestration Task as its own stage, in
+    order.
+
+    Returns:
+        list: Stage of each job, all None when the stages do not match up.
+
+    """
+    stages = [stage for stage in task_state.get('execution', {}).get('stages', []) if not stage.get('parentStageId')]
+    if len(stages) != count:
+        return [None] * count
+    return stages
+
+
+def _job_error(task_state, failed):
+    """Build the error for _failed_ stages, the whole Task's when unknown."""
+    try:
+        if None in failed:
+            return SpinnakerTaskError(task_state)
+        return SpinnakerTaskError({'execution': {'stages': failed}})
+    except KeyError:
+        return SpinnakerTaskInconclusiveError('Task {0} ended {1} without error details'.format(
+            task_state.get('id'), task_state.get('status')))
+
+
+def _job_outcome(task_state, stages):
+    """Get the status and error of some jobs of a Task.
+
+    Args:
+        task_state (dict): Task state from Gate.
+        stages (list): Stages of the jobs, None entries when unknown.
+
+    Returns:
+        tuple: ``SUCCEEDED`` or ``TERMINAL`` with the error, None while the
+        jobs are running.
+
+    """
+    task_status = task_state['status']
+    statuses = [task_status if stage is None else stage.get('status') for stage in stages]
+
+    if all(status == 'SUCCEEDED' for status in statuses):
+        return 'SUCCEEDED', None
+
+    failed = [
+        stage for stage, status in zip(stages, statuses) if status in COMPLETE_STATUSES and status != 'SUCCEEDED'
+    ]
+    if failed:
+        return 'TERMINAL', _job_error(task_state, failed)
+
+    if task_status in COMPLETE_STATUSES:
+        # Jobs after a failed one never start
+        return 'TERMINAL', SpinnakerTaskInconclusiveError('Job did not run, Task {0} ended {1}'.format(
+            task_state.get('id'), task_status))
+
+    return None, None
+
+
+class TaskBatch:
+    """Run the jobs of several tasks as few Spinnaker Tasks as possible.
+
+    Queued tasks for the same application with the same options are merged
+    into one Task holding all of their jobs, saving a POST and a polling loop
+    per task. Spinnaker runs each job as its own stage, so every queued task
+    still succeeds, fails and times out on its own, as configured in
+    ``TASK_TIMEOUTS`` for its first job.
+
+    Args:
+        task_uri (str): URI to post the Tasks to.
+
+    Example:
+        Upsert Security Groups in every region with one Task::
+
+            batch = TaskBatch()
+            for region in regions:
+                batch.add(get_template('infrastructure/securitygroup_data.json.j2', region=region, ...))
+            batch.wait()
+    """
+
+    def __init__(self, task_uri='/tasks'):
+        self.task_uri = task_uri
+        self.tasks = []
+
+    def __len__(self):
+        return len(self.tasks)
+
+    def add(self, task_data):
+        """Queue a task.
 
-    return check_task(taskid, timeout)
+        Args:
+            task_data (str): Task JSON definition.
+
+        Returns:
+            int: Index of the task in outcomes.
+
+        """
+        if isinstance(task_data, str):
+            task_data = json.loads(task_data)
+
+        self.tasks.append(task_data)
+        return len(self.tasks) - 1
+
+    @staticmethod
+    def _merge_key(task_data):
+        """Tasks with the same application and options can share a Task."""
+        options = {key: value for key, value in task_data.items() if key not in ('description', 'job')}
+        return json.dumps(options, sort_keys=True)
+
+    def merged(self):
+        """Merge the queued tasks.
+
+        Returns:
+            list: Pairs of a Task definition and the index of the queued task
+            owning each of its jobs.
+
+        """
+        groups = collections.OrderedDict()
+        for index, task_data in enumerate(self.tasks):
+            groups.setdefault(self._merge_key(task_data), []).append(index)
+
+        merged = []
+        for indexes in groups.values():
+            task_data = dict(self.tasks[indexes[0]])
+            if len(indexes) > 1:
+                descriptions = '; '.join(str(self.tasks[index].get('description')) for index in indexes)
+                task_data['description'] = 'Batch of {0} tasks: {1}'.format(len(indexes), descriptions)
+
+            task_data['job'] = [job for index in indexes for job in self.tasks[index]['job']]
+            owners = [index for index in indexes for _ in self.tasks[index]['job']]
+            merged.append((task_data, owners))
+
+        return merged
+
+    def _resolve(self, taskref, owners, timeouts, task_state, elapsed):
+        """Yield the index, status and error of queued tasks done or timed out."""
+        stages = _job_stages(task_state, len(owners)) if task_state else None
+
+        for index in sorted(timeouts):
+            status, error, job_stages = None, None, []
+            if task_state:
+                job_stages = [stage for stage, owner in zip(stages, owners) if owner == index]
+                status, error = _job_outcome(task_state, job_stages)
+
+            if status is None and elapsed < timeouts[index]:
+                continue
+
+            if status is None:
+                error = SpinnakerTaskInconclusiveError('Task failed to complete in {0} seconds: {1}'.format(
+                    timeouts[index], taskref))
+            elif status == 'SUCCEEDED':
+                duration = _run_time(*job_stages) if None not in job_stages else _run_time(task_state)
+                if duration is not None:
+                    TASK_HISTORY.record(*_task_kind(self.tasks[index]), duration)
+
+            yield index, status, error
+
+    def iter_outcomes(self, max_in_flight=GATE_MAX_IN_FLIGHT):
+        """Post the merged Tasks and yield each queued task's outcome as it completes.
+
+        Args:
+            max_in_flight (int): Maximum concurrent Gate requests.
+
+        Yields:
+            TaskOutcome: One per queued task, in order of completion.
+
+        """
+        merged = self.merged()
+        if not merged:
+            return
+
+        with ThreadPoolExecutor(max_workers=min(max_in_flight, len(merged))) as executor:
+            submitted = executor.map(partial(_submit_task, task_uri=self.task_uri),
+                                     [task_data for task_data, _ in merged])
+
+            pending = {}
+            start = time.monotonic()
+            for number, ((task_data, owners), (taskref, error)) in enumerate(zip(merged, submitted)):
+                if error is not None:
+                    for index in sorted(set(owners)):
+                        yield TaskOutcome(index, self.tasks[index], None, None, error)
+                    continue
+
+                LOG.info('Running %d jobs of %d tasks in %s.', len(owners), len(set(owners)), taskref)
+                timeouts = {index: get_task_timeout(self.tasks[index]) for index in owners}
+                expected = max(TASK_HISTORY.expected(*_task_kind(self.tasks[index])) or 0 for index in timeouts)
+                delays = poll_delays(max(timeouts.values()), expected=expected)
+                pending[number] = [taskref, owners, timeouts, delays, start + next(delays)]
+
+            while pending:
+                next_round = min(next_poll for *_, next_poll in pending.values())
+                delay = next_round - time.monotonic()
+                if delay > 0:
+                    time.sleep(delay)
+
+                numbers = sorted(number for number, (*_, next_poll) in pending.items() if next_poll <= next_round)
+                states = executor.map(_poll_task_state, [pending[number][0] for number in numbers])
+
+                now = time.monotonic()
+                for number, task_state in zip(numbers, states):
+                    taskref, owners, timeouts, delays, _ = pending[number]
+                    for index, status, error in self._resolve(taskref, owners, timeouts, task_state, now - start):
+                        del timeouts[index]
+                        yield TaskOutcome(index, self.tasks[index], taskref, status, error)
+
+                    if timeouts:
+                        pending[number][4] = min(start + min(timeouts.values()), now + next(delays, 0))
+                    else:
+                        del pending[number]
+
+    def wait(self, max_in_flight=GATE_MAX_IN_FLIGHT, detachable=False):
+        """Run the queued tasks and wait for all of them.
+
+        Args:
+            max_in_flight (int): Maximum concurrent Gate requests.
+            detachable (bool): Nothing later depends on the tasks, so they may
+                be posted without waiting when ``TASK_DETACH`` is set.
+
+        Returns:
+            list: :class:`TaskOutcome` for each queued task, in the order they
+            were added.
+
+        Raises:
+            AssertionError: A Task could not be posted.
+            requests.exceptions.RequestException: Gate could not be reached
+                to post a Task.
+            :obj:`foremast.exceptions.SpinnakerTaskError`: A job failed or did
+                not finish in time, raised once all tasks are done.
+
+        """
+        if TASK_DETACH and detachable:
+            return self.detach(max_in_flight=max_in_flight)
+
+        outcomes = sorted(self.iter_outcomes(max_in_flight=max_in_flight), key=lambda outcome: outcome.index)
+        return _raise_failures(outcomes)
+
+    def detach(self, max_in_flight=GATE_MAX_IN_FLIGHT):
+        """Post the merged Tasks without waiting, see :func:`detach_tasks`.
+
+        Each merged Task may run as long as its slowest job.
+
+        Args:
+            max_in_flight (int): Maximum concurrent Gate requests.
+
+        Returns:
+            list: :class:`TaskOutcome` with ``DETACHED`` status for each queued
+            task, in the order they were added.
+
+        Raises:
+            AssertionError: A Task could not be posted.
+
+        """
+        merged = self.merged()
+        timeouts = [max(get_task_timeout(self.tasks[index]) for index in owners) for _, owners in merged]
+        detached = detach_tasks([task_data for task_data, _ in merged],
+                                task_uri=self.task_uri,
+                                timeouts=timeouts,
+                                max_in_flight=max_in_flight)
+
+        outcomes = [
+            TaskOutcome(index, self.tasks[index], outcome.ref, outcome.status, None)
+            for (_, owners), outcome in zip(merged, detached) for index in set(owners)
+        ]
+        return sorted(outcomes, key=lambda outcome: outcome.index)
@@ -15,14 +15,92 @@
 #   limitations under the License.
 """Get VPC ID."""
 import logging
+import threading
 
 from ..consts import VPC_NAME
 from ..exceptions import SpinnakerVPCIDNotFound, SpinnakerVPCNotFound
+from ..utils import gate
 from ..utils.gate import gate_request
+from ..utils.json_stream import iter_json_array
 
 LOG = logging.getLogger(__name__)
 
 
+class VpcCatalog:
+    """Index of the VPCs known to Spinnaker, loaded once per process.
+
+    VPC IDs are indexed by account, region and VPC name. The catalog is safe
+    to share between threads, call :meth:`refresh` to pick up new VPCs.
+    """
+
+    uri = '/networks/aws'
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._vpc_ids = None
+
+    def __len__(self):
+        self.load()
+        return len(self._vpc_ids)
+
+    def clear(self):
+        """Forget the index, the next lookup downloads ``/networks/aws`` again."""
+        with self._lock:
+            self._vpc_ids = None
+
+    def refresh(self):
+        """Download ``/networks/aws`` again, skipping the Gate cache."""
+        gate.GATE_CACHE.invalidate(uri=self.uri)
+        self.clear()
+        self.load()
+
+    def load(self):
+        """Download and index ``/networks/aws`` unless already indexed.
+
+        Raises:
+            :obj:`foremast.exceptions.SpinnakerVPCNotFound`: Gate did not list
+                the VPCs.
+
+        """
+        if self._vpc_ids is not None:
+            return
+
+        with self._lock:
+            if self._vpc_ids is not None:
+                return
+
+            response = gate_request(uri=self.uri)
+            if not response.ok:
+                raise SpinnakerVPCNotFound(response.text)
+
+            vpc_ids = {}
+            for vpc in iter_json_array(response):
+                LOG.debug('VPC Response: %s', vpc)
+                if 'name' in vpc:
+                    vpc_ids.setdefault((vpc['account'], vpc['region'], vpc['name']), vpc['id'])
+
+            self._vpc_ids = vpc_ids
+
+    def vpc_id(self, account, region, name=VPC_NAME):
+        """Get the ID of the VPC named _name_.
+
+        Args:
+            account (str): AWS account name.
+            region (str): Region name, e.g. us-east-1.
+            name (str): VPC name.
+
+        Returns:
+            str: VPC ID, None when there is no such VPC.
+
+        """
+        self.load()
+        return self._vpc_ids.get((account, region, name))
+
+
+VPC_CATALOG = VpcCatalog()
+"""VPCs shared by every lookup in this process."""
+
+
 def get_vpc_id(account, region):
     """Get VPC ID configured for ``account`` in ``region``.
 
@@ -40,22 +118,11 @@ def get_vpc_id(account, region):
             configured.
 
     """
-    uri = '/networks/aws'
-    response = gate_request(uri=uri)
-
-    if not response.ok:
-        raise SpinnakerVPCNotFound(response.text)
-
-    vpcs = response.json()
+    vpc_id = VPC_CATALOG.vpc_id(account, region)
 
-    for vpc in vpcs:
-        LOG.debug('VPC Response: %s', vpc)
-        if 'name' in vpc and all([vpc['name'] == VPC_NAME, vpc['account'] == account, vpc['region'] == region]):
-            LOG.info('Found VPC ID for %s in %s: %s', account, region, vpc['id'])
-            vpc_id = vpc['id']
-            break
-    else:
-        LOG.fatal('VPC list: %s', vpcs)
+    if vpc_id is None:
+        LOG.fatal('No VPC named %s among %d VPCs from Spinnaker.', VPC_NAME, len(VPC_CATALOG))
         raise SpinnakerVPCIDNotFound('No VPC available for {0} [{1}].'.format(account, region))
 
+    LOG.debug('Found VPC ID for %s in %s: %s', account, region, vpc_id)
     return vpc_id
@@ -0,0 +1,56 @@
+"""Verify :class:`foremast.benchmark.FakeGate` serves what Foremast expects."""
+from unittest import mock
+
+import pytest
+import requests
+
+from foremast.benchmark import FakeGate, format_results
+from foremast.utils.subnets import get_subnets
+from foremast.utils.tasks import wait_for_task
+from foremast.utils.vpc import get_vpc_id
+
+
+@pytest.fixture
+def fake_gate():
+    """Point Gate requests at a running fake Gate."""
+    with FakeGate(apps=3, accounts=('dev', ), regions=('us-east-1', )) as fake:
+        with mock.patch('foremast.utils.gate.API_URL', fake.url):
+            yield fake
+
+
+def test_fake_gate_lookups(fake_gate):
+    """Catalog lookups and tasks work against the fake Gate."""
+    assert get_vpc_id('dev', 'us-east-1').startswith('vpc-')
+    assert get_subnets(env='dev', region='us-east-1')['us-east-1'] == ['us-east-1a', 'us-east-1b', 'us-east-1c']
+    assert wait_for_task({'application': 'app0000benchmark', 'job': [{'type': 'test'}]}) == 'SUCCEEDED'
+
+    stats = fake_gate.stats()
+    assert stats['requests']['POST /tasks'] == 1
+    assert stats['requests']['GET /tasks/{task_id}'] == 1
+
+
+def test_fake_gate_errors(fake_gate):
+    """Injected errors surface as 503 responses."""
+    fake_gate.error_rate = 1
+
+    response = requests.get(fake_gate.url + '/applications')
+
+    assert response.status_code == 503
+    assert fake_gate.stats()['injected_errors'] == 1
+
+
+def test_format_results():
+    """Results are rendered one row per workload."""
+    table = format_results([{
+        'workload': 'pipeline',
+        'apps': 10,
+        'concurrency': 2,
+        'seconds': 4.0,
+        'apps_per_second': 2.5,
+        'gate_calls': 80,
+        'gate_calls_per_second': 20.0,
+        'injected_errors': 0,
+        'failed_apps': 0,
+    }])
+
+    assert table.splitlines()[2].split() == ['pipeline', '10', '2', '4.00', '2.50', '80', '20.0', '0', '0']
@@ -0,0 +1,17 @@
+"""Verify the config merge micro-benchmark."""
+from foremast.benchmark.merge import main, run_merge_benchmark
+
+
+def test_run_merge_benchmark():
+    """Both merges are timed on the same configs."""
+    results = run_merge_benchmark(regions=2, sections=3, depth=2, number=1)
+
+    assert results['deep_chain_map'] > 0
+    assert results['deep_merge'] > 0
+
+
+def test_merge_benchmark_cli(capsys):
+    """The CLI prints both timings."""
+    main(['--regions', '1', '--sections', '2', '--depth', '1', '--number', '1'])
+
+    assert 'speedup' in capsys.readouterr().out
@@ -1,6 +1,9 @@
 """Verifies that instance_links are being retrieved properly from LINKS. Verifies that app_data.json.j2
 contains the instance link information"""
 from unittest import mock
+
+import pytest
+
 from foremast import configs
 
 TEST_CONFIG =  { 
@@ -106,5 +109,41 @@ def test_legacy_region_format():
     assert rendered_config == desired_config
 
 
+class FakeLookup:
+    """Serve configs from memory, failing like FileLookup."""
+
+    def __init__(self, files):
+        self.files = files
+
+    def json(self, filename=''):
+        if filename not in self.files:
+            raise FileNotFoundError(filename)
+        if self.files[filename] is None:
+            raise SystemExit('"{0}" appears to be invalid json.'.format(filename))
+        return self.files[filename]
+
+
+@mock.patch('foremast.configs.prepare_configs.ENVS', {'prod', 'dev', 'stage'})
+def test_process_configs():
+    """All configs are read concurrently and merged in environment order."""
+    lookup = FakeLookup({
+        'app-dev.json': {'regions': ['us-east-1']},
+        'app-prod.json': {'regions': ['us-west-2']},
+        'pipeline.json': {'env': ['dev', 'prod']},
+    })
+
+    app_configs = configs.process_configs(lookup, 'app-{env}.json', 'pipeline.json')
+
+    assert list(app_configs) == ['dev', 'prod', 'pipeline']
+    assert app_configs['dev']['us-east-1'] == {'regions': ['us-east-1']}
+    assert app_configs['pipeline'] == {'env': ['dev', 'prod']}
+
+
+@mock.patch('foremast.configs.prepare_configs.ENVS', {'dev', 'stage'})
+def test_process_configs_defaults_and_invalid_json():
+    """A missing pipeline.json uses defaults, invalid json still exits."""
+    app_configs = configs.process_configs(FakeLookup({}), 'app-{env}.json', 'pipeline.json')
+    assert dict(app_configs) == {'pipeline': {'env': ['stage', 'prod']}}
 
-    
+    with pytest.raises(SystemExit):
+        configs.process_configs(FakeLookup({'app-stage.json': None}), 'app-{env}.json', 'pipeline.json')
@@ -0,0 +1,68 @@
+"""Shared pytest fixtures."""
+from unittest import mock
+
+import pytest
+
+from foremast.utils.apps import APP_DETAILS
+from foremast.utils.blob_cache import GIT_BLOBS
+from foremast.utils.gate_cache import GateCache
+from foremast.utils.git_archive import GIT_ARCHIVES
+from foremast.utils.lookups import AMI_CATALOG, GITLAB_PROJECTS
+from foremast.utils.metrics import METRICS
+from foremast.utils.security_group import SECURITY_GROUP_CATALOG
+from foremast.utils.subnets import SUBNET_CATALOG
+from foremast.utils.task_history import TaskHistory
+from foremast.utils.task_journal import TaskJournal
+from foremast.utils.vpc import VPC_CATALOG
+
+CATALOGS = (
+    APP_DETAILS, AMI_CATALOG, GIT_ARCHIVES, GITLAB_PROJECTS, SECURITY_GROUP_CATALOG, SUBNET_CATALOG, VPC_CATALOG)
+"""Process wide caches cleared around every test."""
+
+
+@pytest.fixture(autouse=True)
+def task_history(tmpdir):
+    """Keep Task durations recorded by tests out of the user's cache."""
+    history = TaskHistory(path=str(tmpdir.join('task_durations.json')))
+    with mock.patch('foremast.utils.tasks.TASK_HISTORY', history):
+        yield history
+
+
+@pytest.fixture(autouse=True)
+def task_journal(tmpdir):
+    """Keep Tasks detached by tests out of the current directory."""
+    journal = TaskJournal(path=str(tmpdir.join('foremast-tasks.jsonl')))
+    with mock.patch('foremast.utils.tasks.TASK_JOURNAL', journal):
+        yield journal
+
+
+@pytest.fixture(autouse=True)
+def gate_cache(tmpdir):
+    """Keep Gate responses cached by tests out of the user's cache and other tests."""
+    cache = GateCache(directory=str(tmpdir))
+    with mock.patch('foremast.utils.gate.GATE_CACHE', cache):
+        yield cache
+
+
+@pytest.fixture(autouse=True)
+def git_blobs(tmpdir):
+    """Keep GitLab files cached by tests out of the user's cache."""
+    with mock.patch.object(GIT_BLOBS, 'directory', str(tmpdir.join('git'))):
+        yield GIT_BLOBS
+
+
+@pytest.fixture(autouse=True)
+def catalogs():
+    """Start every test without Spinnaker catalogs loaded by other tests."""
+    for catalog in CATALOGS:
+        catalog.clear()
+    yield
+    for catalog in CATALOGS:
+        catalog.clear()
+
+
+@pytest.fixture(autouse=True, scope='session')
+def metrics():
+    """Skip the metrics report at exit, log handlers set by tests are closed by then."""
+    yield METRICS
+    METRICS.reset()
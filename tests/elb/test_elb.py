@@ -297,3 +297,31 @@ def test_elb_add_backend_policy(mock_get_properties, mock_boto3_session):
     elb.add_backend_policy(json.dumps(json_data))
     client.set_load_balancer_policies_for_backend_server.assert_called_with(
         LoadBalancerName=test_app, InstancePort=test_port, PolicyNames=test_policy_list)
+
+
+@mock.patch('foremast.utils.tasks.TASK_DETACH', True)
+@mock.patch('foremast.utils.tasks.time.sleep')
+@mock.patch('foremast.utils.tasks.post_task', return_value='/tasks/t0')
+@mock.patch('foremast.utils.tasks._check_task', return_value='SUCCEEDED')
+@mock.patch.object(SpinnakerELB, 'configure_attributes')
+@mock.patch.object(SpinnakerELB, 'add_backend_policy')
+@mock.patch.object(SpinnakerELB, 'add_listener_policy')
+@mock.patch.object(SpinnakerELB, 'make_elb_json')
+@mock.patch('foremast.elb.create_elb.get_properties')
+def test_elb_create_elb_detached(mock_get_properties, mock_elb_json, mock_listener_policy, mock_backend_policy,
+                                 mock_load_balancer_attributes, mock_check_task, mock_post_task, mock_sleep,
+                                 task_journal):
+    """ELB Tasks are waited for with TASK_DETACH, policies and attributes need the ELB."""
+    mock_elb_json.return_value = {'application': 'myapp', 'job': [{'type': 'upsertLoadBalancer'}]}
+
+    def elb_ready(*args):
+        assert mock_check_task.called, 'ELB Task still running'
+
+    for step in (mock_listener_policy, mock_backend_policy, mock_load_balancer_attributes):
+        step.side_effect = elb_ready
+
+    elb = SpinnakerELB(app='myapp', env='dev', region='us-east-1')
+    elb.create_elb()
+
+    mock_load_balancer_attributes.assert_called_once_with(mock_elb_json.return_value)
+    assert task_journal.entries() == []
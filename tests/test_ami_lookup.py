@@ -15,10 +15,13 @@
 #   limitations under the License.
 """Ensure AMI names can be translated."""
 import json
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from unittest import mock
 
 import pytest
 from foremast.utils import ami_lookup
+from foremast.utils.lookups import AmiCatalog
 
 
 @mock.patch('foremast.utils.lookups.GITLAB_TOKEN', new=True)
@@ -56,3 +59,75 @@ def test_dict_lookup(ami_file_dict):
 def test_no_external_lookup():
     """AMI lookup not using json or gitlab."""
     assert ami_lookup(region='us-east-1', name='no_external') == 'no_external'
+
+
+def _response(status_code=200, ami_dict=None, etag='"v1"'):
+    response = mock.Mock(status_code=status_code, ok=status_code < 400, headers={'ETag': etag})
+    response.json.return_value = ami_dict
+    return response
+
+
+@mock.patch('foremast.utils.lookups.requests.get')
+def test_ami_catalog_revalidates(mock_get, tmpdir):
+    """AMI catalog is shared until its TTL, then revalidated with its ETag."""
+    ami_dict = {'us-east-1': {'tomcat8': 'ami-xxxx'}}
+    mock_get.return_value = _response(ami_dict=ami_dict)
+
+    catalog = AmiCatalog(directory=str(tmpdir), ttl=300, snapshot='')
+    assert catalog.document('http://amis') == ami_dict
+    assert catalog.document('http://amis') == ami_dict
+    assert mock_get.call_count == 1
+
+    # Another process reads the document from disk
+    assert AmiCatalog(directory=str(tmpdir), ttl=300, snapshot='').document('http://amis') == ami_dict
+    assert mock_get.call_count == 1
+
+    mock_get.return_value = _response(status_code=304)
+    expired = AmiCatalog(directory=str(tmpdir), ttl=0, snapshot='')
+    assert expired.document('http://amis') == ami_dict
+    mock_get.assert_called_with('http://amis', headers={'If-None-Match': '"v1"'})
+
+
+@mock.patch('foremast.utils.lookups.requests.get')
+def test_ami_catalog_invalid(mock_get, tmpdir):
+    """Documents not mapping regions to AMIs are rejected, not cached."""
+    mock_get.return_value = _response(ami_dict={'us-east-1': 'ami-xxxx'})
+
+    with pytest.raises(ValueError):
+        AmiCatalog(directory=str(tmpdir), snapshot='').document('http://amis')
+
+    assert not tmpdir.join('ami').check()
+
+
+@mock.patch('foremast.utils.lookups.requests.get')
+def test_ami_catalog_pinned(mock_get, tmpdir):
+    """A pinned snapshot is used instead of fetching."""
+    ami_dict = {'us-east-1': {'tomcat8': 'ami-xxxx'}}
+    mock_get.return_value = _response(ami_dict=ami_dict)
+    snapshot = str(tmpdir.join('amis.json'))
+
+    AmiCatalog(directory=str(tmpdir), snapshot='').pin(snapshot, url='http://amis')
+
+    with mock.patch('foremast.utils.lookups.AMI_CATALOG', AmiCatalog(directory=str(tmpdir), snapshot=snapshot)), \
+            mock.patch('foremast.utils.lookups.AMI_JSON_URL', 'http://changed'):
+        assert ami_lookup(region='us-east-1', name='tomcat8') == 'ami-xxxx'
+
+    assert mock_get.call_count == 1
+
+
+@mock.patch('foremast.utils.lookups.requests.get')
+def test_ami_catalog_concurrent_fetches(mock_get, tmpdir):
+    """Documents at different URLs are fetched at the same time."""
+    barrier = threading.Barrier(2, timeout=5)
+
+    def get(url, headers):
+        barrier.wait()
+        return _response(ami_dict={'us-east-1': {'tomcat8': url}})
+
+    mock_get.side_effect = get
+    catalog = AmiCatalog(directory=str(tmpdir), snapshot='')
+
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        documents = list(executor.map(catalog.document, ['http://amis/a', 'http://amis/b']))
+
+    assert [document['us-east-1']['tomcat8'] for document in documents] == ['http://amis/a', 'http://amis/b']
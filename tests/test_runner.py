@@ -58,3 +58,33 @@ def test_runner_create_pipeline_onetime(mock_pipelines):
     runner.configs = CONFIGS
     runner.configs['pipeline']['type'] = 'manual'
     runner.create_pipeline(onetime=True)
+
+
+@mock.patch('foremast.runner.utils')
+def test_runner_prefetch(mock_utils):
+    """Catalogs are loaded concurrently and failed lookups are left to later steps."""
+    mock_utils.VPC_CATALOG.load.side_effect = AssertionError('Gate down')
+
+    runner = ForemastRunner()
+    runner.prefetch(vpcs=True, credentials=True, security_groups=True)
+
+    mock_utils.APP_DETAILS.repo.assert_called_once_with(runner.app)
+    mock_utils.SUBNET_CATALOG.load.assert_called_once_with()
+    mock_utils.VPC_CATALOG.load.assert_called_once_with()
+    mock_utils.get_env_credential.assert_called_once_with(env='dev')
+    mock_utils.SECURITY_GROUP_CATALOG.load.assert_called_once_with(env='dev', region='us-east-1')
+    mock_utils.load_ami_catalog.assert_not_called()
+
+
+@mock.patch('foremast.runner.utils')
+def test_runner_prefetch_amis(mock_utils):
+    """Only the requested catalogs are loaded."""
+    runner = ForemastRunner()
+    runner.prefetch(amis=True)
+
+    mock_utils.APP_DETAILS.repo.assert_called_once_with(runner.app)
+    mock_utils.SUBNET_CATALOG.load.assert_called_once_with()
+    mock_utils.load_ami_catalog.assert_called_once_with(region='us-east-1')
+    mock_utils.VPC_CATALOG.load.assert_not_called()
+    mock_utils.get_env_credential.assert_not_called()
+    mock_utils.SECURITY_GROUP_CATALOG.load.assert_not_called()
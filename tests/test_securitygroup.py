@@ -19,7 +19,7 @@ from unittest import mock
 
 import pytest
 
-from foremast.exceptions import ForemastConfigurationFileError
+from foremast.exceptions import ForemastConfigurationFileError, SpinnakerSecurityGroupError
 from foremast.securitygroup import SpinnakerSecurityGroup
 
 SAMPLE_JSON = """{"security_group": {
@@ -205,3 +205,33 @@ def test_merge_security_groups(mock_properties, mock_details):
     assert ingress['myapp'][0]['start_port'] == 22
     assert ingress['test_app'][0]['start_port'] == 31
     assert ingress['test_app'][1]['start_port'] == 30
+
+
+@mock.patch('foremast.utils.tasks.TASK_DETACH', True)
+@mock.patch('foremast.utils.tasks.time.sleep')
+@mock.patch('foremast.utils.tasks.post_task', return_value='/tasks/t0')
+@mock.patch('foremast.utils.tasks._check_task', return_value='SUCCEEDED')
+@mock.patch('foremast.securitygroup.create_securitygroup.boto3')
+@mock.patch('foremast.securitygroup.create_securitygroup.get_security_group_id')
+@mock.patch('foremast.securitygroup.create_securitygroup.get_vpc_id', return_value='vpc-100')
+@mock.patch('foremast.securitygroup.create_securitygroup.get_properties')
+@mock.patch('foremast.securitygroup.create_securitygroup.get_details')
+def test_create_securitygroup_detached(get_details, get_properties, get_vpc_id, get_security_group_id, boto3,
+                                       check_task, post_task, sleep, task_journal):
+    """Security Group Tasks are waited for with TASK_DETACH, tags and CIDR rules need the group."""
+    get_properties.return_value = json.loads(SAMPLE_JSON)
+
+    def security_group_id(*args, **kwargs):
+        assert check_task.call_count == post_task.call_count, 'Security Group Task still running'
+        if not post_task.called:
+            raise SpinnakerSecurityGroupError('Missing Security Group')
+        return 'sg-100'
+
+    get_security_group_id.side_effect = security_group_id
+
+    sg = SpinnakerSecurityGroup(app='edgeforrest', env='dev', region='us-east-1')
+    assert sg.create_security_group() is True
+
+    assert post_task.call_count == 2
+    assert get_security_group_id.call_count == 3
+    assert task_journal.entries() == []
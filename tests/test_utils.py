@@ -15,6 +15,7 @@
 #   limitations under the License.
 """Test utils."""
 
+import json
 from unittest import mock
 
 import pytest
@@ -54,6 +55,22 @@ def test_utils_deep_chain_map():
         assert DeepChainMap(first, second)['key2'] == result
 
 
+def test_utils_deep_merge():
+    first = {'key1': {'subkey1': 1, 'list': [1]}, 'key2': 'first', 'key3': {'shared': {}}}
+    second = {'key0': 0, 'key1': {'subkey2': 2, 'list': {'ignored': True}}, 'key2': {'subkey': 3}}
+    third = {'key1': {'subkey1': 4, 'subkey3': {'deep': 5}}}
+
+    result = deep_merge(first, second, third)
+
+    assert result == dict(DeepChainMap(first, second, third))
+    assert list(result) == list(DeepChainMap(first, second, third))
+    assert list(result['key1']) == list(dict(DeepChainMap(first, second, third))['key1'])
+    assert result['key3'] == first['key3']
+    assert result['key3'] is not first['key3']
+    assert result['key3']['shared'] is not first['key3']['shared']
+    assert result['key1']['subkey3'] is not third['key1']['subkey3']
+
+
 def test_utils_pipeline_check_managed():
 
     assert check_managed_pipeline('app [onetime]', 'app') == 'onetime'
@@ -135,12 +152,30 @@ def test_utils_apps_get_details(mock_gate_request):
     result = get_details(app='repo1group', env='dev')
     assert result.app_name() == 'repo1group'
 
+    APP_DETAILS.clear()
     with pytest.raises(SpinnakerAppNotFound):
         mock_gate_request.return_value.ok = False
         result = get_details(app='repo1group', env='dev')
         assert result.app_name() == 'repo1group'
 
 
+@mock.patch('foremast.utils.apps.gate_request')
+def test_utils_apps_get_details_cached(mock_gate_request):
+    data = {'attributes': {'repoProjectKey': 'group', 'repoSlug': 'repo1'}}
+    mock_gate_request.return_value.json.return_value = data
+
+    dev = get_details(app='repo1group', env='dev')
+    stage = get_details(app='repo1group', env='stage', region='us-west-2')
+
+    assert get_details(app='repo1group', env='dev') is dev
+    assert (stage.env, stage.data['region']) == ('stage', 'us-west-2')
+    mock_gate_request.assert_called_once_with(uri='/applications/repo1group')
+
+    APP_DETAILS.clear(app='repo1group')
+    assert get_details(app='repo1group', env='dev') is not dev
+    assert mock_gate_request.call_count == 2
+
+
 @mock.patch('foremast.utils.apps.gate_request')
 def test_utils_apps_get_all_apps(mock_gate_request):
     data = []
@@ -261,25 +296,41 @@ def test_find_existing_record(mock_session):
         dns_values['env'], dns_values['zone_id'], 'bad.example.com', check_key='Type', check_value='CNAME') == None
 
 
+@mock.patch('foremast.utils.security_group.time.sleep')
 @mock.patch('foremast.utils.security_group.gate_request')
-@mock.patch('foremast.utils.security_group.get_vpc_id')
-def test_utils_sg_get_security_group_id(mock_vpc_id, mock_gate_request):
-    data = {'id': 100}
+@mock.patch('foremast.utils.security_group.get_vpc_id', return_value='vpc-100')
+def test_utils_sg_get_security_group_id(mock_vpc_id, mock_gate_request, mock_sleep):
+    data = [{'id': 100, 'name': 'app', 'vpcId': 'vpc-100'}, {'id': 101, 'name': 'app', 'vpcId': 'vpc-other'}]
     mock_gate_request.return_value.json.return_value = data
 
     # default - happy path
-    result = get_security_group_id()
+    result = get_security_group_id(name='app', env='dev', region='us-east-1')
     assert result == 100
+    mock_gate_request.assert_called_once_with(
+        uri='/securityGroups/dev', params={'provider': 'aws', 'region': 'us-east-1'})
 
     # security group not found
     with pytest.raises(SpinnakerSecurityGroupError):
-        mock_gate_request.return_value.json.return_value = {}
-        result = get_security_group_id()
+        result = get_security_group_id(name='missing', env='dev', region='us-east-1')
+    assert mock_sleep.call_count == 5
 
     # error getting details
     with pytest.raises(AssertionError):
         mock_gate_request.return_value.ok = False
-        result = get_security_group_id()
+        SECURITY_GROUP_CATALOG.clear()
+        result = get_security_group_id(name='app', env='dev', region='us-east-1')
+
+
+@mock.patch('foremast.utils.security_group.gate_request')
+@mock.patch('foremast.utils.security_group.get_vpc_id', return_value='vpc-100')
+def test_utils_sg_get_security_group_ids(mock_vpc_id, mock_gate_request):
+    """Several groups are resolved from one listing, also when listed by region."""
+    data = {'us-east-1': [{'id': 100, 'name': 'app', 'vpcId': 'vpc-100'}, {'id': 102, 'name': 'extra'}]}
+    mock_gate_request.return_value.json.return_value = data
+
+    assert get_security_group_ids(['extra', 'app'], env='dev', region='us-east-1') == [102, 100]
+    assert get_security_group_id(name='app', env='dev', region='us-east-1') == 100
+    assert mock_gate_request.call_count == 1
 
 
 @mock.patch('foremast.utils.vpc.gate_request')
@@ -292,7 +343,7 @@ def test_utils_vpc_get_vpc_id(mock_gate_request):
             'region': 'us-east-1'
         },
     ]
-    mock_gate_request.return_value.json.return_value = data
+    mock_gate_request.return_value.iter_content.return_value = [json.dumps(data).encode()]
 
     # default - happy path
     result = get_vpc_id(account='dev', region='us-east-1')
@@ -306,9 +357,30 @@ def test_utils_vpc_get_vpc_id(mock_gate_request):
     # error getting details
     with pytest.raises(SpinnakerVPCNotFound):
         mock_gate_request.return_value.ok = False
+        VPC_CATALOG.clear()
         result = get_vpc_id(account='dev', region='us-east-1')
 
 
+@mock.patch('foremast.utils.vpc.gate.GATE_CACHE')
+@mock.patch('foremast.utils.vpc.gate_request')
+def test_utils_vpc_catalog_refresh(mock_gate_request, mock_gate_cache):
+    """VPCs are downloaded once until refreshed."""
+    data = [{'id': 100, 'name': 'vpc', 'account': 'dev', 'region': 'us-east-1'}]
+    mock_gate_request.return_value.iter_content.return_value = [json.dumps(data).encode()]
+
+    assert get_vpc_id(account='dev', region='us-east-1') == 100
+    assert get_vpc_id(account='dev', region='us-east-1') == 100
+    assert mock_gate_request.call_count == 1
+
+    data.append({'id': 101, 'name': 'vpc', 'account': 'dev', 'region': 'us-west-2'})
+    mock_gate_request.return_value.iter_content.return_value = [json.dumps(data).encode()]
+    VPC_CATALOG.refresh()
+
+    assert get_vpc_id(account='dev', region='us-west-2') == 101
+    assert mock_gate_request.call_count == 2
+    mock_gate_cache.invalidate.assert_called_once_with(uri='/networks/aws')
+
+
 SUBNET_DATA = [
     {
         'vpcId': 100,
@@ -334,7 +406,7 @@ SUBNET_DATA = [
 @mock.patch('foremast.utils.subnets.gate_request')
 def test_utils_subnets_get_subnets(mock_gate_request):
     """Find one subnet."""
-    mock_gate_request.return_value.json.return_value = SUBNET_DATA
+    mock_gate_request.return_value.iter_content.return_value = [json.dumps(SUBNET_DATA).encode()]
 
     # default - happy path
     result = get_subnets(env='dev', region='us-east-1')
@@ -346,10 +418,20 @@ def test_utils_subnets_get_subnets(mock_gate_request):
     }
 
 
+@mock.patch('foremast.utils.subnets.gate_request')
+def test_utils_subnets_get_subnets_untagged(mock_gate_request):
+    """Subnets without target and purpose are skipped."""
+    untagged = {'account': 'dev', 'id': 3, 'region': 'us-east-1', 'availabilityZone': 'us-east-1c'}
+    mock_gate_request.return_value.iter_content.return_value = [json.dumps(SUBNET_DATA + [untagged]).encode()]
+
+    result = get_subnets(env='dev', region='us-east-1')
+    assert result == {'subnet_ids': {'us-east-1': [SUBNET_DATA[0]['id']]}, 'us-east-1': [[]]}
+
+
 @mock.patch('foremast.utils.subnets.gate_request')
 def test_utils_subnets_get_subnets_multiple_az(mock_gate_request):
     """Find multiple Availability Zones."""
-    mock_gate_request.return_value.json.return_value = SUBNET_DATA
+    mock_gate_request.return_value.iter_content.return_value = [json.dumps(SUBNET_DATA).encode()]
 
     # default - happy path w/multiple az
     result = get_subnets(env='dev', region='')
@@ -359,7 +441,7 @@ def test_utils_subnets_get_subnets_multiple_az(mock_gate_request):
 @mock.patch('foremast.utils.subnets.gate_request')
 def test_utils_subnets_get_subnets_subnet_not_found(mock_gate_request):
     """Trigger SpinnakerSubnetError when no subnets found."""
-    mock_gate_request.return_value.json.return_value = SUBNET_DATA
+    mock_gate_request.return_value.iter_content.return_value = [json.dumps(SUBNET_DATA).encode()]
 
     # subnet not found
     with pytest.raises(SpinnakerSubnetError):
@@ -370,7 +452,7 @@ def test_utils_subnets_get_subnets_subnet_not_found(mock_gate_request):
 @mock.patch('foremast.utils.subnets.gate_request')
 def test_utils_subnets_get_subnets_api_error(mock_gate_request):
     """Trigger SpinnakerTimeout when API has error."""
-    mock_gate_request.return_value.json.return_value = SUBNET_DATA
+    mock_gate_request.return_value.iter_content.return_value = [json.dumps(SUBNET_DATA).encode()]
 
     # error getting details
     with pytest.raises(SpinnakerTimeout):
@@ -378,6 +460,20 @@ def test_utils_subnets_get_subnets_api_error(mock_gate_request):
         result = get_subnets()
 
 
+@mock.patch('foremast.utils.subnets.gate_request')
+def test_utils_subnets_catalog_shared(mock_gate_request):
+    """Subnets are downloaded once per process for all lookups."""
+    mock_gate_request.return_value.iter_content.return_value = [json.dumps(SUBNET_DATA).encode()]
+
+    first = get_subnets(env='dev', region='us-east-1')
+    first['us-east-1'].append('changed')
+
+    assert get_subnets(env='dev', region='us-east-1')['us-east-1'] == [[]]
+    assert SUBNET_CATALOG.subnet_ids('dev', 'us-west-2', purpose='other') == [2]
+    assert SUBNET_CATALOG.zones('dev', 'us-west-2', target='elb') is None
+    assert mock_gate_request.call_count == 1
+
+
 @mock.patch('foremast.utils.tasks.check_task')
 @mock.patch('foremast.utils.tasks.post_task')
 @mock.patch('foremast.utils.tasks.TASK_TIMEOUTS')
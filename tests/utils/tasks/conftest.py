@@ -0,0 +1,23 @@
+"""Shared fixtures for Spinnaker Task tests."""
+from unittest import mock
+
+import pytest
+
+
+@pytest.fixture
+def clock():
+    """Replace the clock used for polling, sleeping only advances it.
+
+    Yields:
+        list: Seconds passed to each sleep.
+    """
+    now = [0.0]
+    sleeps = []
+
+    def sleep(seconds):
+        sleeps.append(seconds)
+        now[0] += seconds
+
+    with mock.patch('foremast.utils.tasks.time.monotonic', side_effect=lambda: now[0]), \
+            mock.patch('foremast.utils.tasks.time.sleep', side_effect=sleep):
+        yield sleeps
@@ -4,7 +4,9 @@ from unittest import mock
 import pytest
 
 from foremast.exceptions import SpinnakerTaskError, SpinnakerTaskInconclusiveError
-from foremast.utils.tasks import _check_task, check_task
+from foremast.utils.task_history import TaskHistory
+from foremast.utils.tasks import (FIRST_POLL_WAIT, MAX_POLL_WAIT, POLL_BACKOFF, _check_task, check_task, poll_delays,
+                                  wait_for_task)
 
 FAIL_MESSAGE = 'TERMINAL'
 SUCCESS_MESSAGE = 'SUCCEEDED'
@@ -51,3 +53,79 @@ def test_task_unknown(mock_gate_request):
 
     with pytest.raises(ValueError):
         _check_task(taskid='')
+
+
+@mock.patch('foremast.utils.tasks.time.sleep')
+@mock.patch('foremast.utils.tasks._check_task')
+def test_check_task_adaptive(mock_check_task, mock_sleep):
+    """Without a fixed wait, the first poll comes at the expected duration."""
+    mock_check_task.side_effect = [ValueError, SUCCESS_MESSAGE]
+
+    assert check_task('fake_task', timeout=60, expected=4) == SUCCESS_MESSAGE
+
+    first_delay = mock_sleep.call_args_list[0][0][0]
+    assert 3.9 < first_delay <= 4
+    assert mock_sleep.call_args_list[1][0][0] == pytest.approx(FIRST_POLL_WAIT, abs=0.1)
+
+
+@mock.patch('foremast.utils.tasks._check_task')
+def test_check_task_adaptive_timeout(mock_check_task):
+    """Polling stops at the timeout."""
+    mock_check_task.side_effect = ValueError
+
+    with pytest.raises(SpinnakerTaskInconclusiveError):
+        check_task('fake_task', timeout=1)
+    assert mock_check_task.call_count == 2
+
+
+def test_poll_delays():
+    """Pauses back off and end exactly at the timeout."""
+    delays = list(poll_delays(30, expected=5))
+
+    assert delays[:3] == [5, FIRST_POLL_WAIT, FIRST_POLL_WAIT * POLL_BACKOFF]
+    assert max(delays) <= MAX_POLL_WAIT
+    assert sum(delays) == pytest.approx(30)
+
+
+def test_wait_for_task_learns_duration(task_history):
+    """Durations Spinnaker reports for successful Tasks seed later polls."""
+    task_data = {'job': [{'credentials': 'dev', 'type': 'upsertLoadBalancer'}]}
+    task_state = {'status': SUCCESS_MESSAGE, 'startTime': 1000, 'endTime': 3000}
+
+    with mock.patch('foremast.utils.tasks.post_task'), \
+            mock.patch('foremast.utils.tasks._get_task_state', return_value=task_state), \
+            mock.patch('foremast.utils.tasks.poll_delays', wraps=poll_delays) as mock_delays:
+        wait_for_task(task_data)
+        assert mock_delays.call_args[1]['expected'] is None
+
+        wait_for_task(task_data)
+        assert mock_delays.call_args[1]['expected'] == 2
+
+    assert TaskHistory(path=task_history.path).expected('dev', 'upsertLoadBalancer') == 2
+
+
+def test_wait_for_task_faster_lowers_expected(task_history):
+    """A faster Task lowers the expected duration despite slow polls."""
+    task_data = {'job': [{'credentials': 'dev', 'type': 'upsertLoadBalancer'}]}
+    task_state = {'status': SUCCESS_MESSAGE, 'startTime': 1000, 'endTime': 1500}
+    for _ in range(2):
+        task_history.record('dev', 'upsertLoadBalancer', 5)
+
+    with mock.patch('foremast.utils.tasks.post_task'), \
+            mock.patch('foremast.utils.tasks._get_task_state', return_value=task_state), \
+            mock.patch('foremast.utils.tasks.time.sleep'):
+        for _ in range(3):
+            wait_for_task(task_data)
+
+    assert task_history.expected('dev', 'upsertLoadBalancer') == 0.5
+
+
+def test_wait_for_task_without_times(task_history):
+    """Tasks without start and end times leave the history alone."""
+    task_data = {'job': [{'credentials': 'dev', 'type': 'upsertLoadBalancer'}]}
+
+    with mock.patch('foremast.utils.tasks.post_task'), \
+            mock.patch('foremast.utils.tasks._get_task_state', return_value={'status': SUCCESS_MESSAGE}):
+        wait_for_task(task_data)
+
+    assert task_history.expected('dev', 'upsertLoadBalancer') is None
@@ -0,0 +1,119 @@
+"""Verify tasks posted without waiting are reconciled from the journal."""
+import os
+import subprocess
+import sys
+import time
+from unittest import mock
+
+import pytest
+
+from foremast.__main__ import main
+from foremast.exceptions import SpinnakerTaskError, SpinnakerTaskInconclusiveError
+from foremast.utils.task_journal import TaskJournal
+from foremast.utils.tasks import TaskBatch, iter_detached_tasks, wait_for_detached_tasks, wait_for_task
+
+TASK = {'application': 'app', 'description': 'Upsert', 'job': [{'credentials': 'dev', 'type': 'upsertSecurityGroup'}]}
+
+
+@mock.patch('foremast.utils.tasks.TASK_DETACH', True)
+@mock.patch('foremast.utils.tasks.post_task', return_value='/tasks/t0')
+@mock.patch('foremast.utils.tasks._check_task')
+def test_wait_for_task_detached(mock_check_task, mock_post_task, task_journal):
+    """Detached tasks are posted and journaled, not polled."""
+    assert wait_for_task(TASK, detachable=True) == 'DETACHED'
+
+    entry, = task_journal.entries()
+    assert entry['ref'] == '/tasks/t0'
+    assert entry['jobs'] == ['upsertSecurityGroup']
+    assert entry['timeout'] == 120
+    mock_check_task.assert_not_called()
+
+
+@mock.patch('foremast.utils.tasks.TASK_DETACH', True)
+@mock.patch('foremast.utils.tasks.post_task', return_value='/tasks/t0')
+def test_task_batch_detached(mock_post_task, task_journal):
+    """Merged Tasks are journaled once for all of their jobs."""
+    batch = TaskBatch()
+    batch.add(TASK)
+    batch.add(TASK)
+
+    outcomes = batch.wait(detachable=True)
+
+    assert [(outcome.index, outcome.status) for outcome in outcomes] == [(0, 'DETACHED'), (1, 'DETACHED')]
+    entry, = task_journal.entries()
+    assert entry['jobs'] == ['upsertSecurityGroup', 'upsertSecurityGroup']
+    mock_post_task.assert_called_once()
+
+
+@mock.patch('foremast.utils.tasks.TASK_DETACH', True)
+@mock.patch('foremast.utils.tasks.time.sleep')
+@mock.patch('foremast.utils.tasks.post_task', return_value='/tasks/t0')
+@mock.patch('foremast.utils.tasks._check_task', return_value='SUCCEEDED')
+def test_wait_for_task_not_detachable(mock_check_task, mock_post_task, mock_sleep, task_journal):
+    """Tasks later steps depend on are waited for."""
+    assert wait_for_task(TASK) == 'SUCCEEDED'
+
+    assert task_journal.entries() == []
+    mock_check_task.assert_called_once_with('/tasks/t0')
+
+
+@mock.patch('foremast.utils.tasks.time.sleep')
+def test_wait_for_detached_tasks(mock_sleep, task_journal):
+    """Every journaled Task is reported, then removed from the journal."""
+    task_journal.record('/tasks/t0', TASK, 120)
+    task_journal.record('/tasks/t1', TASK, 120)
+    statuses = {'/tasks/t0': 'SUCCEEDED', '/tasks/t1': SpinnakerTaskError({'execution': {'stages': []}})}
+
+    def check(taskref):
+        status = statuses[taskref]
+        if isinstance(status, Exception):
+            raise status
+        return status
+
+    with mock.patch('foremast.utils.tasks._check_task', side_effect=check):
+        with pytest.raises(SpinnakerTaskError):
+            wait_for_detached_tasks()
+
+    assert task_journal.entries() == []
+
+
+def test_iter_detached_tasks_expired(task_journal):
+    """Tasks past their timeout are checked once."""
+    with open(task_journal.path, 'wt') as journal_file:
+        journal_file.write('{"ref": "/tasks/t0", "posted": %f, "timeout": 60}\n' % (time.time() - 3600))
+
+    with mock.patch('foremast.utils.tasks._check_task', side_effect=ValueError) as mock_check_task:
+        outcome, = iter_detached_tasks()
+
+    assert isinstance(outcome.error, SpinnakerTaskInconclusiveError)
+    mock_check_task.assert_called_once_with('/tasks/t0')
+
+
+def test_tasks_wait_cli(tmpdir):
+    """``foremast tasks wait`` reads the given journal."""
+    with mock.patch('foremast.utils.tasks.wait_for_detached_tasks') as mock_wait:
+        main(['tasks', 'wait', '--journal', str(tmpdir.join('journal.jsonl'))])
+
+    assert mock_wait.call_args[1]['journal'].path == str(tmpdir.join('journal.jsonl'))
+
+
+def test_task_journal_shared_between_processes(task_journal):
+    """Tasks recorded by another process while removing others are kept."""
+    task_journal.record('/tasks/t0', TASK, 120)
+    script = ('import sys; from foremast.utils.task_journal import TaskJournal; '
+              'TaskJournal(path=sys.argv[1]).record("/tasks/t1", {}, 120)')
+    read_entries = TaskJournal.entries
+    children = []
+
+    def entries(journal):
+        found = read_entries(journal)
+        env = dict(os.environ, PYTHONPATH=os.pathsep.join(sys.path))
+        children.append(subprocess.Popen([sys.executable, '-c', script, journal.path], env=env))
+        time.sleep(1)
+        return found
+
+    with mock.patch.object(TaskJournal, 'entries', entries):
+        task_journal.remove(['/tasks/t0'])
+
+    assert children[0].wait(timeout=30) == 0
+    assert [entry['ref'] for entry in task_journal.entries()] == ['/tasks/t1']
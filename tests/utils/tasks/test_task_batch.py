@@ -0,0 +1,148 @@
+"""Verify :class:`foremast.utils.tasks.TaskBatch` merges jobs into one Task."""
+from unittest import mock
+
+import pytest
+import requests
+
+from foremast.exceptions import SpinnakerTaskError, SpinnakerTaskInconclusiveError
+from foremast.utils.tasks import TaskBatch, poll_delays
+
+
+def _task(application, index):
+    return {
+        'application': application,
+        'description': 'Upsert {0}'.format(index),
+        'job': [{
+            'credentials': 'dev',
+            'type': 'upsert{0}'.format(index)
+        }],
+    }
+
+
+def _state(status, *stage_statuses):
+    stages = []
+    for stage_status in stage_statuses:
+        context = {}
+        if stage_status == 'TERMINAL':
+            context = {'exception': {'details': {'errors': ['boom']}}}
+        stages.append({'status': stage_status, 'context': context})
+    return {'id': 't0', 'status': status, 'execution': {'stages': stages}}
+
+
+def _batch(*tasks):
+    batch = TaskBatch()
+    for task in tasks:
+        batch.add(task)
+    return batch
+
+
+def test_task_batch_merged():
+    """Tasks are merged per application, keeping track of each job's owner."""
+    batch = _batch(_task('a', 0), _task('b', 1), '{"application": "a", "description": "Upsert 2", "job": [{}, {}]}')
+
+    merged = batch.merged()
+
+    assert len(batch) == 3
+    assert len(merged) == 2
+    task_a, owners_a = merged[0]
+    assert task_a['description'] == 'Batch of 2 tasks: Upsert 0; Upsert 2'
+    assert len(task_a['job']) == 3
+    assert owners_a == [0, 2, 2]
+    assert merged[1] == (_task('b', 1), [1])
+
+
+@mock.patch('foremast.utils.tasks.time.sleep')
+@mock.patch('foremast.utils.tasks.post_task', return_value='t0')
+def test_task_batch_wait(mock_post_task, mock_sleep):
+    """One Task is posted and polled for all jobs."""
+    states = [_state('RUNNING', 'SUCCEEDED', 'RUNNING'), _state('SUCCEEDED', 'SUCCEEDED', 'SUCCEEDED')]
+
+    with mock.patch('foremast.utils.tasks._get_task_state', side_effect=states):
+        outcomes = _batch(_task('a', 0), _task('a', 1)).wait()
+
+    assert [outcome.index for outcome in outcomes] == [0, 1]
+    assert all(outcome.ok and outcome.ref == 't0' for outcome in outcomes)
+    mock_post_task.assert_called_once()
+    assert mock_sleep.call_count == 2
+
+
+@mock.patch('foremast.utils.tasks.post_task', return_value='t0')
+def test_task_batch_wait_adaptive(mock_post_task, clock):
+    """Merged Tasks are polled on the :func:`poll_delays` schedule."""
+    states = [_state('RUNNING', 'RUNNING', 'RUNNING')] * 2 + [_state('SUCCEEDED', 'SUCCEEDED', 'SUCCEEDED')]
+
+    with mock.patch('foremast.utils.tasks._get_task_state', side_effect=states):
+        outcomes = _batch(_task('a', 0), _task('a', 1)).wait()
+
+    assert all(outcome.ok for outcome in outcomes)
+    assert clock == pytest.approx(list(poll_delays(120))[:3])
+
+
+@mock.patch('foremast.utils.tasks.time.sleep')
+@mock.patch('foremast.utils.tasks.post_task', return_value='t0')
+def test_task_batch_failure_per_job(mock_post_task, mock_sleep):
+    """A failed job fails its own task, later jobs report they did not run."""
+    state = _state('TERMINAL', 'SUCCEEDED', 'TERMINAL', 'NOT_STARTED')
+    batch = _batch(_task('a', 0), _task('a', 1), _task('a', 2))
+
+    with mock.patch('foremast.utils.tasks._get_task_state', return_value=state):
+        outcomes = sorted(batch.iter_outcomes(), key=lambda outcome: outcome.index)
+
+        with pytest.raises(SpinnakerTaskError) as error:
+            batch.wait()
+
+    assert outcomes[0].ok
+    assert outcomes[1].status == 'TERMINAL'
+    assert outcomes[1].error.args == ('boom', )
+    assert isinstance(outcomes[2].error, SpinnakerTaskInconclusiveError)
+    assert error.value.args == ('boom', )
+
+
+@mock.patch('foremast.utils.tasks.time.sleep')
+@mock.patch('foremast.utils.tasks.post_task', return_value='t0')
+@mock.patch('foremast.utils.tasks.TASK_TIMEOUTS', {'dev': {'upsert0': 0}})
+def test_task_batch_timeout_per_job(mock_post_task, mock_sleep):
+    """Each job times out on its own."""
+    states = [_state('RUNNING', 'RUNNING', 'RUNNING'), _state('SUCCEEDED', 'SUCCEEDED', 'SUCCEEDED')]
+
+    with mock.patch('foremast.utils.tasks._get_task_state', side_effect=states):
+        outcomes = list(_batch(_task('a', 0), _task('a', 1)).iter_outcomes())
+
+    assert outcomes[0].index == 0
+    assert isinstance(outcomes[0].error, SpinnakerTaskInconclusiveError)
+    assert outcomes[1].index == 1
+    assert outcomes[1].ok
+
+
+@mock.patch('foremast.utils.tasks.post_task', side_effect=AssertionError('bad request'))
+def test_task_batch_post_failure(mock_post_task):
+    """Every task in a Task that could not be posted fails."""
+    with pytest.raises(AssertionError):
+        _batch(_task('a', 0), _task('a', 1)).wait()
+
+
+@mock.patch('foremast.utils.tasks.time.sleep')
+@mock.patch('foremast.utils.tasks.post_task', return_value='t0')
+def test_task_batch_gate_error(mock_post_task, mock_sleep):
+    """Polls Gate could not answer are tried again."""
+    states = [requests.exceptions.ConnectionError(), _state('SUCCEEDED', 'SUCCEEDED')]
+
+    with mock.patch('foremast.utils.tasks._get_task_state', side_effect=states):
+        outcome, = _batch(_task('a', 0)).wait()
+
+    assert outcome.ok
+
+
+@mock.patch('foremast.utils.tasks.time.sleep')
+@mock.patch('foremast.utils.tasks.post_task', return_value='t0')
+def test_task_batch_stage_durations(mock_post_task, mock_sleep, task_history):
+    """Each job records the time Spinnaker spent on its own stage."""
+    state = _state('SUCCEEDED', 'SUCCEEDED', 'SUCCEEDED')
+    for stage, (start, end) in zip(state['execution']['stages'], [(1000, 1500), (1500, 4500)]):
+        stage.update(startTime=start, endTime=end)
+
+    with mock.patch('foremast.utils.tasks._get_task_state', return_value=state):
+        _batch(_task('a', 0), _task('a', 1)).wait()
+
+    assert task_history.expected('dev', 'upsert0') == 0.5
+    assert task_history.expected('dev', 'upsert1') == 3
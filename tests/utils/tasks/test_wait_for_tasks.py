@@ -0,0 +1,99 @@
+"""Verify :func:`foremast.utils.tasks.iter_tasks` runs tasks concurrently."""
+from unittest import mock
+
+import pytest
+import requests
+
+from foremast.exceptions import SpinnakerTaskError, SpinnakerTaskInconclusiveError
+from foremast.utils.tasks import iter_tasks, poll_delays, wait_for_tasks
+
+TASKS = [{'job': [{'credentials': 'dev', 'type': 'upsert{0}'.format(index)}]} for index in range(3)]
+
+
+def _statuses(**by_ref):
+    """Build a fake ``_check_task`` returning queued results per task reference."""
+
+    def check(taskref):
+        result = by_ref[taskref].pop(0)
+        if isinstance(result, Exception):
+            raise result
+        return result
+
+    return check
+
+
+@mock.patch('foremast.utils.tasks.time.sleep')
+@mock.patch('foremast.utils.tasks.post_task', side_effect=['t0', 't1', 't2'])
+def test_iter_tasks_as_completed(mock_post_task, mock_sleep):
+    """Outcomes are yielded as tasks finish, all tracked in one loop."""
+    check = _statuses(
+        t0=[ValueError(), ValueError(), 'SUCCEEDED'],
+        t1=['SUCCEEDED'],
+        t2=[ValueError(), SpinnakerTaskError({'execution': {'stages': []}})],
+    )
+
+    with mock.patch('foremast.utils.tasks._check_task', side_effect=check):
+        outcomes = list(iter_tasks(TASKS, wait=1))
+
+    assert [outcome.ref for outcome in outcomes] == ['t1', 't2', 't0']
+    assert [outcome.index for outcome in outcomes] == [1, 2, 0]
+    assert outcomes[0].ok and outcomes[2].ok
+    assert outcomes[1].status == 'TERMINAL'
+    assert isinstance(outcomes[1].error, SpinnakerTaskError)
+    assert mock_post_task.call_count == 3
+    assert mock_sleep.call_count == 2
+
+
+@mock.patch('foremast.utils.tasks.post_task', side_effect=['t0', 't1'])
+@mock.patch('foremast.utils.tasks.TASK_TIMEOUTS', {'dev': {'upsert0': 0}})
+def test_iter_tasks_timeout_per_task(mock_post_task):
+    """Each task times out on its own schedule."""
+    check = _statuses(t0=[ValueError()], t1=[ValueError(), 'SUCCEEDED'])
+
+    with mock.patch('foremast.utils.tasks._check_task', side_effect=check):
+        outcomes = list(iter_tasks(TASKS[:2], wait=0))
+
+    assert isinstance(outcomes[0].error, SpinnakerTaskInconclusiveError)
+    assert outcomes[1].status == 'SUCCEEDED'
+
+
+@mock.patch('foremast.utils.tasks.post_task', side_effect=['t0', AssertionError('bad request')])
+def test_wait_for_tasks_raises_after_all(mock_post_task):
+    """Failures are raised once every task is done."""
+    check = _statuses(t0=['SUCCEEDED'])
+
+    with mock.patch('foremast.utils.tasks._check_task', side_effect=check) as mock_check:
+        with pytest.raises(AssertionError):
+            wait_for_tasks(TASKS[:2])
+
+    mock_check.assert_called_once_with('t0')
+
+
+@mock.patch('foremast.utils.tasks.post_task', side_effect=['t0', 't1'])
+def test_wait_for_tasks_adaptive(mock_post_task, clock):
+    """Tasks are polled on the :func:`poll_delays` schedule by default."""
+    check = _statuses(t0=[ValueError(), ValueError(), 'SUCCEEDED'], t1=[ValueError(), ValueError(), 'SUCCEEDED'])
+
+    with mock.patch('foremast.utils.tasks._check_task', side_effect=check):
+        outcomes = wait_for_tasks(TASKS[:2])
+
+    assert all(outcome.ok for outcome in outcomes)
+    assert clock == pytest.approx(list(poll_delays(120))[:3])
+
+
+@mock.patch('foremast.utils.tasks.time.sleep')
+@mock.patch('foremast.utils.tasks.post_task', side_effect=['t0', requests.exceptions.HTTPError('503'), 't2'])
+def test_wait_for_tasks_gate_errors(mock_post_task, mock_sleep):
+    """Gate errors fail only their own task, posted tasks are still polled."""
+    check = _statuses(t0=[requests.exceptions.ConnectionError(), 'SUCCEEDED'], t2=['SUCCEEDED'])
+
+    with mock.patch('foremast.utils.tasks._check_task', side_effect=check):
+        outcomes = sorted(iter_tasks(TASKS, wait=0), key=lambda outcome: outcome.index)
+
+    assert [outcome.status for outcome in outcomes] == ['SUCCEEDED', None, 'SUCCEEDED']
+    assert isinstance(outcomes[1].error, requests.exceptions.HTTPError)
+
+
+def test_wait_for_tasks_empty():
+    """Nothing to do for no tasks."""
+    assert wait_for_tasks([]) == []
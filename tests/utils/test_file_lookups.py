@@ -15,12 +15,18 @@
 #   limitations under the License.
 """Test Git file lookups."""
 import base64
+import io
+import os
+import tarfile
 from unittest import mock
 
 import pytest
 
+from gitlab.exceptions import GitlabGetError
+
 from foremast.exceptions import GitLabApiError
 from foremast.utils import FileLookup
+from foremast.utils.git_archive import GIT_ARCHIVES
 
 TEST_JSON = '''{
     "ship": "pirate"
@@ -46,6 +52,17 @@ def test_project_exception(mock_gitlab):
         FileLookup()
 
 
+@mock.patch('foremast.utils.lookups.gitlab')
+def test_project_shared(mock_gitlab):
+    """One client and Project handle serve every lookup of a repository."""
+    first, second, other = FileLookup('forrest/core'), FileLookup('forrest/core'), FileLookup('forrest/edge')
+
+    assert first.project is second.project
+    assert first.server is other.server
+    mock_gitlab.Gitlab.assert_called_once()
+    assert mock_gitlab.Gitlab.return_value.projects.get.call_count == 2
+
+
 @mock.patch('foremast.utils.lookups.gitlab')
 def test_project_success(mock_gitlab):
     """Check resolving GitLab Project ID is successful."""
@@ -109,3 +126,84 @@ def test_runway_get(gitlab, tmpdir):
 
     with pytest.raises(FileNotFoundError):
         my_git.get(filename='parrot')
+
+
+def _archive(files):
+    """Build a GitLab style ``tar.gz`` repository archive."""
+    data = io.BytesIO()
+    with tarfile.open(fileobj=data, mode='w:gz') as archive:
+        for name, contents in files.items():
+            info = tarfile.TarInfo('repo-abc123-abc123/' + name)
+            info.size = len(contents)
+            archive.addfile(info, io.BytesIO(contents))
+    return data.getvalue()
+
+
+@mock.patch('foremast.utils.lookups.gitlab')
+def test_archive_get(gitlab):
+    """Files in the archived directory are served from one download at one commit."""
+    project = gitlab.Gitlab.return_value.projects.get.return_value
+    project.commits.get.return_value.attributes = {'id': 'abc123'}
+    project.repository_archive.return_value = _archive({'runway/pipeline.json': TEST_JSON_BYTES})
+    project.files.get.return_value.content = base64.b64encode(TEST_JSON_BYTES)
+
+    my_git = FileLookup(git_short='forrest/core', archive_path='runway')
+
+    assert my_git.json(filename='runway/pipeline.json') == {'ship': 'pirate'}
+    assert FileLookup(git_short='forrest/core', archive_path='runway').get(filename='runway/pipeline.json') == TEST_JSON
+    with pytest.raises(FileNotFoundError):
+        my_git.get(filename='runway/application-master-dev.json')
+    assert my_git.commit() == 'abc123'
+    project.repository_archive.assert_called_once_with(sha='abc123', format='tar.gz', path='runway')
+
+    assert my_git.get(filename='README.json') == TEST_JSON
+    project.files.get.assert_called_once_with(file_path='README.json', ref='abc123')
+
+    GIT_ARCHIVES.clear()
+    assert FileLookup(git_short='forrest/core', archive_path='runway').get(filename='runway/pipeline.json') == TEST_JSON
+    project.repository_archive.assert_called_once()
+
+
+@mock.patch('foremast.utils.lookups.gitlab')
+def test_archive_fallback(gitlab):
+    """Each file is requested when GitLab does not provide the archive."""
+    project = gitlab.Gitlab.return_value.projects.get.return_value
+    project.commits.get.return_value.attributes = {'id': 'abc123'}
+    project.repository_archive.side_effect = GitlabGetError('archive failed')
+    project.files.get.return_value.content = base64.b64encode(TEST_JSON_BYTES)
+
+    my_git = FileLookup(git_short='forrest/core', archive_path='runway')
+
+    assert my_git.get(filename='runway/pipeline.json') == TEST_JSON
+    project.files.get.assert_called_once_with(file_path='runway/pipeline.json', ref='abc123')
+
+
+@mock.patch('foremast.utils.lookups.gitlab')
+def test_remote_file_cached(gitlab):
+    """Files are read from GitLab once per commit, later runs use the cache."""
+    project = gitlab.Gitlab.return_value.projects.get.return_value
+    project.commits.get.return_value.attributes = {'id': 'abc123'}
+    project.files.get.return_value.content = base64.b64encode(TEST_JSON_BYTES)
+
+    assert FileLookup(git_short='forrest/core').get(filename='README.json') == TEST_JSON
+    GIT_ARCHIVES.clear()
+    assert FileLookup(git_short='forrest/core').get(filename='README.json') == TEST_JSON
+
+    project.files.get.assert_called_once_with(file_path='README.json', ref='abc123')
+    assert project.commits.get.call_count == 2
+
+
+def test_blob_cache_evicts_least_recently_used(git_blobs):
+    """Files used longest ago are removed past the size limit."""
+    git_blobs.max_bytes = 8
+    git_blobs.put('forrest/core', 'abc123', 'a.json', b'aaaa')
+    git_blobs.put('forrest/core', 'abc123', 'b.json', b'bbbb')
+    os.utime(git_blobs._path('forrest/core', 'abc123', 'a.json'), (1, 1))
+    os.utime(git_blobs._path('forrest/core', 'abc123', 'b.json'), (2, 2))
+
+    assert git_blobs.get('forrest/core', 'abc123', 'a.json') == b'aaaa'
+    git_blobs.put('forrest/core', 'abc123', 'c.json', b'cccc')
+
+    assert git_blobs.get('forrest/core', 'abc123', 'b.json') is None
+    assert git_blobs.get('forrest/core', 'abc123', 'a.json') == b'aaaa'
+    assert git_blobs.get('forrest/core', 'abc123', 'c.json') == b'cccc'
@@ -0,0 +1,76 @@
+"""Verify :mod:`foremast.utils.gate` functionality."""
+from unittest import mock
+
+import pytest
+import requests_mock
+
+from foremast.utils import gate
+from foremast.utils.gate import gate_request, get_gate_session
+from foremast.utils.json_stream import iter_json_array
+
+TEST_URL = 'http://gate.example.com'
+
+
+@pytest.fixture(autouse=True)
+def fresh_session():
+    """Give every test its own Gate session."""
+    gate.GATE_SESSION = None
+    yield
+    gate.GATE_SESSION = None
+
+
+def test_gate_session_shared():
+    """All callers share one pooled session."""
+    session = get_gate_session()
+
+    assert session is get_gate_session()
+
+    adapter = session.get_adapter(TEST_URL)
+    assert adapter._pool_maxsize == gate.GATE_POOL_MAXSIZE
+
+
+@mock.patch('foremast.utils.gate.API_URL', TEST_URL)
+def test_gate_request_uses_session():
+    """Requests go through the shared session."""
+    with requests_mock.Mocker() as mocker:
+        mocker.get(TEST_URL + '/applications', json=[{'name': 'app'}])
+        mocker.post(TEST_URL + '/tasks', json={'ref': '/tasks/1'})
+
+        assert gate_request(uri='/applications').json() == [{'name': 'app'}]
+        assert gate_request(method='POST', uri='/tasks', data='{}').json() == {'ref': '/tasks/1'}
+
+    with mock.patch.object(get_gate_session(), 'get') as mock_get:
+        gate_request(uri='/applications')
+
+    mock_get.assert_called_once_with(
+        TEST_URL + '/applications',
+        params=None,
+        headers={},
+        verify=gate.GATE_CA_BUNDLE,
+        cert=gate.GATE_CLIENT_CERT,
+        stream=True)
+
+
+def test_gate_request_bad_method():
+    """Unsupported methods are rejected."""
+    with pytest.raises(NotImplementedError):
+        gate_request(method='PATCH', uri='/applications')
+
+
+@mock.patch('foremast.utils.gate.API_URL', TEST_URL)
+def test_gate_request_stream():
+    """Cached GET requests stream the body to disk and read it back from there."""
+    subnets = [{'id': 'subnet-{0}'.format(index)} for index in range(100)]
+
+    with requests_mock.Mocker() as mocker:
+        mocker.get(TEST_URL + '/subnets/aws', json=subnets)
+
+        fetched = gate_request(uri='/subnets/aws')
+        cached = gate_request(uri='/subnets/aws')
+
+    assert mocker.call_count == 1
+    assert mocker.request_history[0].stream
+    for response in (fetched, cached):
+        assert not response._content_consumed
+        assert list(iter_json_array(response, chunk_size=64)) == subnets
+        assert response.raw._file.closed
@@ -0,0 +1,61 @@
+"""Verify :mod:`foremast.utils.gate_async` fan-out."""
+import asyncio
+import threading
+import time
+from functools import partial
+from unittest import mock
+
+import pytest
+
+from foremast.utils.gate_async import AsyncGateClient, gate_gather
+
+
+def test_gate_gather_order_and_limit():
+    """Results keep call order and concurrency stays under the limit."""
+    lock = threading.Lock()
+    running = []
+    peak = []
+
+    def lookup(value):
+        with lock:
+            running.append(value)
+            peak.append(len(running))
+        time.sleep(0.01)
+        with lock:
+            running.remove(value)
+        return value * 2
+
+    results = gate_gather((partial(lookup, value) for value in range(12)), max_in_flight=3)
+
+    assert results == [value * 2 for value in range(12)]
+    assert max(peak) <= 3
+
+
+def test_gate_gather_exceptions():
+    """Exceptions are raised or returned in place."""
+
+    def fail():
+        raise ValueError('bad lookup')
+
+    with pytest.raises(ValueError):
+        gate_gather([fail])
+
+    results = gate_gather([fail, partial(int, '1')], return_exceptions=True)
+    assert isinstance(results[0], ValueError)
+    assert results[1] == 1
+
+
+@mock.patch('foremast.utils.gate_async.gate_request')
+def test_async_client_request(mock_gate_request):
+    """Client requests go through gate_request."""
+    mock_gate_request.side_effect = lambda method, uri: uri
+
+    loop = asyncio.new_event_loop()
+    try:
+        with AsyncGateClient(max_in_flight=2) as client:
+            calls = [client.request(uri='/applications/{0}'.format(app)) for app in ('one', 'two')]
+            results = loop.run_until_complete(client.gather(calls))
+    finally:
+        loop.close()
+
+    assert results == ['/applications/one', '/applications/two']
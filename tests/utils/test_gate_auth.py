@@ -0,0 +1,45 @@
+"""Verify :mod:`foremast.utils.gate_auth` credential providers."""
+import time
+from unittest import mock
+
+import pytest
+
+from foremast.exceptions import GoogleIAPTokenError
+from foremast.utils.gate_auth import GithubCredentials, GoogleIAPCredentials
+
+
+def test_github_credentials():
+    """GitHub header is built once."""
+    credentials = GithubCredentials('token')
+
+    assert credentials.headers() == {'Authorization': 'Bearer token'}
+    assert credentials.headers() is credentials.headers()
+
+
+@mock.patch('foremast.utils.gate_auth.google.auth.jwt.decode')
+@mock.patch('foremast.utils.gate_auth.get_google_iap_bearer_token')
+def test_google_iap_token_cached(mock_get_token, mock_decode):
+    """Google IAP token is reused until it nears expiry."""
+    mock_get_token.return_value = {'id_token': 'jwt'}
+    mock_decode.return_value = {'exp': time.time() + 3600}
+
+    credentials = GoogleIAPCredentials('client', '/tmp/sa.json')
+
+    assert credentials.headers() == {'Authorization': 'Bearer jwt'}
+    assert credentials.headers() == {'Authorization': 'Bearer jwt'}
+    assert mock_get_token.call_count == 1
+
+    mock_decode.return_value = {'exp': time.time() + 30}
+    credentials.expire()
+    credentials.headers()
+    credentials.headers()
+    assert mock_get_token.call_count == 3
+
+
+@mock.patch('foremast.utils.gate_auth.get_google_iap_bearer_token')
+def test_google_iap_token_missing(mock_get_token):
+    """Missing id_token raises an error."""
+    mock_get_token.return_value = {}
+
+    with pytest.raises(GoogleIAPTokenError):
+        GoogleIAPCredentials('client', '/tmp/sa.json').headers()
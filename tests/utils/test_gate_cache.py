@@ -0,0 +1,114 @@
+"""Verify :mod:`foremast.utils.gate_cache` functionality."""
+import json
+from unittest import mock
+
+import requests_mock
+
+from foremast.utils.gate import gate_request
+from foremast.utils.gate_cache import GateCache
+
+TEST_URL = 'http://gate.example.com'
+
+
+def test_gate_cache_ttl(tmpdir):
+    """URI templates select the TTL."""
+    cache = GateCache(directory=str(tmpdir), ttls={'/subnets/aws': 30, '/credentials': 0})
+
+    assert cache.ttl('/subnets/aws') == 30
+    assert cache.ttl('/credentials') == 0
+    assert cache.ttl('/credentials/dev') == 300
+    assert cache.ttl('/credentials/dev/extra') == 0
+    assert cache.ttl('/applications') == 0
+
+
+@mock.patch('foremast.utils.gate.API_URL', TEST_URL)
+def test_gate_request_read_through(tmpdir):
+    """Catalog GETs hit Gate once and are then read from disk."""
+    cache = GateCache(directory=str(tmpdir), ttls={})
+
+    with mock.patch('foremast.utils.gate.GATE_CACHE', cache), requests_mock.Mocker() as mocker:
+        mocker.get(TEST_URL + '/subnets/aws', json=[{'id': 'subnet-1'}])
+
+        assert gate_request(uri='/subnets/aws').json() == [{'id': 'subnet-1'}]
+        cached = gate_request(uri='/subnets/aws')
+
+        assert cached.ok
+        assert cached.json() == [{'id': 'subnet-1'}]
+        assert mocker.call_count == 1
+
+        cache.bypass = True
+        gate_request(uri='/subnets/aws')
+        assert mocker.call_count == 2
+
+        cache.bypass = False
+        assert cache.invalidate(uri='/subnets') == 1
+        gate_request(uri='/subnets/aws')
+        assert mocker.call_count == 3
+
+
+@mock.patch('foremast.utils.gate.API_URL', TEST_URL)
+def test_gate_request_errors_not_cached(tmpdir):
+    """Failed responses are never stored."""
+    cache = GateCache(directory=str(tmpdir), ttls={})
+
+    with mock.patch('foremast.utils.gate.GATE_CACHE', cache), requests_mock.Mocker() as mocker:
+        mocker.get(TEST_URL + '/networks/aws', status_code=500, text='error')
+
+        assert not gate_request(uri='/networks/aws').ok
+        assert not gate_request(uri='/networks/aws').ok
+        assert mocker.call_count == 2
+
+
+@mock.patch('foremast.utils.gate.API_URL', TEST_URL)
+def test_gate_request_conditional(tmpdir):
+    """Listings are revalidated with ETag and served from disk on 304."""
+    cache = GateCache(directory=str(tmpdir), ttls={})
+    apps = [{'name': 'app'}]
+
+    with mock.patch('foremast.utils.gate.GATE_CACHE', cache), requests_mock.Mocker() as mocker:
+        mocker.get(TEST_URL + '/applications', [
+            {
+                'json': apps,
+                'headers': {
+                    'ETag': '"v1"'
+                }
+            },
+            {
+                'status_code': 304
+            },
+            {
+                'status_code': 304
+            },
+        ])
+
+        assert gate_request(uri='/applications').json() == apps
+        assert 'If-None-Match' not in mocker.request_history[0].headers
+
+        first = gate_request(uri='/applications').json()
+        assert first == apps
+        assert mocker.request_history[1].headers['If-None-Match'] == '"v1"'
+
+        first.append({'name': 'changed'})
+        second = gate_request(uri='/applications').json()
+        assert second == apps
+        assert second is not first
+
+    assert cache.stats() == {'hits': 0, 'misses': 3, 'revalidated': 2, 'hit_ratio': 2 / 3}
+
+
+@mock.patch('foremast.utils.gate.API_URL', TEST_URL)
+def test_gate_request_old_entries_replaced(tmpdir):
+    """Entries holding the body in their metadata are fetched again."""
+    cache = GateCache(directory=str(tmpdir), ttls={})
+
+    with mock.patch('foremast.utils.gate.GATE_CACHE', cache), requests_mock.Mocker() as mocker:
+        mocker.get(TEST_URL + '/subnets/aws', json=[{'id': 'subnet-1'}])
+        assert gate_request(uri='/subnets/aws').text == '[{"id": "subnet-1"}]'
+
+        cache_path, = tmpdir.join('gate').listdir()
+        cache_path.write(json.dumps({'url': TEST_URL + '/subnets/aws', 'body': '[]'}))
+
+        assert gate_request(uri='/subnets/aws').json() == [{'id': 'subnet-1'}]
+        assert mocker.call_count == 2
+        assert gate_request(uri='/subnets/aws').json() == [{'id': 'subnet-1'}]
+        assert mocker.call_count == 2
@@ -0,0 +1,102 @@
+"""Verify :mod:`foremast.utils.gate_limiter` and Gate backoff."""
+from unittest import mock
+
+import pytest
+import requests
+import requests_mock
+
+from foremast.utils.gate import gate_request
+from foremast.utils.gate_limiter import AIMDLimiter, backoff_delay
+
+TEST_URL = 'http://gate.example.com'
+
+
+def test_aimd_limiter():
+    """Limit halves on overload and creeps back on success."""
+    limiter = AIMDLimiter(initial=8, cooldown=0)
+
+    limiter.overload()
+    assert limiter.stats()['limit'] == 4
+
+    limiter.overload()
+    limiter.overload()
+    limiter.overload()
+    assert limiter.stats()['limit'] == 1
+
+    for _ in range(100):
+        limiter.success()
+    assert limiter.stats()['limit'] == 8
+
+    with limiter.slot():
+        assert limiter.stats()['in_flight'] == 1
+    assert limiter.stats()['in_flight'] == 0
+
+
+def test_aimd_limiter_cooldown():
+    """A burst of overloaded responses only lowers the limit once."""
+    limiter = AIMDLimiter(initial=8, cooldown=60)
+
+    limiter.overload()
+    limiter.overload()
+    assert limiter.stats()['limit'] == 4
+
+
+def test_backoff_delay():
+    """Retry-After wins over jittered backoff."""
+    response = requests.models.Response()
+    response.headers['Retry-After'] = '3'
+    assert backoff_delay(0, response) == 3
+
+    response.headers['Retry-After'] = 'Wed, 21 Oct 2015 07:28:00 GMT'
+    assert backoff_delay(0, response) == 0
+
+    for attempt in range(10):
+        assert 0 <= backoff_delay(attempt) <= 30
+
+
+@mock.patch('foremast.utils.gate.time.sleep')
+@mock.patch('foremast.utils.gate.GATE_LIMITER', new_callable=lambda: AIMDLimiter(initial=4, cooldown=0))
+@mock.patch('foremast.utils.gate.API_URL', TEST_URL)
+def test_gate_request_backoff(mock_limiter, mock_sleep):
+    """Overloaded responses are retried, then raised."""
+    with requests_mock.Mocker() as mocker:
+        mocker.post(TEST_URL + '/tasks', [
+            {
+                'status_code': 503,
+                'headers': {
+                    'Retry-After': '2'
+                }
+            },
+            {
+                'status_code': 200,
+                'json': {
+                    'ref': '/tasks/1'
+                }
+            },
+        ])
+
+        assert gate_request(method='POST', uri='/tasks').json() == {'ref': '/tasks/1'}
+        mock_sleep.assert_called_once_with(2)
+        assert mock_limiter.stats()['limit'] == 2
+
+        mocker.get(TEST_URL + '/applications', status_code=503)
+        with pytest.raises(requests.exceptions.HTTPError):
+            gate_request(uri='/applications')
+        assert mocker.call_count == 2 + 5
+
+
+@mock.patch('foremast.utils.gate.time.sleep')
+@mock.patch('foremast.utils.gate.GATE_LIMITER', new_callable=lambda: AIMDLimiter(initial=4, cooldown=0))
+@mock.patch('foremast.utils.gate.API_URL', TEST_URL)
+def test_gate_request_post_not_repeated(mock_limiter, mock_sleep):
+    """POST requests Gate may have processed are not sent again."""
+    with requests_mock.Mocker() as mocker:
+        mocker.post(TEST_URL + '/tasks', status_code=503)
+        with pytest.raises(requests.exceptions.HTTPError):
+            gate_request(method='POST', uri='/tasks')
+        assert mocker.call_count == 1
+        mock_sleep.assert_not_called()
+
+        mocker.post(TEST_URL + '/tasks', [{'status_code': 429}, {'status_code': 200, 'json': {'ref': '/tasks/1'}}])
+        assert gate_request(method='POST', uri='/tasks').json() == {'ref': '/tasks/1'}
+        assert mocker.call_count == 1 + 2
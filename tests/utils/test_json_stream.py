@@ -0,0 +1,55 @@
+"""Verify :mod:`foremast.utils.json_stream` incremental decoding."""
+import json
+import pickle
+from unittest import mock
+
+import pytest
+
+from foremast.utils.gate_cache import CachedResponse
+from foremast.utils.json_stream import iter_json_array
+
+RECORDS = [
+    {'id': 'subnet-1', 'target': 'ec2', 'name': 'ünïcode'},
+    12.5,
+    [1, -2e3, None],
+    'text with ] and , inside',
+    True,
+]
+
+
+def _response(body, chunk_size):
+    response = mock.Mock(snapshot=None)
+    response.iter_content.return_value = [body[i:i + chunk_size] for i in range(0, len(body), chunk_size)]
+    return response
+
+
+@pytest.mark.parametrize('chunk_size', [1, 2, 7, 1024])
+def test_iter_json_array_chunks(chunk_size):
+    """Records split across any chunk boundary decode the same."""
+    body = json.dumps(RECORDS, indent=2, ensure_ascii=False).encode()
+
+    assert list(iter_json_array(_response(body, chunk_size))) == RECORDS
+
+
+def test_iter_json_array_predicate():
+    """Only records matching the predicate are yielded."""
+    body = json.dumps(RECORDS).encode()
+
+    records = iter_json_array(_response(body, 3), predicate=lambda record: isinstance(record, dict))
+    assert list(records) == [RECORDS[0]]
+
+
+@pytest.mark.parametrize('body', [b'', b'{"a": 1}', b'[1, 2', b'[1 2]', b'[1.]'])
+def test_iter_json_array_invalid(body):
+    """Anything but a complete JSON array is rejected."""
+    with pytest.raises(ValueError):
+        list(iter_json_array(_response(body, 2)))
+
+
+def test_iter_json_array_reuses_decoded():
+    """Bodies already decoded by the Gate cache are not decoded again."""
+    response = CachedResponse(snapshot=pickle.dumps(RECORDS))
+    response.raw = mock.Mock()
+
+    assert list(iter_json_array(response, predicate=lambda record: record is True)) == [True]
+    response.raw.close.assert_called_once_with()
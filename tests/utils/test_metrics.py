@@ -0,0 +1,110 @@
+"""Verify :mod:`foremast.utils.metrics` recording and export."""
+import json
+from unittest import mock
+
+import boto3
+import pytest
+import requests_mock
+from botocore.exceptions import ClientError
+from botocore.stub import Stubber
+
+from foremast.utils import gate
+from foremast.utils.metrics import METRICS, Metrics, enable_metrics, gate_uri_template, instrument_botocore
+
+TEST_URL = 'http://gate.example.com'
+
+
+@pytest.fixture(autouse=True)
+def reset_metrics():
+    """Start every test without recorded calls."""
+    METRICS.reset()
+    yield
+    METRICS.reset()
+
+
+@pytest.mark.parametrize('uri,template', [
+    ('/applications', '/applications'),
+    ('/applications/myapp/pipelineConfigs', '/applications/{app}/pipelineConfigs'),
+    ('/securityGroups/dev/us-east-1/myapp?vpcId=vpc-1', '/securityGroups/{env}/{region}/{name}'),
+    ('/securityGroups/dev?provider=aws&region=us-east-1', '/securityGroups/{env}'),
+    ('tasks/01ABC', '/tasks/{id}'),
+    ('/unknown/a/b', '/unknown/*'),
+])
+def test_gate_uri_template(uri, template):
+    """Gate URIs are grouped by template."""
+    assert gate_uri_template(uri) == template
+
+
+def test_metrics_summary_and_export(tmpdir):
+    """Recorded calls are summarised and exported."""
+    metrics = Metrics()
+    metrics.record('gate', 'GET /applications', 0.2, size=100)
+    metrics.record('gate', 'GET /applications', 0.02, size=50, error=True)
+    metrics.record('aws', 'ec2.DescribeSubnets', 1.5)
+
+    summary = metrics.summary().splitlines()
+    assert summary[2].startswith('aws ec2.DescribeSubnets')
+    assert 'gate GET /applications' in summary[3]
+
+    json_path = str(tmpdir.join('metrics.json'))
+    metrics.export(json_path)
+    with open(json_path) as json_file:
+        exported = json.load(json_file)
+    assert exported['gate']['GET /applications']['calls'] == 2
+    assert exported['gate']['GET /applications']['errors'] == 1
+    assert exported['gate']['GET /applications']['bytes'] == 150
+
+    prom_path = str(tmpdir.join('metrics.prom'))
+    metrics.export(prom_path)
+    prometheus = tmpdir.join('metrics.prom').read()
+    bucket = 'foremast_call_duration_seconds_bucket{backend="gate",operation="GET /applications",le="0.025"} 1'
+    assert bucket in prometheus
+    assert 'foremast_call_duration_seconds_count{backend="aws",operation="ec2.DescribeSubnets"} 1' in prometheus
+    assert 'foremast_call_errors_total{backend="gate",operation="GET /applications"} 1' in prometheus
+
+
+@mock.patch('foremast.utils.gate.API_URL', TEST_URL)
+def test_gate_request_recorded():
+    """Gate requests are recorded per URI template."""
+    with requests_mock.Mocker() as mocker:
+        mocker.get(TEST_URL + '/applications/app1/loadBalancers', text='[]')
+        mocker.get(TEST_URL + '/applications/app2/loadBalancers', status_code=404, text='{}')
+
+        gate.gate_request(uri='/applications/app1/loadBalancers')
+        gate.gate_request(uri='/applications/app2/loadBalancers')
+
+    stats = METRICS.as_dict()['gate']['GET /applications/{app}/loadBalancers']
+    assert stats['calls'] == 2
+    assert stats['errors'] == 1
+    assert stats['bytes'] == 4
+
+
+def test_botocore_recorded():
+    """AWS API calls are recorded per service and operation."""
+    instrument_botocore()
+    instrument_botocore()
+
+    client = boto3.client('ec2', region_name='us-east-1', aws_access_key_id='a', aws_secret_access_key='b')
+    with Stubber(client) as stubber:
+        stubber.add_response('describe_subnets', {'Subnets': []})
+        stubber.add_client_error('describe_subnets')
+
+        client.describe_subnets()
+        with pytest.raises(ClientError):
+            client.describe_subnets()
+
+    stats = METRICS.as_dict()['aws']['ec2.DescribeSubnets']
+    assert stats['calls'] == 2
+    assert stats['errors'] == 1
+
+
+@mock.patch('foremast.utils.metrics._REPORT_REGISTERED', False)
+@mock.patch('foremast.utils.metrics.instrument_botocore')
+@mock.patch('foremast.utils.metrics.atexit.register')
+def test_enable_metrics(mock_register, mock_instrument):
+    """The exit report is registered once, however often metrics are enabled."""
+    enable_metrics()
+    enable_metrics()
+
+    mock_register.assert_called_once_with(METRICS.report)
+    assert mock_instrument.call_count == 2
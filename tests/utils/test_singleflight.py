@@ -0,0 +1,79 @@
+"""Verify :mod:`foremast.utils.singleflight` coalescing."""
+import threading
+import time
+from unittest import mock
+
+import pytest
+
+from foremast.utils.gate import gate_request
+from foremast.utils.singleflight import SingleFlight
+
+
+def _run_concurrently(target, count):
+    threads = [threading.Thread(target=target) for _ in range(count)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+
+def test_singleflight_shares_result():
+    """Concurrent callers with one key share one call."""
+    flight = SingleFlight()
+    release = threading.Event()
+    results = []
+
+    def slow():
+        release.wait()
+        return object()
+
+    def worker():
+        results.append(flight.do('key', slow))
+
+    threading.Timer(0.2, release.set).start()
+    _run_concurrently(worker, 5)
+
+    assert len(set(map(id, results))) == 1
+    assert flight.stats() == {'calls': 1, 'deduplicated': 4}
+
+    flight.do('key', object)
+    assert flight.stats()['calls'] == 2
+
+
+def test_singleflight_shares_exception():
+    """Waiters receive the exception raised by the running call."""
+    flight = SingleFlight()
+    errors = []
+
+    def fail():
+        time.sleep(0.1)
+        raise ValueError('gate down')
+
+    def worker():
+        try:
+            flight.do('key', fail)
+        except ValueError as error:
+            errors.append(error)
+
+    _run_concurrently(worker, 3)
+
+    assert len(errors) == 3
+    with pytest.raises(ValueError):
+        flight.do('key', fail)
+
+
+@mock.patch('foremast.utils.gate.GATE_SINGLEFLIGHT', new_callable=SingleFlight)
+@mock.patch('foremast.utils.gate._send')
+def test_gate_request_coalesced(mock_send, mock_flight):
+    """Identical Gate GETs are sent once."""
+
+    def slow_send(*_args, **_kwargs):
+        time.sleep(0.2)
+        return mock.DEFAULT
+
+    mock_send.side_effect = slow_send
+
+    _run_concurrently(lambda: gate_request(uri='/applications/app'), 4)
+
+    assert mock_send.call_count == 1
+    assert mock_flight.stats() == {'calls': 1, 'deduplicated': 3}